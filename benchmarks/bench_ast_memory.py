@@ -0,0 +1,90 @@
+""" Benchmark of the memory footprint of AST nodes.
+
+    Copies a set of parsed filters many times and measures the memory held
+    by the copied nodes, once with the slot based node classes and once with
+    equivalent node classes storing their attributes in a per-instance
+    ``__dict__``, as the nodes did previously. Literal values are shared by
+    all copies, so only the nodes themselves are measured.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_ast_memory.py``.
+"""
+
+import tracemalloc
+
+from pycql import parse
+from pycql.ast import Node, get_fields
+
+COPIES = 10000
+QUERIES = [
+    'attr = "A"',
+    'number BETWEEN 5 AND 10 AND string NOT LIKE "%B"',
+    'attr IN (1, 2, 3, 4) OR other IS NULL',
+    'BBOX(geometry, 1, 2, 3, 4) AND attr < 5 * 2',
+]
+
+_DICT_CLASSES = {}
+
+
+def dict_class(node_type):
+    if node_type not in _DICT_CLASSES:
+        _DICT_CLASSES[node_type] = type(node_type.__name__, (object,), {})
+    return _DICT_CLASSES[node_type]
+
+
+def copy_tree(value, get_class):
+    """ Copy the tree creating the nodes from the classes returned by
+        ``get_class``.
+    """
+    if isinstance(value, list):
+        return [copy_tree(item, get_class) for item in value]
+    if not isinstance(value, Node):
+        return value
+
+    node_type = type(value)
+    node = object.__new__(get_class(node_type))
+    for name in get_fields(node_type):
+        object.__setattr__(
+            node, name, copy_tree(getattr(value, name), get_class)
+        )
+    return node
+
+
+def count_nodes(value):
+    if isinstance(value, list):
+        return sum(count_nodes(item) for item in value)
+    if not isinstance(value, Node):
+        return 0
+    return 1 + sum(
+        count_nodes(getattr(value, name)) for name in get_fields(type(value))
+    )
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    trees = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return trees, size
+
+
+def main():
+    asts = [parse(query) for query in QUERIES]
+    nodes = sum(count_nodes(ast) for ast in asts) * COPIES
+
+    _, slotted = measure(lambda: [
+        copy_tree(ast, lambda node_type: node_type)
+        for ast in asts for _ in range(COPIES)
+    ])
+    _, with_dict = measure(lambda: [
+        copy_tree(ast, dict_class) for ast in asts for _ in range(COPIES)
+    ])
+    for name, size in (('__dict__', with_dict), ('__slots__', slotted)):
+        print('%-10s %8.1f KiB %6.1f bytes/node' % (
+            name, size / 1024., size / float(nodes)
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+""" Benchmark of inverted index bitmaps against vectorized comparisons.
+
+    Evaluates equality and ``IN`` filters on low cardinality attributes of
+    one million rows, once on plain numpy columns with
+    :func:`pycql.evaluate.vectorized.to_mask` and once on
+    :class:`pycql.evaluate.bitmap.InvertedIndex` columns with
+    :func:`pycql.evaluate.vectorized.to_bitmap`.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_bitmap.py``.
+"""
+
+import time
+
+import numpy as np
+
+from pycql.evaluate import parse
+from pycql.evaluate.bitmap import InvertedIndex
+from pycql.evaluate.vectorized import to_bitmap, to_mask
+
+ROWS = 1000000
+REPEAT = 10
+QUERIES = [
+    'platform = "S2A"',
+    'collection IN (1, 3, 5)',
+    'platform = "S2A" AND collection IN (1, 3, 5)',
+    'platform <> "L8" OR NOT collection = 2',
+]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(*args)
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main():
+    random = np.random.default_rng(0)
+    columns = {
+        'platform': random.choice(
+            np.array(['S2A', 'S2B', 'L8', 'L9'], dtype=object), ROWS
+        ),
+        'collection': random.integers(0, 20, ROWS),
+    }
+
+    start = time.perf_counter()
+    indexed = {name: InvertedIndex(values) for name, values in columns.items()}
+    print('building indexes: %.1f ms' % ((time.perf_counter() - start) * 1e3))
+
+    for query in QUERIES:
+        ast = parse(query)
+        scanned, mask = timed(to_mask, ast, columns)
+        queried, bitmap = timed(to_bitmap, ast, indexed)
+        assert (bitmap.to_mask() == mask).all()
+        print('bitmap %8.3f ms  mask %8.3f ms  (x%6.1f)  %s' % (
+            queried * 1e3, scanned * 1e3, scanned / queried, query
+        ))
+
+
+if __name__ == '__main__':
+    main()
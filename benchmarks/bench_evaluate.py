@@ -0,0 +1,50 @@
+""" Throughput benchmark of the compiled in-memory evaluation.
+
+    Filters a list of dict records with predicates compiled by
+    :func:`pycql.evaluate.to_predicate` and reports records per second.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_evaluate.py``.
+"""
+
+from datetime import datetime, timedelta, timezone
+import random
+import time
+
+from pycql.evaluate import parse, to_predicate
+
+RECORDS = 200000
+QUERIES = [
+    'cloud_cover < 10',
+    'platform = "S2A" AND cloud_cover BETWEEN 5 AND 50',
+    'collection IN ("c1", "c3", "c5") OR title ILIKE "%tile_1%"',
+    'datetime DURING 2020-01-01T00:00:00Z / P30D AND cloud_cover * 2 < 40',
+]
+
+
+def make_records(count):
+    random.seed(0)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    return [{
+        'cloud_cover': random.uniform(0, 100),
+        'platform': random.choice(['S2A', 'S2B', 'L8']),
+        'collection': 'c%d' % random.randint(0, 9),
+        'title': 'tile_%d' % i,
+        'datetime': start + timedelta(hours=random.randint(0, 24 * 90)),
+    } for i in range(count)]
+
+
+def main():
+    records = make_records(RECORDS)
+    for query in QUERIES:
+        predicate = to_predicate(parse(query))
+        start = time.perf_counter()
+        matches = sum(1 for record in records if predicate(record))
+        elapsed = time.perf_counter() - start
+        print('%12.0f records/s  %6d matches  %s' % (
+            len(records) / elapsed, matches, query
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+""" Scaling benchmark for the recognition of WKT geometry tokens.
+
+    Tokenizes ``INTERSECTS`` filters with polygons of growing vertex counts
+    with :class:`pycql.lexer.CQLLexer` and reports the time per vertex, which
+    stays constant as geometries are scanned in linear time. For reference,
+    the previously used nested ``geometry_pattern`` is matched for the
+    smaller sizes.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_geometry.py``.
+"""
+
+import re
+import time
+import tracemalloc
+
+from pycql.lexer import CQLLexer
+
+SIZES = (1000, 10000, 100000, 1000000)
+LEGACY_MAX_SIZE = 10000
+
+
+def polygon_filter(vertices):
+    coordinates = ', '.join(
+        '%d.5 %d.25' % (i, i % 90) for i in range(vertices - 1)
+    )
+    return 'INTERSECTS(geometry, POLYGON((%s, 0.5 0.25)))' % coordinates
+
+
+def tokenize(lexer, text):
+    lexer.input(text)
+    tokens = []
+    while True:
+        tok = lexer.token()
+        if tok is None:
+            return tokens
+        tokens.append(tok)
+
+
+def main():
+    lexer = CQLLexer(optimize=True)
+    legacy = re.compile(CQLLexer.geometry_pattern, re.VERBOSE)
+
+    for size in SIZES:
+        text = polygon_filter(size)
+        geometry_start = text.index('POLYGON')
+
+        start = time.perf_counter()
+        tokenize(lexer, text)
+        elapsed = time.perf_counter() - start
+
+        # memory allocated on top of the geometry token value itself
+        tracemalloc.start()
+        tokenize(lexer, text)
+        peak = tracemalloc.get_traced_memory()[1] - len(text)
+        tracemalloc.stop()
+
+        line = '%8d vertices %10.2f ms %7.1f ns/vertex %8.1f KiB overhead' % (
+            size, elapsed * 1e3, elapsed / size * 1e9, peak / 1024.
+        )
+        if size <= LEGACY_MAX_SIZE:
+            start = time.perf_counter()
+            legacy.match(text, geometry_start)
+            elapsed = time.perf_counter() - start
+            line += '   legacy pattern %10.2f ms' % (elapsed * 1e3)
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+""" Benchmark comparing the tokenization time of the PLY based
+    :class:`pycql.lexer.CQLLexer` and the single pass
+    :class:`pycql.scanner.CQLScanner` for growing inputs.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_lexer.py``.
+"""
+
+import time
+
+from pycql.lexer import CQLLexer
+from pycql.scanner import CQLScanner
+
+
+def polygon_filter(vertices):
+    coordinates = ', '.join(
+        '%d.5 %d.25' % (i, i % 90) for i in range(vertices - 1)
+    )
+    return 'attr = 5 AND INTERSECTS(geometry, POLYGON((%s, 0.5 0.25)))' % (
+        coordinates
+    )
+
+
+def combined_filter(predicates):
+    return ' OR '.join(
+        '(attr%d = "value" AND other < %d.5)' % (i, i)
+        for i in range(predicates)
+    )
+
+
+def tokenize(lexer, text):
+    start = time.perf_counter()
+    lexer.input(text)
+    while lexer.token():
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    lexers = [('lexer', CQLLexer(optimize=True)), ('scanner', CQLScanner())]
+    cases = [
+        ('polygon vertices', polygon_filter, (10, 100, 1000, 5000)),
+        ('predicates', combined_filter, (10, 100, 1000)),
+    ]
+    for name, make_input, sizes in cases:
+        for size in sizes:
+            text = make_input(size)
+            timings = ' '.join(
+                '%s %9.2f ms' % (lexer_name, tokenize(lexer, text) * 1e3)
+                for lexer_name, lexer in lexers
+            )
+            print('%-16s %6d  %s' % (name, size, timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+""" Micro-benchmark of the SQLAlchemy filter translation.
+
+    Translates an AST of 1,000 comparison, ``BETWEEN``, ``LIKE`` and
+    arithmetic predicates with :func:`pycql.integrations.sqlalchemy.to_filter`
+    and reports the translated predicates per second.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_operators.py``.
+"""
+
+import time
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table
+
+import pycql
+from pycql.integrations.sqlalchemy import to_filter
+
+PREDICATES = 1000
+REPEAT = 20
+TEMPLATES = [
+    'cloud_cover < {i}',
+    'orbit BETWEEN {i} AND {j}',
+    'title LIKE "tile_{i}%"',
+    'cloud_cover * 2 >= {i}',
+    'orbit <> {i}',
+]
+
+
+def main():
+    table = Table(
+        'items', MetaData(),
+        Column('cloud_cover', Float),
+        Column('title', String),
+        Column('orbit', Integer),
+    )
+    field_mapping = {name: table.c[name] for name in table.c.keys()}
+    ast = pycql.parse(' OR '.join(
+        TEMPLATES[i % len(TEMPLATES)].format(i=i, j=i + 1)
+        for i in range(PREDICATES)
+    ))
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        to_filter(ast, field_mapping)
+    elapsed = (time.perf_counter() - start) / REPEAT
+    print('%8.2f ms per AST  %10.0f predicates/s' % (
+        elapsed * 1e3, PREDICATES / elapsed
+    ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+""" Benchmark for the per-call cost of :func:`pycql.parse`.
+
+    Compares building a fresh :class:`pycql.parser.CQLParser` for every query
+    (the behaviour before parsers were shared) with the cached parser used by
+    :func:`pycql.parse`.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_parse.py``.
+"""
+
+import timeit
+
+from pycql import parse
+from pycql.parser import CQLParser
+
+QUERIES = [
+    'attr = "A"',
+    'number BETWEEN 5 AND 10 AND string NOT LIKE "%B"',
+    'INTERSECTS(geometry, POLYGON((0 0, 1 0, 1 1, 0 1, 0 0)))',
+    'BBOX(geometry, 1, 2, 3, 4) OR attr IN (1, 2, 3, 4)',
+]
+
+
+def parse_uncached():
+    for query in QUERIES:
+        CQLParser().parse(query)
+
+
+def parse_cached():
+    for query in QUERIES:
+        parse(query)
+
+
+def main(number=200):
+    for name, func in (('uncached', parse_uncached), ('cached', parse_cached)):
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        per_call = seconds / (number * len(QUERIES))
+        print('%-10s %8.1f us/parse' % (name, per_call * 1e6))
+
+
+if __name__ == '__main__':
+    main()
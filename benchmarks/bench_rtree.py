@@ -0,0 +1,57 @@
+""" Benchmark of the STR packed R-tree against a scan of the envelope arrays.
+
+    Builds :class:`pycql.evaluate.rtree.STRTree` over one million small
+    boxes and compares the time to find the candidates of small, medium and
+    large query windows with the full scan done by an unindexed
+    :class:`pycql.evaluate.spatial.GeometryColumn`.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_rtree.py``.
+"""
+
+import time
+
+import numpy as np
+
+from pycql.evaluate.spatial import GeometryColumn
+
+ROWS = 1000000
+REPEAT = 20
+WINDOWS = [0.1, 1, 10, 50]
+
+
+def make_bounds(rows):
+    random = np.random.default_rng(0)
+    mins = random.uniform(0, 100, (rows, 2))
+    sizes = random.uniform(0, 0.1, (rows, 2))
+    return np.hstack([mins, mins + sizes])
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(*args)
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main():
+    bounds = make_bounds(ROWS)
+    geometries = [None] * ROWS
+
+    scan = GeometryColumn(geometries, bounds)
+    start = time.perf_counter()
+    indexed = GeometryColumn(geometries, bounds, index=True)
+    print('building index: %.1f ms' % ((time.perf_counter() - start) * 1e3))
+
+    for size in WINDOWS:
+        window = (40, 40, 40 + size, 40 + size)
+        scanned, expected = timed(scan.candidates, 'INTERSECTS', window)
+        queried, ids = timed(indexed.candidates, 'INTERSECTS', window)
+        assert list(ids) == list(expected)
+        print('index %8.3f ms  scan %8.3f ms  (x%6.1f)  %8d hits' % (
+            queried * 1e3, scanned * 1e3, scanned / queried, len(ids)
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+""" Benchmark of the vectorized envelope prefilter for spatial predicates.
+
+    Evaluates ``BBOX`` and ``INTERSECTS`` on one million small boxes, once
+    with a :class:`pycql.evaluate.spatial.GeometryColumn` (numpy envelope
+    arrays, exact tests only for the candidates) and once record by record
+    with :func:`pycql.evaluate.to_predicate`. Shapely is not required: the
+    features are simple axis aligned boxes.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_spatial.py``.
+"""
+
+import time
+
+import numpy as np
+
+import pycql
+from pycql.evaluate import to_predicate
+from pycql.evaluate.spatial import GeometryColumn
+from pycql.evaluate.vectorized import to_mask
+
+ROWS = 1000000
+QUERIES = [
+    'BBOX(geom, 10, 10, 12, 12)',
+    'INTERSECTS(geom, POLYGON((10 10, 12 10, 12 12, 10 12, 10 10)))',
+    'WITHIN(geom, POLYGON((0 0, 50 0, 50 50, 0 50, 0 0)))',
+    'DWITHIN(geom, POINT(50 50), 1, meters)',
+]
+
+
+class Box:
+    __slots__ = ('bounds',)
+
+    def __init__(self, minx, miny, maxx, maxy):
+        self.bounds = (minx, miny, maxx, maxy)
+
+    @classmethod
+    def from_wkt(cls, wkt):
+        body = wkt[wkt.index('('):].strip('()')
+        coords = [
+            tuple(float(v) for v in pair.split())
+            for pair in body.split(',')
+        ]
+        xs, ys = zip(*coords)
+        return cls(min(xs), min(ys), max(xs), max(ys))
+
+    def intersects(self, other):
+        a, b = self.bounds, other.bounds
+        return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+    def within(self, other):
+        a, b = self.bounds, other.bounds
+        return a[0] >= b[0] and a[1] >= b[1] and a[2] <= b[2] and a[3] <= b[3]
+
+    def distance(self, other):
+        a, b = self.bounds, other.bounds
+        dx = max(b[0] - a[2], a[0] - b[2], 0)
+        dy = max(b[1] - a[3], a[1] - b[3], 0)
+        return (dx ** 2 + dy ** 2) ** 0.5
+
+
+def make_bounds(rows):
+    random = np.random.default_rng(0)
+    mins = random.uniform(0, 100, (rows, 2))
+    sizes = random.uniform(0, 0.1, (rows, 2))
+    return np.hstack([mins, mins + sizes])
+
+
+def main():
+    bounds = make_bounds(ROWS)
+    boxes = [Box(*row) for row in bounds.tolist()]
+
+    start = time.perf_counter()
+    column = GeometryColumn(boxes, bounds)
+    print('building column: %.1f ms' % ((time.perf_counter() - start) * 1e3))
+
+    records = [{'geom': box} for box in boxes]
+    for query in QUERIES:
+        ast = pycql.parse(query, geometry_factory=Box.from_wkt)
+
+        start = time.perf_counter()
+        mask = to_mask(ast, {'geom': column})
+        vectorized = time.perf_counter() - start
+
+        predicate = to_predicate(ast)
+        start = time.perf_counter()
+        matches = [record for record in records if predicate(record)]
+        compiled = time.perf_counter() - start
+
+        assert len(matches) == mask.sum()
+        print('numpy %8.1f ms  python %8.1f ms  (x%6.1f)  %s' % (
+            vectorized * 1e3, compiled * 1e3, compiled / vectorized, query
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+""" Benchmark of SQLAlchemy filter templates against parsing and translating
+    each request.
+
+    Translates a stream of filters of the same shape with different literal
+    values, once with :func:`pycql.integrations.sqlalchemy.parse` and
+    :func:`pycql.integrations.sqlalchemy.to_filter` per request and once
+    with a :class:`pycql.integrations.sqlalchemy.TemplateCache`, which only
+    tokenizes the requests and binds their values. The time literals of
+    temporal filters are still parsed for each request.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_template.py``.
+"""
+
+import time
+
+from sqlalchemy import Column, DateTime, Float, MetaData, String, Table
+
+from pycql.integrations.sqlalchemy import TemplateCache, parse, to_filter
+
+REQUESTS = 500
+TEMPLATES = [
+    'cloud_cover < {0} AND platform IN ("S2A", "S{1}") AND '
+    '(cloud_cover * 2 > {1} OR platform = "L{0}")',
+    'cloud_cover < {0} AND '
+    'datetime DURING 2020-01-{1:02d}T00:00:00Z / 2020-02-{1:02d}T00:00:00Z',
+]
+
+
+def main():
+    table = Table(
+        'items', MetaData(),
+        Column('cloud_cover', Float),
+        Column('platform', String),
+        Column('datetime', DateTime),
+    )
+    field_mapping = {name: table.c[name] for name in table.c.keys()}
+    for template in TEMPLATES:
+        requests = [
+            template.format(i % 100, i % 28 + 1) for i in range(REQUESTS)
+        ]
+
+        start = time.perf_counter()
+        for cql in requests:
+            to_filter(parse(cql), field_mapping)
+        translated = (time.perf_counter() - start) / REQUESTS
+
+        cache = TemplateCache(field_mapping)
+        start = time.perf_counter()
+        for cql in requests:
+            cache.to_filter(cql)
+        templated = (time.perf_counter() - start) / REQUESTS
+
+        print('parse + translate %8.1f us  template %8.1f us  (x%4.1f)' % (
+            translated * 1e6, templated * 1e6, translated / templated
+        ))
+        print('  %s' % (cache.info(),))
+
+
+if __name__ == '__main__':
+    main()
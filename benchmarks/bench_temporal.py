@@ -0,0 +1,59 @@
+""" Benchmark of the sorted temporal index against scanning the timestamps.
+
+    Evaluates temporal predicates on one million timestamps, once with a
+    plain ``datetime64`` column and once with an indexed
+    :class:`pycql.evaluate.temporal.TimeColumn`.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_temporal.py``.
+"""
+
+import time
+
+import numpy as np
+
+from pycql.evaluate import parse
+from pycql.evaluate.temporal import TimeColumn
+from pycql.evaluate.vectorized import to_mask
+
+ROWS = 1000000
+REPEAT = 20
+QUERIES = [
+    'datetime DURING 2020-01-10T00:00:00Z / PT1H',
+    'datetime DURING 2020-01-10T00:00:00Z / P1D',
+    'datetime BEFORE 2020-01-02T00:00:00Z',
+    'datetime AFTER 2020-02-01T00:00:00Z',
+]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func(*args)
+    return (time.perf_counter() - start) / REPEAT, result
+
+
+def main():
+    random = np.random.default_rng(0)
+    values = (
+        np.datetime64('2020-01-01T00:00:00', 'us') +
+        random.integers(0, 90 * 24 * 3600, ROWS).astype('timedelta64[s]')
+    )
+    plain = {'datetime': values}
+
+    start = time.perf_counter()
+    indexed = {'datetime': TimeColumn(values)}
+    print('building index: %.1f ms' % ((time.perf_counter() - start) * 1e3))
+
+    for query in QUERIES:
+        ast = parse(query)
+        scanned, expected = timed(to_mask, ast, plain)
+        queried, mask = timed(to_mask, ast, indexed)
+        assert (mask == expected).all()
+        print('index %8.3f ms  scan %8.3f ms  (x%6.1f)  %s' % (
+            queried * 1e3, scanned * 1e3, scanned / queried, query
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+""" Benchmark of the parse latency of temporal filters with the SQLAlchemy
+    integration.
+
+    Parses filters with time literals once with ``dateparser`` as the time
+    factory and once with the default :func:`pycql.util.parse_datetime`, both
+    with distinct instants and with a few instants repeated across requests,
+    which are answered from the memo cache.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_time_literals.py``.
+"""
+
+import time
+
+from dateparser import parse as dateparser_parse
+
+from pycql.integrations.sqlalchemy import parse
+from pycql.util import parse_datetime
+
+REQUESTS = 300
+TEMPLATE = (
+    'datetime DURING {0}-01-01T00:00:00Z / {0}-06-30T12:00:00Z AND '
+    'updated AFTER {0}-03-15T08:30:00Z'
+)
+
+
+def make_requests(distinct):
+    # distinct requests each have new instants, the repeated ones cycle
+    # through ten different years
+    return [
+        TEMPLATE.format(1000 + (i if distinct else i % 10))
+        for i in range(REQUESTS)
+    ]
+
+
+def timed(time_factory, requests):
+    parse_datetime.cache_clear()
+    start = time.perf_counter()
+    for request in requests:
+        parse(request, time_factory=time_factory)
+    return (time.perf_counter() - start) / len(requests)
+
+
+def main():
+    for name, distinct in (('distinct', True), ('repeated', False)):
+        requests = make_requests(distinct)
+        slow = timed(dateparser_parse, requests)
+        fast = timed(parse_datetime, requests)
+        print('%-8s  dateparser %8.1f us  iso %6.1f us  (%.0fx)' % (
+            name, slow * 1e6, fast * 1e6, slow / fast
+        ))
+
+
+if __name__ == '__main__':
+    main()
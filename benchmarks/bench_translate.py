@@ -0,0 +1,66 @@
+""" Benchmark of the translation of large ASTs by the backends.
+
+    Generates filters with thousands of mixed predicates, parses them once
+    and reports the time needed to translate the AST to SQLAlchemy filter
+    expressions (:func:`pycql.integrations.sqlalchemy.to_filter`) and to a
+    compiled in-memory predicate (:func:`pycql.evaluate.to_predicate`).
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_translate.py``.
+"""
+
+import time
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table
+
+import pycql
+from pycql.evaluate import to_predicate
+from pycql.integrations.sqlalchemy import to_filter
+
+SIZES = [100, 1000, 5000]
+REPEAT = 5
+
+TEMPLATES = [
+    '(cloud_cover < {i} AND platform = "S{i}")',
+    '(title LIKE "tile_{i}%" OR NOT orbit BETWEEN {i} AND {j})',
+    '(collection IN ("c{i}", "c{j}") AND cloud_cover * 2 >= {i})',
+    '(platform IS NULL OR orbit <> {i})',
+]
+
+
+def make_filter(size):
+    return ' OR '.join(
+        TEMPLATES[i % len(TEMPLATES)].format(i=i, j=i + 1)
+        for i in range(size)
+    )
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    table = Table(
+        'items', MetaData(),
+        Column('cloud_cover', Float),
+        Column('platform', String),
+        Column('title', String),
+        Column('orbit', Integer),
+        Column('collection', String),
+    )
+    field_mapping = {name: table.c[name] for name in table.c.keys()}
+
+    for size in SIZES:
+        ast = pycql.parse(make_filter(size))
+        sqlalchemy = timed(to_filter, ast, field_mapping)
+        compiled = timed(to_predicate, ast)
+        print('%5d groups  sqlalchemy %8.1f ms  predicate %8.1f ms' % (
+            size, sqlalchemy * 1e3, compiled * 1e3
+        ))
+
+
+if __name__ == '__main__':
+    main()
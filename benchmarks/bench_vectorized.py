@@ -0,0 +1,75 @@
+""" Benchmark of the vectorized numpy evaluation against the compiled per
+    record evaluation.
+
+    Evaluates filters on one million rows, stored once as numpy columns for
+    :func:`pycql.evaluate.vectorized.to_mask` and once as dict records for
+    :func:`pycql.evaluate.to_predicate`.
+
+    Run from the repository root with
+    ``PYTHONPATH=. python benchmarks/bench_vectorized.py``.
+"""
+
+from datetime import timezone
+import time
+
+import numpy as np
+
+from pycql.evaluate import parse, to_predicate
+from pycql.evaluate.vectorized import to_mask
+
+ROWS = 1000000
+QUERIES = [
+    'cloud_cover < 10',
+    'platform = "S2A" AND cloud_cover BETWEEN 5 AND 50',
+    'collection IN (1, 3, 5) OR cloud_cover * 2 > 190',
+    'datetime DURING 2020-01-01T00:00:00Z / P30D AND cloud_cover IS NOT NULL',
+]
+
+
+def make_columns(rows):
+    random = np.random.default_rng(0)
+    return {
+        'cloud_cover': random.uniform(0, 100, rows),
+        'platform': random.choice(
+            np.array(['S2A', 'S2B', 'L8'], dtype=object), rows
+        ),
+        'collection': random.integers(0, 10, rows),
+        'datetime': (
+            np.datetime64('2020-01-01T00:00:00', 'us') +
+            random.integers(0, 90 * 24, rows).astype('timedelta64[h]')
+        ),
+    }
+
+
+def make_records(columns):
+    names = list(columns)
+    values = [columns[name].tolist() for name in names]
+    records = [dict(zip(names, row)) for row in zip(*values)]
+    for record in records:
+        record['datetime'] = record['datetime'].replace(tzinfo=timezone.utc)
+    return records
+
+
+def main():
+    columns = make_columns(ROWS)
+    records = make_records(columns)
+    for query in QUERIES:
+        ast = parse(query)
+
+        start = time.perf_counter()
+        mask = to_mask(ast, columns)
+        vectorized = time.perf_counter() - start
+
+        predicate = to_predicate(ast)
+        start = time.perf_counter()
+        matches = [record for record in records if predicate(record)]
+        compiled = time.perf_counter() - start
+
+        assert len(matches) == mask.sum()
+        print('numpy %8.1f ms  python %8.1f ms  (x%5.1f)  %s' % (
+            vectorized * 1e3, compiled * 1e3, compiled / vectorized, query
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -25,7 +25,8 @@
 # THE SOFTWARE.
 # ------------------------------------------------------------------------------
 
-from .parser import parse
+from .parser import parse, get_parser
 from .ast import get_repr
+from .cache import ParseCache
 
 __version__ = '0.0.12'
@@ -28,10 +28,22 @@
 """
 """
 
+from .values import materialize
+
+# nodes are immutable, so their constructors set the attributes directly
+_set = object.__setattr__
+
 
 class Node:
     """ The base class for all other nodes to display the AST of CQL.
+        Nodes store their attributes in ``__slots__`` to keep them compact.
+
+        Nodes are immutable: each attribute can only be set once, when the
+        node is constructed. This makes them hashable by their structure, so
+        they can be used as dictionary keys and shared between trees, see
+        :class:`Interner`. The hash is computed on first use and kept.
     """
+    __slots__ = ('_hash',)
     inline = False
 
     def get_sub_nodes(self):
@@ -52,17 +64,65 @@ class Node:
         """
         raise NotImplementedError
 
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError(
+                "cannot set '%s': %s nodes are immutable"
+                % (name, type(self).__name__)
+            )
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(
+            "cannot delete '%s': %s nodes are immutable"
+            % (name, type(self).__name__)
+        )
+
     def __eq__(self, other):
+        if self is other:
+            return True
+
         if type(self) != type(other):
             return False
 
-        return self.__dict__ == other.__dict__
+        try:
+            if self._hash != other._hash:
+                return False
+        except AttributeError:
+            pass
+
+        # subclasses not declaring __slots__ may store attributes in a dict
+        if getattr(self, '__dict__', None) != getattr(other, '__dict__', None):
+            return False
+
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in get_fields(type(self))
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            pass
+
+        values = [type(self)]
+        values.extend(
+            hash_value(getattr(self, name)) for name in get_fields(type(self))
+        )
+        if hasattr(self, '__dict__'):
+            values.append(hash_value(self.__dict__))
+        _set(self, '_hash', hash(tuple(values)))
+        return self._hash
 
 
 class ConditionNode(Node):
     """ The base class for all nodes representing a condition
     """
-    pass
+    __slots__ = ()
 
 
 class NotConditionNode(ConditionNode):
@@ -73,8 +133,10 @@ class NotConditionNode(ConditionNode):
     :type sub_node: Node
     """
 
+    __slots__ = ('sub_node',)
+
     def __init__(self, sub_node):
-        self.sub_node = sub_node
+        _set(self, 'sub_node', sub_node)
 
     def get_sub_nodes(self):
         """ Returns the sub-node for the negated condition. """
@@ -85,32 +147,54 @@ class NotConditionNode(ConditionNode):
 
 
 class CombinationConditionNode(ConditionNode):
-    """ Node class to represent a condition to combine two other conditions
-        using either AND or OR.
+    """ Node class to represent a condition to combine two or more other
+        conditions using either AND or OR.
 
-        :ivar lhs: the left hand side node of this combination
-        :type lhs: Node
-        :ivar rhs: the right hand side node of this combination
-        :type rhs: Node
+        Nodes are created as ``CombinationConditionNode(sub_nodes, op)``.
+        The binary form ``CombinationConditionNode(lhs, rhs, op)`` is
+        supported as well.
+
+        :ivar sub_nodes: the combined condition nodes
+        :type sub_nodes: tuple[Node]
         :ivar op: the combination type. Either ``"AND"`` or ``"OR"``
         :type op: str
     """
-    def __init__(self, lhs, rhs, op):
-        self.lhs = lhs
-        self.rhs = rhs
-        self.op = op
+    __slots__ = ('sub_nodes', 'op')
+
+    def __init__(self, *args):
+        if len(args) == 3:
+            lhs, rhs, op = args
+            sub_nodes = (lhs, rhs)
+        else:
+            sub_nodes, op = args
+        _set(self, 'sub_nodes', tuple(sub_nodes))
+        _set(self, 'op', op)
+
+    @property
+    def lhs(self):
+        """ The first combined node. """
+        return self.sub_nodes[0]
+
+    @property
+    def rhs(self):
+        """ The combination of all but the first combined node: the second
+            node of a binary combination.
+        """
+        if len(self.sub_nodes) == 2:
+            return self.sub_nodes[1]
+        return CombinationConditionNode(self.sub_nodes[1:], self.op)
 
     def get_sub_nodes(self):
-        return [self.lhs, self.rhs]
+        return list(self.sub_nodes)
 
     def get_template(self):
-        return "%%s %s %%s" % self.op
+        return (" %s " % self.op).join(["%s"] * len(self.sub_nodes))
 
 
 class PredicateNode(Node):
     """ The base class for all nodes representing a predicate
     """
-    pass
+    __slots__ = ()
 
 
 class ComparisonPredicateNode(PredicateNode):
@@ -125,10 +209,12 @@ class ComparisonPredicateNode(PredicateNode):
                   ``">"``, ``"<="``, ``">="``
         :type op: str
     """
+    __slots__ = ('lhs', 'rhs', 'op')
+
     def __init__(self, lhs, rhs, op):
-        self.lhs = lhs
-        self.rhs = rhs
-        self.op = op
+        _set(self, 'lhs', lhs)
+        _set(self, 'rhs', rhs)
+        _set(self, 'op', op)
 
     def get_sub_nodes(self):
         return [self.lhs, self.rhs]
@@ -150,11 +236,13 @@ class BetweenPredicateNode(PredicateNode):
         :ivar not_: whether the predicate shall be negated
         :type not_: bool
     """
+    __slots__ = ('lhs', 'low', 'high', 'not_')
+
     def __init__(self, lhs, low, high, not_):
-        self.lhs = lhs
-        self.low = low
-        self.high = high
-        self.not_ = not_
+        _set(self, 'lhs', lhs)
+        _set(self, 'low', low)
+        _set(self, 'high', high)
+        _set(self, 'not_', not_)
 
     def get_sub_nodes(self):
         return [self.lhs, self.low, self.high]
@@ -175,11 +263,13 @@ class LikePredicateNode(PredicateNode):
         :ivar not_: whether the predicate shall be negated
         :type not_: bool
     """
+    __slots__ = ('lhs', 'rhs', 'case', 'not_')
+
     def __init__(self, lhs, rhs, case, not_):
-        self.lhs = lhs
-        self.rhs = rhs
-        self.case = case
-        self.not_ = not_
+        _set(self, 'lhs', lhs)
+        _set(self, 'rhs', rhs)
+        _set(self, 'case', case)
+        _set(self, 'not_', not_)
 
     def get_sub_nodes(self):
         return [self.lhs, self.rhs]
@@ -196,16 +286,17 @@ class InPredicateNode(PredicateNode):
 
         :ivar lhs: the left hand side node of this predicate
         :type lhs: Node
-        :ivar sub_nodes: the list of sub nodes to check the inclusion
-                         against
-        :type sub_nodes: list[Node]
+        :ivar sub_nodes: the sub nodes to check the inclusion against
+        :type sub_nodes: tuple[Node]
         :ivar not_: whether the predicate shall be negated
         :type not_: bool
     """
+    __slots__ = ('lhs', 'sub_nodes', 'not_')
+
     def __init__(self, lhs, sub_nodes, not_):
-        self.lhs = lhs
-        self.sub_nodes = sub_nodes
-        self.not_ = not_
+        _set(self, 'lhs', lhs)
+        _set(self, 'sub_nodes', tuple(sub_nodes))
+        _set(self, 'not_', not_)
 
     def get_sub_nodes(self):
         return [self.lhs] + list(self.sub_nodes)
@@ -225,9 +316,11 @@ class NullPredicateNode(PredicateNode):
         :ivar not_: whether the predicate shall be negated
         :type not_: bool
     """
+    __slots__ = ('lhs', 'not_')
+
     def __init__(self, lhs, not_):
-        self.lhs = lhs
-        self.not_ = not_
+        _set(self, 'lhs', lhs)
+        _set(self, 'not_', not_)
 
     def get_sub_nodes(self):
         return [self.lhs]
@@ -252,10 +345,19 @@ class TemporalPredicateNode(PredicateNode):
                   ``"DURING OR AFTER"``, ``"AFTER"``
         :type op: str
     """
+    __slots__ = ('lhs', '_rhs', 'op')
+
     def __init__(self, lhs, rhs, op):
-        self.lhs = lhs
-        self.rhs = rhs
-        self.op = op
+        _set(self, 'lhs', lhs)
+        _set(self, '_rhs', rhs)
+        _set(self, 'op', op)
+
+    @property
+    def rhs(self):
+        rhs = self._rhs
+        if isinstance(rhs, tuple):
+            return tuple(materialize(value) for value in rhs)
+        return materialize(rhs)
 
     def get_sub_nodes(self):
         return [self.lhs, self.rhs]
@@ -283,13 +385,15 @@ class SpatialPredicateNode(PredicateNode):
         :ivar units: the units for distance related operations
         :type units: str or None
     """
+    __slots__ = ('lhs', 'rhs', 'op', 'pattern', 'distance', 'units')
+
     def __init__(self, lhs, rhs, op, pattern=None, distance=None, units=None):
-        self.lhs = lhs
-        self.rhs = rhs
-        self.op = op
-        self.pattern = pattern
-        self.distance = distance
-        self.units = units
+        _set(self, 'lhs', lhs)
+        _set(self, 'rhs', rhs)
+        _set(self, 'op', op)
+        _set(self, 'pattern', pattern)
+        _set(self, 'distance', distance)
+        _set(self, 'units', units)
 
     def get_sub_nodes(self):
         return [self.lhs, self.rhs]
@@ -320,13 +424,15 @@ class BBoxPredicateNode(PredicateNode):
                    for the CRS the BBox is expressed in
         :type crs: str
     """
+    __slots__ = ('lhs', 'minx', 'miny', 'maxx', 'maxy', 'crs')
+
     def __init__(self, lhs, minx, miny, maxx, maxy, crs=None):
-        self.lhs = lhs
-        self.minx = minx
-        self.miny = miny
-        self.maxx = maxx
-        self.maxy = maxy
-        self.crs = crs
+        _set(self, 'lhs', lhs)
+        _set(self, 'minx', minx)
+        _set(self, 'miny', miny)
+        _set(self, 'maxx', maxx)
+        _set(self, 'maxy', maxy)
+        _set(self, 'crs', crs)
 
     def get_sub_nodes(self):
         return [self.lhs]
@@ -340,7 +446,7 @@ class BBoxPredicateNode(PredicateNode):
 class ExpressionNode(Node):
     """ The base class for all nodes representing expressions
     """
-    pass
+    __slots__ = ()
 
 
 class AttributeExpression(ExpressionNode):
@@ -349,30 +455,54 @@ class AttributeExpression(ExpressionNode):
         :ivar name: the name of the attribute to be accessed
         :type name: str
     """
+    __slots__ = ('name',)
     inline = True
 
     def __init__(self, name):
-        self.name = name
+        _set(self, 'name', name)
 
     def __repr__(self):
         return "ATTRIBUTE %s" % self.name
 
 
 class LiteralExpression(ExpressionNode):
-    """ Node class to represent literal value expressions
+    """ Node class to represent literal value expressions. When parsed
+        lazily, the value is only created on first access.
 
         :ivar value: the value of the literal
         :type value: str, float, int, datetime, timedelta
     """
+    __slots__ = ('_value',)
     inline = True
 
     def __init__(self, value):
-        self.value = value
+        _set(self, '_value', value)
+
+    @property
+    def value(self):
+        return materialize(self._value)
 
     def __repr__(self):
         return "LITERAL %r" % self.value
 
 
+class ParameterExpression(ExpressionNode):
+    """ Node class to represent a named parameter in place of a literal
+        value, see :mod:`pycql.template`.
+
+        :ivar name: the name of the parameter
+        :type name: str
+    """
+    __slots__ = ('name',)
+    inline = True
+
+    def __init__(self, name):
+        _set(self, 'name', name)
+
+    def __repr__(self):
+        return "PARAMETER %s" % self.name
+
+
 class ArithmeticExpressionNode(ExpressionNode):
     """ Node class to represent arithmetic operation expressions with two
         sub-expressions and an operator.
@@ -384,10 +514,12 @@ class ArithmeticExpressionNode(ExpressionNode):
         :ivar op: the comparison type. One of ``"+"``, ``"-"``, ``"*"``, ``"/"``
         :type op: str
     """
+    __slots__ = ('lhs', 'rhs', 'op')
+
     def __init__(self, lhs, rhs, op):
-        self.lhs = lhs
-        self.rhs = rhs
-        self.op = op
+        _set(self, 'lhs', lhs)
+        _set(self, 'rhs', rhs)
+        _set(self, 'op', op)
 
     def get_sub_nodes(self):
         return [self.lhs, self.rhs]
@@ -396,35 +528,338 @@ class ArithmeticExpressionNode(ExpressionNode):
         return "%%s %s %%s" % self.op
 
 
+def hash_value(value):
+    """ Get a hash for an attribute value of a node. Values that are not
+        hashable, like lists or dicts, are hashed by their contents.
+
+        :param value: the value to hash
+        :rtype: int
+    """
+    try:
+        return hash(value)
+    except TypeError:
+        pass
+
+    if isinstance(value, (list, tuple)):
+        return hash(tuple(hash_value(item) for item in value))
+    elif isinstance(value, dict):
+        return hash(frozenset(
+            (hash_value(key), hash_value(item)) for key, item in value.items()
+        ))
+    return hash((type(value), repr(value)))
+
+
+def copy_node(node, **fields):
+    """ Create a copy of the node with the given fields replaced. As nodes are
+        immutable, this is the way to derive a modified node.
+
+        :param node: the node to copy
+        :type node: Node
+        :param fields: the field values to replace
+        :return: the new node
+        :rtype: Node
+    """
+    node_type = type(node)
+    new_node = object.__new__(node_type)
+    for name in get_fields(node_type):
+        value = fields.pop(name) if name in fields else getattr(node, name)
+        _set(new_node, name, value)
+    if fields:
+        raise TypeError('invalid fields for %s: %s' % (
+            node_type.__name__, ', '.join(sorted(fields))
+        ))
+    if hasattr(node, '__dict__'):
+        new_node.__dict__.update(node.__dict__)
+    return new_node
+
+
+class Interner:
+    """ An interning table for AST nodes (hash-consing): equal nodes and
+        sub-trees interned through the same table are replaced by a single
+        shared instance. This saves memory when many similar trees are kept,
+        for example in a :class:`pycql.cache.ParseCache`.
+
+        The table keeps all interned nodes alive until it is cleared.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+
+    def intern(self, node):
+        """ Get the shared instance for the given node, interning all of its
+            sub-nodes as well.
+
+            :param node: the root node of the tree to intern
+            :type node: Node
+            :return: the shared node equal to ``node``
+            :rtype: Node
+        """
+        if not isinstance(node, Node):
+            return node
+
+        shared = self._nodes.get(node)
+        if shared is not None:
+            return shared
+
+        changes = {}
+        for name in get_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, Node):
+                interned = self.intern(value)
+            elif isinstance(value, tuple):
+                interned = tuple(self.intern(item) for item in value)
+                if all(a is b for a, b in zip(interned, value)):
+                    interned = value
+            else:
+                continue
+            if interned is not value:
+                changes[name] = interned
+
+        if changes:
+            node = copy_node(node, **changes)
+        return self._nodes.setdefault(node, node)
+
+    def clear(self):
+        """ Remove all nodes from the table.
+        """
+        self._nodes.clear()
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+def handle(*node_types):
+    """ Decorator to declare a method of a :class:`Visitor` subclass as the
+        handler for the given node types.
+
+        :param node_types: the node classes handled by the method
+    """
+    def inner(func):
+        func.node_types = getattr(func, 'node_types', ()) + node_types
+        return func
+    return inner
+
+
+class Visitor:
+    """ Base class for the translation of an AST, dispatching each node to
+        the handler for its type.
+
+        Handlers are declared on subclasses with the :func:`handle`
+        decorator. As they are referred to by name, subclasses can override
+        a handler by simply overriding the method. Handlers for additional
+        node types can be added to an existing visitor with
+        :meth:`register`, for example by third party backends.
+
+        The handler for a node type is looked up along the MRO of the node
+        type first and then along the MRO of the visitor, so that the most
+        specific handler is used. The result is cached per node type, so
+        dispatching a node takes a single dictionary lookup instead of a
+        chain of ``isinstance`` checks. Nodes without a handler are passed
+        to :meth:`default`.
+    """
+
+    handlers = {}
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handlers = {}
+        for name, value in list(cls.__dict__.items()):
+            for node_type in getattr(value, 'node_types', ()):
+                handlers[node_type] = name
+        cls.handlers = handlers
+        cls._dispatch = {}
+
+    @classmethod
+    def register(cls, node_type, handler=None):
+        """ Register a handler for the given node type on this visitor class
+            and its subclasses. When no handler is passed, a decorator is
+            returned.
+
+            :param node_type: the node class to handle
+            :param handler: a function taking the visitor and the node
+            :return: the handler
+        """
+        if handler is None:
+            return lambda handler: cls.register(node_type, handler)
+
+        cls.handlers[node_type] = handler
+        classes = [cls]
+        while classes:
+            visitor_cls = classes.pop()
+            visitor_cls._dispatch.clear()
+            classes.extend(visitor_cls.__subclasses__())
+        return handler
+
+    @classmethod
+    def get_handler(cls, node_type):
+        """ Get the handler for nodes of the given type.
+
+            :param node_type: the node class
+            :return: a function taking the visitor and the node
+        """
+        try:
+            return cls._dispatch[node_type]
+        except KeyError:
+            pass
+
+        handler = cls.default
+        found = False
+        for base in node_type.__mro__:
+            for visitor_cls in cls.__mro__:
+                handlers = visitor_cls.__dict__.get('handlers')
+                if handlers and base in handlers:
+                    handler = handlers[base]
+                    found = True
+                    break
+            if found:
+                break
+
+        if isinstance(handler, str):
+            handler = getattr(cls, handler)
+        cls._dispatch[node_type] = handler
+        return handler
+
+    def visit(self, node):
+        """ Translate the given node with the handler for its type.
+
+            :param node: the node to translate
+            :return: the result of the handler
+        """
+        try:
+            handler = self._dispatch[type(node)]
+        except KeyError:
+            handler = self.get_handler(type(node))
+        return handler(self, node)
+
+    def default(self, node):
+        """ Handle a node without a registered handler. Raises a
+            ``ValueError``.
+        """
+        raise ValueError('Cannot handle node %r' % (node,))
+
+
+_FIELDS = {}
+
+
+def flatten_combinations(node):
+    """ Merge nested combinations with the same operator into a single
+        n-ary combination, e.g. ``a OR (b OR c)`` into ``a OR b OR c``. The
+        tree is walked iteratively and in linear time, so the deeply nested
+        combinations of large generated filters can be flattened.
+
+        :param node: the root node of the tree
+        :type node: Node
+        :return: the flattened tree
+        :rtype: Node
+    """
+    results = []
+    stack = [(node, None)]
+    while stack:
+        current, operands = stack.pop()
+        if operands is None:
+            if isinstance(current, CombinationConditionNode):
+                operands = []
+                pending = [current]
+                while pending:
+                    item = pending.pop()
+                    if isinstance(item, CombinationConditionNode) and \
+                            item.op == current.op:
+                        pending.extend(reversed(item.sub_nodes))
+                    else:
+                        operands.append(item)
+            elif isinstance(current, NotConditionNode):
+                operands = [current.sub_node]
+            else:
+                results.append(current)
+                continue
+            stack.append((current, operands))
+            stack.extend((operand, None) for operand in reversed(operands))
+            continue
+
+        flattened = results[len(results) - len(operands):]
+        del results[len(results) - len(operands):]
+        if isinstance(current, NotConditionNode):
+            if flattened[0] is not current.sub_node:
+                current = copy_node(current, sub_node=flattened[0])
+        elif len(flattened) != len(current.sub_nodes) or any(
+                a is not b for a, b in zip(flattened, current.sub_nodes)):
+            current = copy_node(current, sub_nodes=tuple(flattened))
+        results.append(current)
+
+    return results[0]
+
+
+def get_fields(node_type):
+    """ Get the names of the attributes stored in the slots of the given node
+        type, including the ones of its base classes.
+
+        :param node_type: the node class
+        :return: the slot names
+        :rtype: tuple[str]
+    """
+    try:
+        return _FIELDS[node_type]
+    except KeyError:
+        pass
+
+    fields = []
+    for cls in reversed(node_type.__mro__):
+        slots = cls.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in ('__dict__', '__weakref__', '_hash'):
+                fields.append(name)
+    _FIELDS[node_type] = fields = tuple(fields)
+    return fields
+
+
 def indent(text, amount, ch=' '):
     padding = amount * ch
     return ''.join(padding+line for line in text.splitlines(True))
 
 
 def get_repr(node, indent_amount=0, indent_incr=4):
-    """ Get a debug representation of the given AST node. ``indent_amount``
-        and ``indent_incr`` are for the recursive call and don't need to be
-        passed.
+    """ Get a debug representation of the given AST node. The tree is
+        walked iteratively, so arbitrarily large trees can be represented.
 
         :param Node node: the node to get the representation for
-        :param int indent_amount: the current indentation level
+        :param int indent_amount: the indentation level of the node
         :param int indent_incr: the indentation incrementation per level
         :return: the represenation of the node
         :rtype: str
     """
-    sub_nodes = node.get_sub_nodes()
-    template = node.get_template()
-
-    args = []
-    for sub_node in sub_nodes:
-        if isinstance(sub_node, Node) and not sub_node.inline:
-            args.append("(\n%s\n)" %
-                indent(
-                    get_repr(sub_node, indent_amount + indent_incr, indent_incr),
-                    indent_amount + indent_incr
-                )
+    def is_nested(sub_node):
+        return isinstance(sub_node, Node) and not sub_node.inline
+
+    # post-order walk: the representations of the nested sub-nodes of a
+    # node are on the ``results`` stack when the node itself is rendered
+    results = []
+    stack = [(node, indent_amount, None)]
+    while stack:
+        current, amount, sub_nodes = stack.pop()
+        if sub_nodes is None:
+            sub_nodes = current.get_sub_nodes()
+            stack.append((current, amount, sub_nodes))
+            stack.extend(
+                (sub_node, amount + indent_incr, None)
+                for sub_node in reversed(sub_nodes) if is_nested(sub_node)
             )
-        else:
-            args.append(repr(sub_node))
-
-    return template % tuple(args)
+            continue
+
+        count = sum(1 for sub_node in sub_nodes if is_nested(sub_node))
+        nested = iter(results[len(results) - count:])
+        del results[len(results) - count:]
+
+        args = []
+        for sub_node in sub_nodes:
+            if is_nested(sub_node):
+                args.append("(\n%s\n)" % indent(
+                    next(nested), amount + indent_incr
+                ))
+            else:
+                args.append(repr(sub_node))
+        results.append(current.get_template() % tuple(args))
+
+    return results[0]
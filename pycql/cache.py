@@ -0,0 +1,112 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+from collections import OrderedDict, namedtuple
+import threading
+
+
+CacheInfo = namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize']
+)
+
+
+class ParseCache:
+    """ A size bounded, least recently used cache of parsed ASTs. The entries
+        are keyed by the CQL text and the factories used to parse it.
+
+        The cached ASTs are shared between all callers receiving them. When
+        an :class:`pycql.ast.Interner` is passed, equal sub-trees of all
+        cached ASTs are shared as well.
+
+        :ivar maxsize: the maximum number of ASTs to keep
+        :type maxsize: int
+        :ivar interner: the optional interning table for the cached ASTs
+        :type interner: ~pycql.ast.Interner
+    """
+
+    def __init__(self, maxsize=1024, interner=None):
+        self.maxsize = maxsize
+        self.interner = interner
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """ Get the cached AST for the given key and mark it as recently
+            used.
+
+            :return: the cached AST or ``default`` if it is not cached
+        """
+        with self._lock:
+            try:
+                node = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return node
+
+    def put(self, key, node):
+        """ Store the AST for the given key, evicting the least recently
+            used entries when the cache is full.
+
+            :return: the stored AST, which is the interned one if the cache
+                     has an interner
+        """
+        with self._lock:
+            if self.interner is not None:
+                node = self.interner.intern(node)
+            self._entries[key] = node
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return node
+
+    def clear(self):
+        """ Remove all entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        """ Get the statistics of this cache.
+
+            :rtype: CacheInfo
+        """
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions,
+                self.maxsize, len(self._entries)
+            )
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,186 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+import numpy as np
+
+
+class Bitmap:
+    """ A set of row ids stored as a packed bitset: one bit per row, eight
+        times smaller than a boolean mask. Intersections, unions and
+        complements are computed bytewise with numpy.
+
+        :param bits: the packed ``uint8`` bits, as of :func:`numpy.packbits`
+        :param size: the number of rows
+    """
+
+    __slots__ = ('bits', 'size')
+
+    def __init__(self, bits, size):
+        self.bits = bits
+        self.size = size
+
+    @classmethod
+    def empty(cls, size):
+        return cls(np.zeros((size + 7) // 8, dtype=np.uint8), size)
+
+    @classmethod
+    def full(cls, size):
+        return ~cls.empty(size)
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls(np.packbits(mask), len(mask))
+
+    @classmethod
+    def from_ids(cls, ids, size):
+        bitmap = cls.empty(size)
+        ids = np.asarray(ids, dtype=np.intp)
+        np.bitwise_or.at(
+            bitmap.bits, ids >> 3,
+            np.left_shift(1, 7 - (ids & 7)).astype(np.uint8)
+        )
+        return bitmap
+
+    def to_mask(self):
+        """ Get the boolean mask of the rows in the set. """
+        return np.unpackbits(self.bits, count=self.size).view(bool)
+
+    def ids(self):
+        """ Get the sorted ids of the rows in the set. """
+        return np.flatnonzero(self.to_mask())
+
+    def count(self):
+        """ Get the number of rows in the set. """
+        return int(np.unpackbits(self.bits, count=self.size).sum())
+
+    def __and__(self, other):
+        return Bitmap(self.bits & other.bits, self.size)
+
+    def __or__(self, other):
+        return Bitmap(self.bits | other.bits, self.size)
+
+    def __invert__(self):
+        bits = ~self.bits
+        if self.size % 8:
+            # clear the padding bits of the last byte
+            bits[-1] &= (0xFF << (8 - self.size % 8)) & 0xFF
+        return Bitmap(bits, self.size)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Bitmap) and self.size == other.size and
+            np.array_equal(self.bits, other.bits)
+        )
+
+    def __repr__(self):
+        return '<Bitmap %d of %d rows>' % (self.count(), self.size)
+
+
+def _key(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class InvertedIndex:
+    """ An inverted index of a column for the vectorized evaluation: maps
+        every distinct value to the :class:`Bitmap` of the rows holding it.
+        Equality, inequality and ``IN`` predicates on the column resolve to
+        lookups and bitmap unions instead of comparing every row, which pays
+        off for low cardinality attributes.
+
+        Missing values (``None``, ``NaN`` or ``NaT``) are not indexed and
+        never match.
+
+        :param values: the values of the column
+    """
+
+    def __init__(self, values):
+        if not isinstance(values, np.ndarray):
+            values = np.array(values, dtype=object)
+        self.values = values
+        self.size = size = len(values)
+
+        if values.dtype.kind == 'O':
+            rows, nulls = {}, []
+            for i, value in enumerate(values.tolist()):
+                if value is None or value != value:
+                    nulls.append(i)
+                else:
+                    rows.setdefault(value, []).append(i)
+            self.nulls = Bitmap.from_ids(nulls, size)
+            groups = rows.items()
+        else:
+            if values.dtype.kind in 'fc':
+                nulls = np.isnan(values)
+            elif values.dtype.kind in 'mM':
+                nulls = np.isnat(values)
+            else:
+                nulls = np.zeros(size, dtype=bool)
+            self.nulls = Bitmap.from_mask(nulls)
+
+            ids = np.flatnonzero(~nulls)
+            distinct, inverse, counts = np.unique(
+                values[ids], return_inverse=True, return_counts=True
+            )
+            groups = zip(
+                (_key(value) for value in distinct),
+                np.split(
+                    ids[np.argsort(inverse, kind='stable')],
+                    np.cumsum(counts)[:-1]
+                )
+            )
+
+        self.bitmaps = {
+            value: Bitmap.from_ids(ids, size) for value, ids in groups
+        }
+
+    def __len__(self):
+        return self.size
+
+    def isnull(self):
+        """ Get the mask of missing values. """
+        return self.nulls.to_mask()
+
+    def equals(self, value):
+        """ Get the bitmap of the rows equal to ``value``. """
+        bitmap = self.bitmaps.get(_key(value))
+        return Bitmap.empty(self.size) if bitmap is None else bitmap
+
+    def not_equals(self, value):
+        """ Get the bitmap of the non-missing rows not equal to ``value``.
+        """
+        return ~(self.equals(value) | self.nulls)
+
+    def isin(self, values, not_=False):
+        """ Get the bitmap of the rows equal to any of ``values``, or of the
+            non-missing rows equal to none of them if ``not_`` is set.
+        """
+        bitmap = Bitmap.empty(self.size)
+        for value in set(_key(value) for value in values):
+            bitmap |= self.equals(value)
+        if not_:
+            return ~(bitmap | self.nulls)
+        return bitmap
@@ -0,0 +1,491 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+from datetime import timedelta
+from operator import add, sub, mul, truediv, eq, ne, lt, le, gt, ge
+import re
+
+from ..parser import parse as _plain_parse
+from ..util import parse_datetime, parse_duration
+from ..values import Geometry, BBox
+from ..ast import (
+    NotConditionNode, CombinationConditionNode, ComparisonPredicateNode,
+    BetweenPredicateNode, LikePredicateNode, InPredicateNode,
+    NullPredicateNode, TemporalPredicateNode, SpatialPredicateNode,
+    BBoxPredicateNode, AttributeExpression, LiteralExpression,
+    ArithmeticExpressionNode, Visitor, handle,
+)
+
+try:
+    from shapely import wkt
+    from shapely.geometry import box
+except ImportError:
+    wkt = box = None
+
+
+def _parse_bbox(bbox):
+    return box(*bbox)
+
+
+OP_TO_COMP = {
+    "=": eq,
+    "<>": ne,
+    "<": lt,
+    "<=": le,
+    ">": gt,
+    ">=": ge,
+}
+
+OP_TO_FUNC = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": truediv,
+}
+
+OP_TO_METHOD = {
+    "INTERSECTS": "intersects",
+    "DISJOINT": "disjoint",
+    "CONTAINS": "contains",
+    "WITHIN": "within",
+    "TOUCHES": "touches",
+    "CROSSES": "crosses",
+    "OVERLAPS": "overlaps",
+    "EQUALS": "equals",
+}
+
+UNITS_TO_METERS = {
+    "meters": 1.0,
+    "kilometers": 1000.0,
+    "feet": 0.3048,
+    "statute miles": 1609.344,
+    "nautical miles": 1852.0,
+}
+
+
+def like_to_regex(pattern, case=True):
+    """ Translate a LIKE pattern to a compiled regular expression. ``%``
+        matches any number of characters, ``_`` exactly one.
+
+        :param pattern: the LIKE pattern
+        :type pattern: str
+        :param case: whether the matching shall be case sensitive
+        :type case: bool
+        :rtype: re.Pattern
+    """
+    regex = ''.join(
+        '.*' if char == '%' else '.' if char == '_' else re.escape(char)
+        for char in pattern
+    )
+    return re.compile(regex, re.DOTALL if case else re.DOTALL | re.IGNORECASE)
+
+
+def get_bounds(geometry):
+    """ Get the ``(minx, miny, maxx, maxy)`` bounds of a geometry, supporting
+        both shapely (``bounds``) and GEOS (``extent``) geometries.
+    """
+    bounds = getattr(geometry, 'bounds', None)
+    if bounds is None:
+        bounds = geometry.extent
+    return bounds
+
+
+def time_period_bounds(time_or_period, op):
+    """ Get the inclusive lower and upper bound for a temporal predicate. One
+        of the bounds is ``None`` if it is open.
+    """
+    if op in ("BEFORE", "AFTER"):
+        if op == "BEFORE":
+            return None, time_or_period
+        return time_or_period, None
+
+    low, high = time_or_period
+    if isinstance(low, timedelta):
+        low = high - low
+    if isinstance(high, timedelta):
+        high = low + high
+
+    if op == "BEFORE OR DURING":
+        return None, high
+    elif op == "DURING OR AFTER":
+        return low, None
+    return low, high
+
+
+def spatial_test(op, pattern=None, distance=None, units=None):
+    """ Create a function testing the spatial relation ``op`` between two
+        geometries. It uses the methods of the geometry objects, so any
+        geometry type providing the shapely or GEOS method names
+        (``intersects``, ``relate_pattern``, ``distance``, ...) can be used.
+        Distances are converted to meters and thus assume a projected CRS
+        measured in meters.
+    """
+    if op == "RELATE":
+        def test(geometry, other):
+            return geometry.relate_pattern(other, pattern)
+    elif op in ("DWITHIN", "BEYOND"):
+        distance *= UNITS_TO_METERS.get(units, 1.0)
+        if op == "DWITHIN":
+            def test(geometry, other):
+                return geometry.distance(other) <= distance
+        else:
+            def test(geometry, other):
+                return geometry.distance(other) > distance
+    else:
+        method = OP_TO_METHOD[op]
+
+        def test(geometry, other):
+            return getattr(geometry, method)(other)
+    return test
+
+
+class PredicateCompiler(Visitor):
+    """ Compiles an AST into a python callable that tests a single record.
+        The tree is only walked once: every node is turned into a closure
+        calling the closures of its sub-nodes, so evaluating a record does
+        not need to inspect the AST anymore.
+
+        Records can be dicts or any other objects: attributes are looked up
+        by key and, if that is not possible, as object attributes. Missing
+        attributes are treated as ``None``. As in SQL, comparisons with
+        ``None`` are never true. Unlike SQL, ``NOT`` simply inverts the
+        result, so negated comparisons match records with missing values.
+    """
+
+    def __init__(self, field_mapping=None):
+        self.field_mapping = field_mapping
+
+    def compile(self, node):
+        """ Compile the given predicate node.
+
+            :param node: the AST node to compile
+            :type node: :class:`pycql.ast.Node`
+            :return: a function taking a record and returning a ``bool``
+        """
+        return self.visit(node)
+
+    def compile_expression(self, node):
+        """ Compile the given expression node.
+
+            :param node: the AST node to compile
+            :type node: :class:`pycql.ast.Node`
+            :return: a function taking a record and returning the value of
+                     the expression
+        """
+        return self.visit(node)
+
+    @handle(NotConditionNode)
+    def compile_not(self, node):
+        sub_predicate = self.compile(node.sub_node)
+        return lambda record: not sub_predicate(record)
+
+    @handle(CombinationConditionNode)
+    def compile_combination(self, node):
+        sub_predicates = [
+            self.compile(sub_node) for sub_node in node.sub_nodes
+        ]
+        if len(sub_predicates) == 2:
+            lhs, rhs = sub_predicates
+            if node.op == "AND":
+                return lambda record: lhs(record) and rhs(record)
+            return lambda record: lhs(record) or rhs(record)
+
+        if node.op == "AND":
+            return lambda record: all(
+                predicate(record) for predicate in sub_predicates
+            )
+        return lambda record: any(
+            predicate(record) for predicate in sub_predicates
+        )
+
+    @handle(ComparisonPredicateNode)
+    def compile_comparison(self, node):
+        return self.compare(node.lhs, node.rhs, OP_TO_COMP[node.op])
+
+    @handle(BetweenPredicateNode)
+    def compile_between(self, node):
+        return self.between(node.lhs, node.low, node.high, node.not_)
+
+    @handle(LikePredicateNode)
+    def compile_like(self, node):
+        return self.like(node.lhs, node.rhs, node.case, node.not_)
+
+    @handle(InPredicateNode)
+    def compile_in(self, node):
+        return self.contains(node.lhs, node.sub_nodes, node.not_)
+
+    @handle(NullPredicateNode)
+    def compile_null(self, node):
+        value = self.compile_expression(node.lhs)
+        if node.not_:
+            return lambda record: value(record) is not None
+        return lambda record: value(record) is None
+
+    @handle(TemporalPredicateNode)
+    def compile_temporal(self, node):
+        return self.temporal(node.lhs, node.rhs, node.op)
+
+    @handle(SpatialPredicateNode)
+    def compile_spatial(self, node):
+        return self.spatial(
+            node.lhs, node.rhs, node.op, node.pattern, node.distance,
+            node.units
+        )
+
+    @handle(BBoxPredicateNode)
+    def compile_bbox(self, node):
+        return self.bbox(node.lhs, node.minx, node.miny, node.maxx, node.maxy)
+
+    @handle(AttributeExpression)
+    def compile_attribute(self, node):
+        return self.attribute(node.name)
+
+    @handle(LiteralExpression)
+    def compile_literal(self, node):
+        value = node.value
+        return lambda record: value
+
+    @handle(ArithmeticExpressionNode)
+    def compile_arithmetic(self, node):
+        lhs = self.compile_expression(node.lhs)
+        rhs = self.compile_expression(node.rhs)
+        func = OP_TO_FUNC[node.op]
+
+        def arithmetic(record):
+            a = lhs(record)
+            b = rhs(record)
+            if a is None or b is None:
+                return None
+            try:
+                return func(a, b)
+            except (TypeError, ZeroDivisionError):
+                return None
+        return arithmetic
+
+    def default(self, node):
+        raise ValueError('Cannot compile node %r' % (node,))
+
+    def attribute(self, name):
+        """ Create an accessor for the attribute with the given name. If the
+            field mapping maps the name to a callable, it is used as the
+            accessor itself.
+        """
+        key = name
+        if self.field_mapping:
+            key = self.field_mapping.get(name, name)
+        if callable(key):
+            return key
+
+        def get(record):
+            try:
+                return record[key]
+            except (KeyError, IndexError):
+                return None
+            except TypeError:
+                return getattr(record, key, None)
+        return get
+
+    def compare(self, lhs, rhs, comp):
+        value = self.compile_expression(lhs)
+
+        if isinstance(rhs, LiteralExpression):
+            constant = rhs.value
+
+            def compare(record):
+                a = value(record)
+                if a is None:
+                    return False
+                try:
+                    return comp(a, constant)
+                except TypeError:
+                    return False
+            return compare
+
+        other = self.compile_expression(rhs)
+
+        def compare_expressions(record):
+            a = value(record)
+            b = other(record)
+            if a is None or b is None:
+                return False
+            try:
+                return comp(a, b)
+            except TypeError:
+                return False
+        return compare_expressions
+
+    def between(self, lhs, low, high, not_=False):
+        value = self.compile_expression(lhs)
+        low = self.compile_expression(low)
+        high = self.compile_expression(high)
+
+        def between(record):
+            a = value(record)
+            if a is None:
+                return False
+            try:
+                return (low(record) <= a <= high(record)) != not_
+            except TypeError:
+                return False
+        return between
+
+    def like(self, lhs, rhs, case=True, not_=False):
+        value = self.compile_expression(lhs)
+        match = like_to_regex(rhs.value, case).fullmatch
+
+        def like(record):
+            a = value(record)
+            if not isinstance(a, str):
+                return False
+            return (match(a) is not None) != not_
+        return like
+
+    def contains(self, lhs, sub_nodes, not_=False):
+        value = self.compile_expression(lhs)
+
+        if all(isinstance(node, LiteralExpression) for node in sub_nodes):
+            choices = [node.value for node in sub_nodes]
+            try:
+                choices = frozenset(choices)
+            except TypeError:
+                pass
+
+            def contains(record):
+                a = value(record)
+                if a is None:
+                    return False
+                try:
+                    return (a in choices) != not_
+                except TypeError:
+                    return False
+            return contains
+
+        items = [self.compile_expression(node) for node in sub_nodes]
+
+        def contains_expressions(record):
+            a = value(record)
+            if a is None:
+                return False
+            return any(a == item(record) for item in items) != not_
+        return contains_expressions
+
+    def temporal(self, lhs, time_or_period, op):
+        value = self.compile_expression(lhs)
+        low, high = time_period_bounds(time_or_period, op)
+
+        def temporal(record):
+            a = value(record)
+            if a is None:
+                return False
+            try:
+                return (
+                    (low is None or low <= a) and (high is None or a <= high)
+                )
+            except TypeError:
+                return False
+        return temporal
+
+    def spatial(self, lhs, rhs, op, pattern=None, distance=None, units=None):
+        """ Spatial predicates are evaluated with the methods of the record's
+            geometry objects, see :func:`spatial_test`.
+        """
+        value = self.compile_expression(lhs)
+        other = self.compile_expression(rhs)
+        if isinstance(distance, LiteralExpression):
+            distance = distance.value
+        test = spatial_test(op, pattern, distance, units)
+
+        def spatial(record):
+            geometry = value(record)
+            if geometry is None:
+                return False
+            return bool(test(geometry, other(record)))
+        return spatial
+
+    def bbox(self, lhs, minx, miny, maxx, maxy):
+        """ The bounding box is tested against the envelope of the record's
+            geometry. It is expected to be in the CRS of the geometries.
+        """
+        value = self.compile_expression(lhs)
+        minx, miny, maxx, maxy = [
+            node.value if isinstance(node, LiteralExpression) else node
+            for node in (minx, miny, maxx, maxy)
+        ]
+
+        def bbox(record):
+            geometry = value(record)
+            if geometry is None:
+                return False
+            gminx, gminy, gmaxx, gmaxy = get_bounds(geometry)
+            return (
+                gminx <= maxx and gmaxx >= minx and
+                gminy <= maxy and gmaxy >= miny
+            )
+        return bbox
+
+
+def to_predicate(ast, field_mapping=None):
+    """ Helper function to compile an ECQL AST to a python predicate
+        function.
+
+        :param ast: the abstract syntax tree
+        :param field_mapping: a dict mapping from the filter name to the key
+                              or attribute name of the records, or to a
+                              function extracting the value from a record.
+        :type ast: :class:`Node`
+        :returns: a function taking a record and returning whether it
+                  matches the filter
+    """
+    if ast is None:
+        return lambda record: True
+    return PredicateCompiler(field_mapping).compile(ast)
+
+
+def parse(cql, cache=None, lazy=False):
+    """ Shorthand for the :func:`pycql.parser.parse` function with
+        the required factories set up: timestamps are parsed to aware
+        datetimes and, if shapely is installed, geometries to shapely
+        geometries.
+
+        :param cql: the CQL expression string to parse
+        :type cql: str
+        :param cache: an optional cache of already parsed expressions
+        :type cache: ~pycql.cache.ParseCache
+        :param lazy: whether literals shall only be created on first access
+        :type lazy: bool
+        :return: the parsed CQL expression as an AST
+        :rtype: ~pycql.ast.Node
+    """
+    return _plain_parse(
+        cql,
+        geometry_factory=wkt.loads if wkt else Geometry,
+        bbox_factory=_parse_bbox if box else BBox,
+        time_factory=parse_datetime,
+        duration_factory=parse_duration,
+        cache=cache,
+        lazy=lazy,
+    )
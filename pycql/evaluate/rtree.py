@@ -0,0 +1,136 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+from math import ceil, sqrt
+
+import numpy as np
+
+
+class STRTree:
+    """ A static R-tree over axis aligned boxes, bulk loaded with the
+        Sort-Tile-Recursive algorithm.
+
+        The tree is stored in flat arrays: the bounds of all levels are
+        concatenated into four ``float64`` arrays, starting with the items
+        in STR order followed by the nodes of each level above. The
+        children of node ``i`` are the entries ``i * node_capacity`` up to
+        ``(i + 1) * node_capacity`` of the level below, so no child pointers
+        are needed. Queries descend the tree one level at a time, testing
+        all open nodes of a level with vectorized numpy operations.
+
+        Boxes with ``NaN`` bounds (missing geometries) are not indexed.
+
+        :param minx: the minimum x values of the boxes
+        :param miny: the minimum y values of the boxes
+        :param maxx: the maximum x values of the boxes
+        :param maxy: the maximum y values of the boxes
+        :param node_capacity: the maximum number of children per node
+    """
+
+    def __init__(self, minx, miny, maxx, maxy, node_capacity=16):
+        if node_capacity < 2:
+            raise ValueError('node_capacity must be at least 2')
+
+        minx, miny, maxx, maxy = (
+            np.asarray(values, dtype=np.float64)
+            for values in (minx, miny, maxx, maxy)
+        )
+        ids = np.flatnonzero(
+            ~(
+                np.isnan(minx) | np.isnan(miny) |
+                np.isnan(maxx) | np.isnan(maxy)
+            )
+        )
+        self.node_capacity = node_capacity
+        self.ids = ids[self._str_order(
+            minx[ids], miny[ids], maxx[ids], maxy[ids], node_capacity
+        )]
+
+        levels = [
+            tuple(values[self.ids] for values in (minx, miny, maxx, maxy))
+        ]
+        while len(levels[-1][0]) > node_capacity:
+            starts = np.arange(0, len(levels[-1][0]), node_capacity)
+            lminx, lminy, lmaxx, lmaxy = levels[-1]
+            levels.append((
+                np.minimum.reduceat(lminx, starts),
+                np.minimum.reduceat(lminy, starts),
+                np.maximum.reduceat(lmaxx, starts),
+                np.maximum.reduceat(lmaxy, starts),
+            ))
+
+        self.sizes = [len(level[0]) for level in levels]
+        self.offsets = np.concatenate([[0], np.cumsum(self.sizes)[:-1]])
+        self.minx, self.miny, self.maxx, self.maxy = (
+            np.concatenate([level[i] for level in levels]) for i in range(4)
+        )
+
+    @staticmethod
+    def _str_order(minx, miny, maxx, maxy, node_capacity):
+        """ Get the Sort-Tile-Recursive order of the boxes: sorted into
+            vertical slabs by their center x, each slab sorted by center y.
+        """
+        count = len(minx)
+        if not count:
+            return np.arange(0)
+
+        leaves = ceil(count / node_capacity)
+        slab_size = ceil(sqrt(leaves)) * node_capacity
+        slabs = np.empty(count, dtype=np.intp)
+        slabs[np.argsort(minx + maxx, kind='stable')] = (
+            np.arange(count) // slab_size
+        )
+        return np.lexsort((miny + maxy, slabs))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def query(self, minx, miny, maxx, maxy):
+        """ Get the ids of all boxes intersecting the given box.
+
+            :return: the sorted array of the matching box ids
+            :rtype: numpy.ndarray
+        """
+        if not len(self):
+            return np.arange(0)
+
+        capacity = self.node_capacity
+        children = np.arange(capacity)
+        level = len(self.sizes) - 1
+        nodes = np.arange(self.sizes[level])
+        while True:
+            entries = nodes + self.offsets[level]
+            nodes = nodes[
+                (self.minx[entries] <= maxx) & (self.maxx[entries] >= minx) &
+                (self.miny[entries] <= maxy) & (self.maxy[entries] >= miny)
+            ]
+            if level == 0:
+                return np.sort(self.ids[nodes])
+
+            level -= 1
+            nodes = (nodes[:, np.newaxis] * capacity + children).ravel()
+            nodes = nodes[nodes < self.sizes[level]]
@@ -0,0 +1,189 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+import numpy as np
+
+from .compiler import get_bounds, spatial_test, UNITS_TO_METERS
+from .rtree import STRTree
+
+
+# spatial operators whose result is true for all non-intersecting envelopes
+DISJOINT_OPS = frozenset(["DISJOINT", "BEYOND"])
+
+
+def envelope_mask(op, envelopes, bounds):
+    """ Test the envelopes ``(minx, miny, maxx, maxy)`` against the
+        ``bounds`` of another geometry: get the mask of the envelopes that
+        may satisfy the spatial relation ``op``.
+    """
+    minx, miny, maxx, maxy = envelopes
+    bminx, bminy, bmaxx, bmaxy = bounds
+    if op == "WITHIN":
+        return (
+            (minx >= bminx) & (maxx <= bmaxx) &
+            (miny >= bminy) & (maxy <= bmaxy)
+        )
+    elif op == "CONTAINS":
+        return (
+            (minx <= bminx) & (maxx >= bmaxx) &
+            (miny <= bminy) & (maxy >= bmaxy)
+        )
+    elif op == "EQUALS":
+        return (
+            (minx == bminx) & (maxx == bmaxx) &
+            (miny == bminy) & (maxy == bmaxy)
+        )
+    return (
+        (minx <= bmaxx) & (maxx >= bminx) &
+        (miny <= bmaxy) & (maxy >= bminy)
+    )
+
+
+class GeometryColumn:
+    """ A column of geometries for the vectorized evaluation. Next to the
+        geometry objects the envelopes of all features are stored as four
+        contiguous ``float64`` arrays (``minx``, ``miny``, ``maxx`` and
+        ``maxy``), so that bounding box tests run in numpy and the exact
+        geometry tests only need to be performed on the remaining
+        candidates.
+
+        With ``index=True`` an :class:`pycql.evaluate.rtree.STRTree` is
+        built over the envelopes, so that the candidates are found without
+        scanning all envelopes.
+
+        Missing geometries (``None``) have ``NaN`` envelopes and never
+        match.
+
+        :param geometries: the geometry objects
+        :param bounds: optionally the precomputed ``(n, 4)`` array of the
+                       envelopes. When omitted they are calculated with
+                       :func:`pycql.evaluate.compiler.get_bounds`.
+        :param index: whether to build a spatial index
+        :param node_capacity: the node capacity of the spatial index
+    """
+
+    def __init__(self, geometries, bounds=None, index=False, node_capacity=16):
+        geometries = list(geometries)
+        self.geometries = np.empty(len(geometries), dtype=object)
+        self.geometries[:] = geometries
+
+        if bounds is None:
+            bounds = np.full((len(geometries), 4), np.nan)
+            for i, geometry in enumerate(geometries):
+                if geometry is not None:
+                    bounds[i] = get_bounds(geometry)
+        bounds = np.asarray(bounds, dtype=np.float64).reshape(-1, 4)
+        self.minx, self.miny, self.maxx, self.maxy = (
+            np.ascontiguousarray(bounds[:, i]) for i in range(4)
+        )
+
+        self.index = None
+        if index:
+            self.index = STRTree(
+                self.minx, self.miny, self.maxx, self.maxy, node_capacity
+            )
+
+    def __len__(self):
+        return len(self.geometries)
+
+    def isnull(self):
+        """ Get the mask of missing geometries. """
+        return np.isnan(self.minx)
+
+    def _mask(self, ids):
+        mask = np.zeros(len(self), dtype=bool)
+        mask[ids] = True
+        return mask
+
+    def intersects_bbox(self, minx, miny, maxx, maxy):
+        """ Get the mask of all envelopes intersecting the given box. """
+        return self._mask(
+            self.candidates("INTERSECTS", (minx, miny, maxx, maxy))
+        )
+
+    def within_bbox(self, minx, miny, maxx, maxy):
+        """ Get the mask of all envelopes within the given box. """
+        return self._mask(self.candidates("WITHIN", (minx, miny, maxx, maxy)))
+
+    def contains_bbox(self, minx, miny, maxx, maxy):
+        """ Get the mask of all envelopes containing the given box. """
+        return self._mask(
+            self.candidates("CONTAINS", (minx, miny, maxx, maxy))
+        )
+
+    def candidates(self, op, bounds, distance=None):
+        """ Get the sorted ids of all features that may satisfy the spatial
+            relation ``op`` with a geometry of the given envelope. For
+            ``DISJOINT`` and ``BEYOND`` these are the features that may
+            *not* satisfy it.
+        """
+        if op == "RELATE":
+            # the pattern decides, no envelope test is possible
+            return np.flatnonzero(~self.isnull())
+
+        if op in ("DWITHIN", "BEYOND"):
+            minx, miny, maxx, maxy = bounds
+            bounds = (
+                minx - distance, miny - distance,
+                maxx + distance, maxy + distance
+            )
+
+        envelopes = (self.minx, self.miny, self.maxx, self.maxy)
+        if self.index is None:
+            return np.flatnonzero(envelope_mask(op, envelopes, bounds))
+
+        ids = self.index.query(*bounds)
+        if op in ("WITHIN", "CONTAINS", "EQUALS"):
+            envelopes = tuple(values[ids] for values in envelopes)
+            ids = ids[envelope_mask(op, envelopes, bounds)]
+        return ids
+
+    def spatial(self, other, op, pattern=None, distance=None, units=None):
+        """ Get the mask of all features satisfying the spatial relation
+            ``op`` with the ``other`` geometry. Features are first filtered
+            by their envelopes, only the remaining candidates are tested
+            with the methods of the geometry objects (see
+            :func:`pycql.evaluate.compiler.spatial_test`).
+        """
+        if distance is not None:
+            distance *= UNITS_TO_METERS.get(units, 1.0)
+            units = None
+
+        ids = self.candidates(op, get_bounds(other), distance)
+        test = spatial_test(op, pattern, distance, units)
+
+        geometries = self.geometries
+        matches = np.fromiter(
+            (bool(test(geometries[i], other)) for i in ids),
+            dtype=bool, count=len(ids)
+        )
+
+        if op in DISJOINT_OPS:
+            mask = ~self.isnull()
+            mask[ids[~matches]] = False
+            return mask
+        return self._mask(ids[matches])
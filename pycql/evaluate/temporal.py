@@ -0,0 +1,117 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+def to_numpy_value(value):
+    """ Convert a literal value to its numpy counterpart. Timezone aware
+        datetimes are converted to UTC ``datetime64`` values.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return np.datetime64(value, 'us')
+    return value
+
+
+def to_datetime64(values):
+    """ Convert a sequence of datetimes to a ``datetime64`` array in UTC.
+        Missing values (``None``) become ``NaT``.
+    """
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'M':
+        return values
+    return np.array([
+        np.datetime64('NaT') if value is None else to_numpy_value(value)
+        for value in values
+    ], dtype='datetime64[us]')
+
+
+class TimeColumn:
+    """ A column of timestamps or time intervals for the vectorized
+        evaluation, indexed for temporal predicates.
+
+        The rows are kept sorted by their begin, so that temporal predicates
+        resolve with a binary search instead of a scan of all rows. An
+        interval matches a predicate when it lies completely within the
+        queried bounds: for ``BEFORE`` its end is before the instant, for
+        ``AFTER`` its begin is after it and for ``DURING`` both are within
+        the period. Bounds are inclusive, as for plain ``datetime64``
+        columns.
+
+        Missing values (``NaT`` or ``None``) never match.
+
+        :param begin: the timestamps or the interval begins
+        :param end: the interval ends. When omitted, the column holds
+                    timestamps.
+    """
+
+    def __init__(self, begin, end=None):
+        begin = to_datetime64(begin)
+        end = begin if end is None else to_datetime64(end)
+        if len(begin) != len(end):
+            raise ValueError('begin and end must have the same length')
+
+        self.size = len(begin)
+        self.nulls = np.isnat(begin) | np.isnat(end)
+        self.ids = np.flatnonzero(~self.nulls)
+        self.ids = self.ids[np.argsort(begin[self.ids], kind='stable')]
+        self.begin = begin[self.ids]
+        self.end = end[self.ids]
+        self.instants = end is begin
+
+    def __len__(self):
+        return self.size
+
+    def isnull(self):
+        """ Get the mask of missing values. """
+        return self.nulls.copy()
+
+    def query(self, low=None, high=None, sort=True):
+        """ Get the ids of the rows within the given bounds. Either bound
+            may be ``None`` to leave it open.
+
+            :param sort: whether to sort the ids. Otherwise they are in the
+                         order of the indexed begins.
+            :return: the array of the matching row ids
+            :rtype: numpy.ndarray
+        """
+        low, high = to_numpy_value(low), to_numpy_value(high)
+
+        start, stop = 0, len(self.begin)
+        if low is not None:
+            start = np.searchsorted(self.begin, low, side='left')
+        if high is not None:
+            # an interval ending before ``high`` also began before it
+            stop = np.searchsorted(self.begin, high, side='right')
+
+        ids = self.ids[start:stop]
+        if high is not None and not self.instants:
+            ids = ids[self.end[start:stop] <= high]
+        return np.sort(ids) if sort else ids
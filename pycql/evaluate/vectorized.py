@@ -0,0 +1,427 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+from functools import reduce
+from operator import (
+    add, sub, mul, truediv, eq, ne, lt, le, gt, ge, and_, or_,
+)
+
+import numpy as np
+
+from ..ast import (
+    NotConditionNode, CombinationConditionNode, ComparisonPredicateNode,
+    BetweenPredicateNode, LikePredicateNode, InPredicateNode,
+    NullPredicateNode, TemporalPredicateNode, SpatialPredicateNode,
+    BBoxPredicateNode, AttributeExpression, LiteralExpression,
+    ArithmeticExpressionNode, Visitor, handle,
+)
+from .bitmap import Bitmap, InvertedIndex
+from .compiler import like_to_regex, time_period_bounds
+from .spatial import GeometryColumn
+from .temporal import TimeColumn, to_numpy_value
+
+
+OP_TO_COMP = {
+    "=": eq,
+    "<>": ne,
+    "<": lt,
+    "<=": le,
+    ">": gt,
+    ">=": ge,
+}
+
+OP_TO_FUNC = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": truediv,
+}
+
+
+def null_mask(values):
+    """ Get the mask of missing values of a column: ``NaN`` for floating
+        point columns, ``NaT`` for datetime columns and ``None`` for object
+        columns.
+    """
+    kind = values.dtype.kind
+    if kind in 'fc':
+        return np.isnan(values)
+    elif kind in 'mM':
+        return np.isnat(values)
+    elif kind == 'O':
+        return np.equal(values, None)
+    return np.zeros(len(values), dtype=bool)
+
+
+class MaskEvaluator(Visitor):
+    """ Evaluates an AST against columnar data: a mapping of attribute names
+        to one-dimensional numpy arrays of equal length. Every predicate is
+        computed for all rows at once with vectorized numpy operations,
+        resulting in a boolean mask of the matching rows.
+
+        Missing values (see :func:`null_mask`) never satisfy a comparison.
+        Timestamps are compared as ``datetime64`` values in UTC. Temporal
+        predicates can also use the sorted index of a
+        :class:`pycql.evaluate.temporal.TimeColumn`. Spatial predicates
+        require the geometries to be passed as a
+        :class:`pycql.evaluate.spatial.GeometryColumn`. Equality and ``IN``
+        predicates on columns passed as an
+        :class:`pycql.evaluate.bitmap.InvertedIndex` are resolved with
+        index lookups.
+    """
+
+    def __init__(self, columns, field_mapping=None):
+        self.columns = columns
+        self.field_mapping = field_mapping
+        self.size = len(next(iter(columns.values()))) if columns else 0
+
+    def to_mask(self, node):
+        """ Evaluate the given predicate node.
+
+            :param node: the AST node to evaluate
+            :type node: :class:`pycql.ast.Node`
+            :return: the mask of matching rows
+            :rtype: numpy.ndarray
+        """
+        return self.visit(node)
+
+    def evaluate(self, node):
+        """ Evaluate the given expression node.
+
+            :return: either an array of values or a scalar value
+        """
+        return self.visit(node)
+
+    @handle(NotConditionNode)
+    def evaluate_not(self, node):
+        return ~self.to_mask(node.sub_node)
+
+    @handle(CombinationConditionNode)
+    def evaluate_combination(self, node):
+        # skip the remaining operands once the result is decided
+        to_mask = self.to_mask
+        sub_nodes = iter(node.sub_nodes)
+        mask = to_mask(next(sub_nodes))
+        for sub_node in sub_nodes:
+            if node.op == "AND":
+                if not mask.any():
+                    break
+                mask = mask & to_mask(sub_node)
+            else:
+                if mask.all():
+                    break
+                mask = mask | to_mask(sub_node)
+        return mask
+
+    @handle(ComparisonPredicateNode)
+    def evaluate_comparison(self, node):
+        bitmap = self.index_bitmap(node)
+        if bitmap is not None:
+            return bitmap.to_mask()
+        return self.compare(node.lhs, node.rhs, OP_TO_COMP[node.op])
+
+    @handle(BetweenPredicateNode)
+    def evaluate_between(self, node):
+        return self.between(node.lhs, node.low, node.high, node.not_)
+
+    @handle(LikePredicateNode)
+    def evaluate_like(self, node):
+        return self.like(node.lhs, node.rhs, node.case, node.not_)
+
+    @handle(InPredicateNode)
+    def evaluate_in(self, node):
+        bitmap = self.index_bitmap(node)
+        if bitmap is not None:
+            return bitmap.to_mask()
+        return self.contains(node.lhs, node.sub_nodes, node.not_)
+
+    @handle(NullPredicateNode)
+    def evaluate_null(self, node):
+        mask = self._nulls(self.evaluate(node.lhs))
+        return ~mask if node.not_ else mask
+
+    @handle(TemporalPredicateNode)
+    def evaluate_temporal(self, node):
+        return self.temporal(node.lhs, node.rhs, node.op)
+
+    @handle(SpatialPredicateNode)
+    def evaluate_spatial(self, node):
+        return self.spatial(
+            node.lhs, node.rhs, node.op, node.pattern, node.distance,
+            node.units
+        )
+
+    @handle(BBoxPredicateNode)
+    def evaluate_bbox(self, node):
+        return self.bbox(node.lhs, node.minx, node.miny, node.maxx, node.maxy)
+
+    @handle(AttributeExpression)
+    def evaluate_attribute(self, node):
+        values = self.attribute(node.name)
+        if isinstance(values, InvertedIndex):
+            return values.values
+        return values
+
+    @handle(LiteralExpression)
+    def evaluate_literal(self, node):
+        return to_numpy_value(node.value)
+
+    @handle(ArithmeticExpressionNode)
+    def evaluate_arithmetic(self, node):
+        return OP_TO_FUNC[node.op](
+            self.evaluate(node.lhs), self.evaluate(node.rhs)
+        )
+
+    def default(self, node):
+        raise ValueError('Cannot evaluate node %r' % (node,))
+
+    def attribute(self, name):
+        if self.field_mapping:
+            name = self.field_mapping.get(name, name)
+        return self.columns[name]
+
+    def index_bitmap(self, node):
+        """ Resolve an ``=``, ``<>`` or ``IN`` predicate of an indexed
+            column and literal values with its
+            :class:`pycql.evaluate.bitmap.InvertedIndex`.
+
+            :return: the bitmap of the matching rows or ``None`` if the
+                     predicate cannot use an index
+            :rtype: :class:`pycql.evaluate.bitmap.Bitmap`
+        """
+        if not isinstance(node.lhs, AttributeExpression):
+            return None
+        index = self.attribute(node.lhs.name)
+        if not isinstance(index, InvertedIndex):
+            return None
+
+        if isinstance(node, ComparisonPredicateNode):
+            if node.op not in ("=", "<>") or \
+                    not isinstance(node.rhs, LiteralExpression):
+                return None
+            value = to_numpy_value(node.rhs.value)
+            if node.op == "=":
+                return index.equals(value)
+            return index.not_equals(value)
+
+        if not all(
+            isinstance(sub, LiteralExpression) for sub in node.sub_nodes
+        ):
+            return None
+        return index.isin(
+            [to_numpy_value(sub.value) for sub in node.sub_nodes], node.not_
+        )
+
+    def _nulls(self, values):
+        if isinstance(values, np.ndarray):
+            return null_mask(values)
+        elif isinstance(values, (GeometryColumn, TimeColumn)):
+            return values.isnull()
+        return np.full(self.size, values is None)
+
+    def _apply(self, func, values, *args):
+        """ Apply ``func`` to the non-missing values only, so that comparing
+            object columns with missing values does not fail.
+        """
+        nulls = self._nulls(values)
+        for arg in args:
+            nulls = nulls | self._nulls(arg)
+
+        if not nulls.any():
+            return np.asarray(func(values, *args), dtype=bool)
+
+        valid = ~nulls
+        mask = np.zeros(self.size, dtype=bool)
+        if isinstance(values, np.ndarray):
+            values = values[valid]
+        args = [
+            arg[valid] if isinstance(arg, np.ndarray) else arg
+            for arg in args
+        ]
+        mask[valid] = func(values, *args)
+        return mask
+
+    def compare(self, lhs, rhs, comp):
+        return self._apply(comp, self.evaluate(lhs), self.evaluate(rhs))
+
+    def between(self, lhs, low, high, not_=False):
+        def between(values, low, high):
+            mask = (values >= low) & (values <= high)
+            return ~mask if not_ else mask
+
+        return self._apply(
+            between, self.evaluate(lhs), self.evaluate(low),
+            self.evaluate(high)
+        )
+
+    def like(self, lhs, rhs, case=True, not_=False):
+        match = like_to_regex(rhs.value, case).fullmatch
+
+        def like(values):
+            mask = np.fromiter(
+                (isinstance(v, str) and match(v) is not None for v in values),
+                dtype=bool, count=len(values)
+            )
+            return ~mask if not_ else mask
+
+        return self._apply(like, self.evaluate(lhs))
+
+    def contains(self, lhs, sub_nodes, not_=False):
+        choices = [self.evaluate(node) for node in sub_nodes]
+
+        def contains(values):
+            return np.isin(values, choices, invert=not_)
+
+        return self._apply(contains, self.evaluate(lhs))
+
+    def temporal(self, lhs, time_or_period, op):
+        low, high = time_period_bounds(time_or_period, op)
+        values = self.evaluate(lhs)
+        if isinstance(values, TimeColumn):
+            mask = np.zeros(self.size, dtype=bool)
+            mask[values.query(low, high, sort=False)] = True
+            return mask
+
+        def temporal(values):
+            mask = np.ones(len(values), dtype=bool)
+            if low is not None:
+                mask &= values >= to_numpy_value(low)
+            if high is not None:
+                mask &= values <= to_numpy_value(high)
+            return mask
+
+        return self._apply(temporal, values)
+
+    def _geometries(self, lhs):
+        geometries = self.evaluate(lhs)
+        if not isinstance(geometries, GeometryColumn):
+            raise ValueError(
+                'Spatial predicates require a GeometryColumn, got %r'
+                % type(geometries).__name__
+            )
+        return geometries
+
+    def spatial(self, lhs, rhs, op, pattern=None, distance=None, units=None):
+        if isinstance(distance, LiteralExpression):
+            distance = distance.value
+        return self._geometries(lhs).spatial(
+            self.evaluate(rhs), op, pattern, distance, units
+        )
+
+    def bbox(self, lhs, minx, miny, maxx, maxy):
+        return self._geometries(lhs).intersects_bbox(*(
+            node.value if isinstance(node, LiteralExpression) else node
+            for node in (minx, miny, maxx, maxy)
+        ))
+
+
+class BitmapEvaluator(Visitor):
+    """ Evaluates an AST against columnar data like the
+        :class:`MaskEvaluator`, but represents intermediate results as
+        :class:`pycql.evaluate.bitmap.Bitmap` objects: predicates on
+        indexed columns are taken from the index and ``AND``, ``OR`` and
+        ``NOT`` become bitmap intersections, unions and complements. Other
+        predicates are evaluated as masks by a :class:`MaskEvaluator` and
+        packed.
+    """
+
+    def __init__(self, columns, field_mapping=None):
+        self.masks = MaskEvaluator(columns, field_mapping)
+        self.size = self.masks.size
+
+    def to_bitmap(self, node):
+        """ Evaluate the given predicate node.
+
+            :param node: the AST node to evaluate
+            :type node: :class:`pycql.ast.Node`
+            :return: the bitmap of matching rows
+            :rtype: :class:`pycql.evaluate.bitmap.Bitmap`
+        """
+        return self.visit(node)
+
+    def to_mask(self, node):
+        """ Evaluate the given predicate node as a mask, see
+            :meth:`MaskEvaluator.to_mask`.
+        """
+        return self.masks.to_mask(node)
+
+    @handle(NotConditionNode)
+    def bitmap_not(self, node):
+        return ~self.to_bitmap(node.sub_node)
+
+    @handle(CombinationConditionNode)
+    def bitmap_combination(self, node):
+        bitmaps = [self.to_bitmap(sub_node) for sub_node in node.sub_nodes]
+        if node.op == "AND":
+            return reduce(and_, bitmaps)
+        return reduce(or_, bitmaps)
+
+    @handle(ComparisonPredicateNode, InPredicateNode)
+    def bitmap_index(self, node):
+        bitmap = self.masks.index_bitmap(node)
+        if bitmap is not None:
+            return bitmap
+        return self.default(node)
+
+    def default(self, node):
+        return Bitmap.from_mask(self.to_mask(node))
+
+
+def to_mask(ast, columns, field_mapping=None):
+    """ Helper function to evaluate an ECQL AST against columnar data.
+
+        :param ast: the abstract syntax tree
+        :param columns: a dict mapping column names to numpy arrays
+        :param field_mapping: a dict mapping from the filter name to the
+                              column name.
+        :type ast: :class:`Node`
+        :returns: the boolean mask of the matching rows
+        :rtype: numpy.ndarray
+    """
+    evaluator = MaskEvaluator(columns, field_mapping)
+    if ast is None:
+        return np.ones(evaluator.size, dtype=bool)
+    return evaluator.to_mask(ast)
+
+
+def to_bitmap(ast, columns, field_mapping=None):
+    """ Helper function to evaluate an ECQL AST against columnar data,
+        resulting in a bitmap.
+
+        :param ast: the abstract syntax tree
+        :param columns: a dict mapping column names to numpy arrays or
+                        indexes
+        :param field_mapping: a dict mapping from the filter name to the
+                              column name.
+        :type ast: :class:`Node`
+        :returns: the bitmap of the matching rows
+        :rtype: :class:`pycql.evaluate.bitmap.Bitmap`
+    """
+    evaluator = BitmapEvaluator(columns, field_mapping)
+    if ast is None:
+        return Bitmap.full(evaluator.size)
+    return evaluator.to_bitmap(ast)
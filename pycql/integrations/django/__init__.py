@@ -1,2 +1,2 @@
-from .evaluate import to_filter
-from .parser import parse
\ No newline at end of file
+from .evaluate import to_filter, to_template, TemplateCache
+from .parser import parse
@@ -26,92 +26,125 @@
 # ------------------------------------------------------------------------------
 
 
+from django.contrib.gis.geos import Polygon, GEOSGeometry
+from django.utils.dateparse import parse_datetime
+
 from . import filters
 from ...parser import parse
 from ...ast import (
     NotConditionNode, CombinationConditionNode, ComparisonPredicateNode,
-    BetweenPredicateNode, BetweenPredicateNode, LikePredicateNode,
-    InPredicateNode, NullPredicateNode, TemporalPredicateNode,
-    SpatialPredicateNode, BBoxPredicateNode, AttributeExpression,
-    LiteralExpression, ArithmeticExpressionNode,
+    BetweenPredicateNode, LikePredicateNode, InPredicateNode,
+    NullPredicateNode, TemporalPredicateNode, SpatialPredicateNode,
+    BBoxPredicateNode, AttributeExpression, LiteralExpression,
+    ArithmeticExpressionNode, ParameterExpression, Visitor, handle,
 )
+from ...optimize import equalities_to_in
+from ...template import TemplateCache as _TemplateCache, compile_template
+from ...util import parse_duration
 
 
-class FilterEvaluator:
+class FilterEvaluator(Visitor):
     def __init__(self, field_mapping=None, mapping_choices=None):
         self.field_mapping = field_mapping
         self.mapping_choices = mapping_choices
 
-    def to_filter(self, node):
-        to_filter = self.to_filter
-        if isinstance(node, NotConditionNode):
-            return filters.negate(to_filter(node.sub_node))
-        elif isinstance(node, CombinationConditionNode):
-            return filters.combine(
-                (to_filter(node.lhs), to_filter(node.rhs)), node.op
-            )
-        elif isinstance(node, ComparisonPredicateNode):
-            return filters.compare(
-                to_filter(node.lhs), to_filter(node.rhs), node.op,
-                self.mapping_choices
-            )
-        elif isinstance(node, BetweenPredicateNode):
-            return filters.between(
-                to_filter(node.lhs), to_filter(node.low), to_filter(node.high),
-                node.not_
-            )
-        elif isinstance(node, BetweenPredicateNode):
-            return filters.between(
-                to_filter(node.lhs), to_filter(node.low), to_filter(node.high),
-                node.not_
-            )
-        elif isinstance(node, LikePredicateNode):
-            return filters.like(
-                to_filter(node.lhs), to_filter(node.rhs), node.case, node.not_,
-                self.mapping_choices
-
-            )
-        elif isinstance(node, InPredicateNode):
-            return filters.contains(
-                to_filter(node.lhs), [
-                    to_filter(sub_node) for sub_node in node.sub_nodes
-                ], node.not_, self.mapping_choices
-            )
-        elif isinstance(node, NullPredicateNode):
-            return filters.null(
-                to_filter(node.lhs), node.not_
-            )
-        elif isinstance(node, TemporalPredicateNode):
-            return filters.temporal(
-                to_filter(node.lhs), node.rhs, node.op
-            )
-        elif isinstance(node, SpatialPredicateNode):
-            return filters.spatial(
-                to_filter(node.lhs), to_filter(node.rhs), node.op,
-                to_filter(node.pattern),
-                to_filter(node.distance),
-                to_filter(node.units)
-            )
-        elif isinstance(node, BBoxPredicateNode):
-            return filters.bbox(
-                to_filter(node.lhs),
-                to_filter(node.minx),
-                to_filter(node.miny),
-                to_filter(node.maxx),
-                to_filter(node.maxy),
-                to_filter(node.crs)
-            )
-        elif isinstance(node, AttributeExpression):
-            return filters.attribute(node.name, self.field_mapping)
-
-        elif isinstance(node, LiteralExpression):
-            return node.value
-
-        elif isinstance(node, ArithmeticExpressionNode):
-            return filters.arithmetic(
-                to_filter(node.lhs), to_filter(node.rhs), node.op
-            )
+    to_filter = Visitor.visit
+
+    @handle(NotConditionNode)
+    def not_condition(self, node):
+        return filters.negate(self.to_filter(node.sub_node))
+
+    @handle(CombinationConditionNode)
+    def combination(self, node):
+        # chains of equalities on an attribute are translated to IN
+        node = equalities_to_in(node)
+        if not isinstance(node, CombinationConditionNode):
+            return self.to_filter(node)
+        return filters.combine(
+            [self.to_filter(sub_node) for sub_node in node.sub_nodes], node.op
+        )
+
+    @handle(ComparisonPredicateNode)
+    def comparison(self, node):
+        return filters.compare(
+            self.to_filter(node.lhs), self.to_filter(node.rhs), node.op,
+            self.mapping_choices
+        )
+
+    @handle(BetweenPredicateNode)
+    def between(self, node):
+        return filters.between(
+            self.to_filter(node.lhs), self.to_filter(node.low),
+            self.to_filter(node.high), node.not_
+        )
+
+    @handle(LikePredicateNode)
+    def like(self, node):
+        return filters.like(
+            self.to_filter(node.lhs), self.to_filter(node.rhs), node.case,
+            node.not_, self.mapping_choices
+        )
+
+    @handle(InPredicateNode)
+    def in_(self, node):
+        return filters.contains(
+            self.to_filter(node.lhs), [
+                self.to_filter(sub_node) for sub_node in node.sub_nodes
+            ], node.not_, self.mapping_choices
+        )
+
+    @handle(NullPredicateNode)
+    def null(self, node):
+        return filters.null(
+            self.to_filter(node.lhs), node.not_
+        )
+
+    @handle(TemporalPredicateNode)
+    def temporal(self, node):
+        return filters.temporal(
+            self.to_filter(node.lhs), node.rhs, node.op
+        )
 
+    @handle(SpatialPredicateNode)
+    def spatial(self, node):
+        return filters.spatial(
+            self.to_filter(node.lhs), self.to_filter(node.rhs), node.op,
+            self.to_filter(node.pattern),
+            self.to_filter(node.distance),
+            self.to_filter(node.units)
+        )
+
+    @handle(BBoxPredicateNode)
+    def bbox(self, node):
+        return filters.bbox(
+            self.to_filter(node.lhs),
+            self.to_filter(node.minx),
+            self.to_filter(node.miny),
+            self.to_filter(node.maxx),
+            self.to_filter(node.maxy),
+            self.to_filter(node.crs)
+        )
+
+    @handle(AttributeExpression)
+    def attribute(self, node):
+        return filters.attribute(node.name, self.field_mapping)
+
+    @handle(LiteralExpression)
+    def literal(self, node):
+        return node.value
+
+    @handle(ArithmeticExpressionNode)
+    def arithmetic(self, node):
+        return filters.arithmetic(
+            self.to_filter(node.lhs), self.to_filter(node.rhs), node.op
+        )
+
+    @handle(ParameterExpression)
+    def parameter(self, node):
+        return filters.parameter(node.name)
+
+    def default(self, node):
+        # plain values are passed through
         return node
 
 
@@ -127,3 +160,59 @@ def to_filter(ast, field_mapping=None, mapping_choices=None):
         :rtype: :class:`django.db.models.Q`
     """
     return FilterEvaluator(field_mapping, mapping_choices).to_filter(ast)
+
+
+def _choice_attributes(field_mapping=None, mapping_choices=None):
+    """ Get the names of the attributes with choices, as their values are
+        mapped during the translation and cannot be parameters.
+    """
+    if not mapping_choices:
+        return ()
+    names = set(mapping_choices)
+    if field_mapping:
+        names.update(
+            name for name, field in field_mapping.items()
+            if field in mapping_choices
+        )
+    return names
+
+
+def to_template(ast, field_mapping=None, mapping_choices=None):
+    """ Helper function to translate ECQL AST to a template of a Django
+        query, with placeholders in place of the literal values.
+
+        :param ast: the abstract syntax tree
+        :param field_mapping: a dict mapping from the filter name to the Django
+                              field lookup.
+        :param mapping_choices: a dict mapping field lookups to choices.
+        :type ast: :class:`Node`
+        :returns: the template and the parameter values of the AST
+        :rtype: tuple[~pycql.template.FilterTemplate, dict]
+    """
+    return compile_template(
+        ast, FilterEvaluator(field_mapping, mapping_choices).to_filter,
+        filters.bind, _choice_attributes(field_mapping, mapping_choices)
+    )
+
+
+class TemplateCache(_TemplateCache):
+    """ A cache of Django query templates keyed by the shape of the CQL
+        text, see :class:`pycql.template.TemplateCache`.
+
+        :param field_mapping: a dict mapping from the filter name to the Django
+                              field lookup.
+        :param mapping_choices: a dict mapping field lookups to choices.
+        :param maxsize: the maximum number of templates to keep
+    """
+
+    def __init__(self, field_mapping=None, mapping_choices=None,
+                 maxsize=1024):
+        super().__init__(
+            FilterEvaluator(field_mapping, mapping_choices).to_filter,
+            filters.bind, maxsize,
+            _choice_attributes(field_mapping, mapping_choices),
+            geometry_factory=GEOSGeometry,
+            bbox_factory=Polygon.from_bbox,
+            time_factory=parse_datetime,
+            duration_factory=parse_duration,
+        )
@@ -26,9 +26,9 @@
 # ------------------------------------------------------------------------------
 
 
-from operator import and_, or_, add, sub, mul, truediv
+from copy import copy
+from operator import add, sub, mul, truediv
 from datetime import datetime, timedelta
-from functools import reduce
 
 try:
     from collections import OrderedDict
@@ -58,12 +58,17 @@ def combine(sub_filters, combinator="AND"):
         :return: the combined filter
         :rtype: :class:`django.db.models.Q`
     """
+    sub_filters = list(sub_filters)
     for sub_filter in sub_filters:
         assert isinstance(sub_filter, Q)
 
     assert combinator in ("AND", "OR")
-    op = and_ if combinator == "AND" else or_
-    return reduce(lambda acc, q: op(acc, q) if acc else q, sub_filters)
+    # build a single Q node with all children instead of nesting them
+    # pairwise, which takes quadratic time for long chains
+    sub_filters = [sub_filter for sub_filter in sub_filters if sub_filter]
+    if len(sub_filters) == 1:
+        return sub_filters[0]
+    return Q(*sub_filters, _connector=Q.AND if combinator == "AND" else Q.OR)
 
 
 def negate(sub_filter):
@@ -497,6 +502,61 @@ def literal(value):
     return Value(value)
 
 
+class Parameter(Value):
+    """ A named placeholder for a value which is bound later, see
+        :func:`bind`.
+    """
+
+    def __init__(self, name):
+        super().__init__(None)
+        self.name = name
+
+
+def parameter(name):
+    """ Create a placeholder for a value which is bound later.
+
+        :param name: the name of the parameter
+        :type name: str
+        :rtype: :class:`Parameter`
+    """
+    return Parameter(name)
+
+
+def bind(q, values):
+    """ Bind the placeholders of a filter to values. The filter itself is
+        left unchanged, the placeholders are replaced in a copy.
+
+        :param q: the filter with placeholders
+        :type q: :class:`django.db.models.Q`
+        :param values: a dict mapping the parameter names to their values
+        :type values: dict
+        :return: the filter with the bound values
+        :rtype: :class:`django.db.models.Q`
+    """
+    return _bind(q, values)
+
+
+def _bind(value, values, expression=False):
+    if isinstance(value, Parameter):
+        value = values[value.name]
+        # within expressions values need to be wrapped
+        return Value(value) if expression else value
+    elif isinstance(value, Q):
+        q = copy(value)
+        q.children = [_bind(child, values) for child in value.children]
+        return q
+    elif isinstance(value, (list, tuple)):
+        return type(value)(_bind(item, values) for item in value)
+    elif isinstance(value, Expression):
+        value = value.copy()
+        value.set_source_expressions([
+            _bind(source, values, True)
+            for source in value.get_source_expressions()
+        ])
+        return value
+    return value
+
+
 OP_TO_FUNC = {
     "+": add,
     "-": sub,
@@ -32,16 +32,20 @@ from ...parser import parse as _plain_parse
 from ...util import parse_duration
 
 
-def parse(cql):
+def parse(cql, cache=None, lazy=False):
     """ Shorthand for the :func:`pycql.parser.parse` function with
         the required factories set up.
 
         :param cql: the CQL expression string to parse
         :type cql: str
+        :param cache: an optional cache of already parsed expressions
+        :type cache: ~pycql.cache.ParseCache
+        :param lazy: whether literals shall only be created on first access
+        :type lazy: bool
         :return: the parsed CQL expression as an AST
         :rtype: ~pycql.ast.Node 
     """
     return _plain_parse(
         cql, GEOSGeometry, Polygon.from_bbox, parse_datetime,
-        parse_duration
+        parse_duration, cache=cache, lazy=lazy
     )
@@ -1,2 +1,2 @@
-from .evaluate import to_filter
-from .parser import parse
+from .evaluate import to_filter, to_template, TemplateCache
+from .parser import parse, parse_datetime_fallback
@@ -13,90 +13,179 @@ from ...ast import (
     AttributeExpression,
     LiteralExpression,
     ArithmeticExpressionNode,
+    ParameterExpression,
+    Visitor,
+    handle,
 )
+from ...optimize import equalities_to_in
+from ...template import TemplateCache as _TemplateCache, compile_template
+from ...util import parse_duration
+from .parser import parse_bbox, parse_datetime, parse_geometry
 
 
-class FilterEvaluator:
-    def __init__(self, field_mapping=None):
+class FilterEvaluator(Visitor):
+    def __init__(self, field_mapping=None, bboverlaps=False):
         self.field_mapping = field_mapping
+        self.bboverlaps = bboverlaps
 
-    def to_filter(self, node):
-        to_filter = self.to_filter
-        if isinstance(node, NotConditionNode):
-            return filters.negate(to_filter(node.sub_node))
-        elif isinstance(node, CombinationConditionNode):
-            return filters.combine(
-                (to_filter(node.lhs), to_filter(node.rhs)), node.op
-            )
-        elif isinstance(node, ComparisonPredicateNode):
-            return filters.runop(
-                to_filter(node.lhs), to_filter(node.rhs), node.op,
-            )
-        elif isinstance(node, BetweenPredicateNode):
-            return filters.between(
-                to_filter(node.lhs),
-                to_filter(node.low),
-                to_filter(node.high),
-                node.not_,
-            )
-        elif isinstance(node, LikePredicateNode):
-            return filters.like(
-                to_filter(node.lhs), to_filter(node.rhs), node.case, node.not_,
-            )
-        elif isinstance(node, InPredicateNode):
-            return filters.runop(
-                to_filter(node.lhs),
-                [to_filter(sub_node) for sub_node in node.sub_nodes],
-                "in",
-                node.not_,
-            )
-        elif isinstance(node, NullPredicateNode):
-            return filters.runop(
-                to_filter(node.lhs), None, "is_null", node.not_
-            )
-        elif isinstance(node, TemporalPredicateNode):
-            return filters.temporal(to_filter(node.lhs), node.rhs, node.op)
-        elif isinstance(node, SpatialPredicateNode):
-            return filters.spatial(
-                to_filter(node.lhs),
-                to_filter(node.rhs),
-                node.op,
-                to_filter(node.pattern),
-                to_filter(node.distance),
-                to_filter(node.units),
-            )
-        elif isinstance(node, BBoxPredicateNode):
-            return filters.bbox(
-                to_filter(node.lhs),
-                to_filter(node.minx),
-                to_filter(node.miny),
-                to_filter(node.maxx),
-                to_filter(node.maxy),
-                to_filter(node.crs),
-            )
-        elif isinstance(node, AttributeExpression):
-            return filters.attribute(node.name, self.field_mapping)
-
-        elif isinstance(node, LiteralExpression):
-            return node.value
-
-        elif isinstance(node, ArithmeticExpressionNode):
-            return filters.runop(
-                to_filter(node.lhs), to_filter(node.rhs), node.op
-            )
+    to_filter = Visitor.visit
 
+    @handle(NotConditionNode)
+    def not_condition(self, node):
+        return filters.negate(self.to_filter(node.sub_node))
+
+    @handle(CombinationConditionNode)
+    def combination(self, node):
+        # chains of equalities on an attribute are translated to IN
+        node = equalities_to_in(node)
+        if not isinstance(node, CombinationConditionNode):
+            return self.to_filter(node)
+        return filters.combine(
+            [self.to_filter(sub_node) for sub_node in node.sub_nodes], node.op
+        )
+
+    @handle(ComparisonPredicateNode)
+    def comparison(self, node):
+        return filters.runop(
+            self.to_filter(node.lhs), self.to_filter(node.rhs), node.op,
+        )
+
+    @handle(BetweenPredicateNode)
+    def between(self, node):
+        return filters.between(
+            self.to_filter(node.lhs),
+            self.to_filter(node.low),
+            self.to_filter(node.high),
+            node.not_,
+        )
+
+    @handle(LikePredicateNode)
+    def like(self, node):
+        return filters.like(
+            self.to_filter(node.lhs), self.to_filter(node.rhs), node.case,
+            node.not_,
+        )
+
+    @handle(InPredicateNode)
+    def in_(self, node):
+        return filters.runop(
+            self.to_filter(node.lhs),
+            [self.to_filter(sub_node) for sub_node in node.sub_nodes],
+            "in",
+            node.not_,
+        )
+
+    @handle(NullPredicateNode)
+    def null(self, node):
+        return filters.runop(
+            self.to_filter(node.lhs), None, "is_null", node.not_
+        )
+
+    @handle(TemporalPredicateNode)
+    def temporal(self, node):
+        return filters.temporal(self.to_filter(node.lhs), node.rhs, node.op)
+
+    @handle(SpatialPredicateNode)
+    def spatial(self, node):
+        return filters.spatial(
+            self.to_filter(node.lhs),
+            self.to_filter(node.rhs),
+            node.op,
+            self.to_filter(node.pattern),
+            self.to_filter(node.distance),
+            self.to_filter(node.units),
+        )
+
+    @handle(BBoxPredicateNode)
+    def bbox(self, node):
+        return filters.bbox(
+            self.to_filter(node.lhs),
+            self.to_filter(node.minx),
+            self.to_filter(node.miny),
+            self.to_filter(node.maxx),
+            self.to_filter(node.maxy),
+            self.to_filter(node.crs),
+            self.bboverlaps,
+        )
+
+    @handle(AttributeExpression)
+    def attribute(self, node):
+        return filters.attribute(node.name, self.field_mapping)
+
+    @handle(LiteralExpression)
+    def literal(self, node):
+        return node.value
+
+    @handle(ArithmeticExpressionNode)
+    def arithmetic(self, node):
+        return filters.runop(
+            self.to_filter(node.lhs), self.to_filter(node.rhs), node.op
+        )
+
+    @handle(ParameterExpression)
+    def parameter(self, node):
+        return filters.parameter(node.name)
+
+    def default(self, node):
+        # plain values are passed through
         return node
 
 
-def to_filter(ast, field_mapping=None):
+def to_filter(ast, field_mapping=None, bboverlaps=False):
     """ Helper function to translate ECQL AST to Django Query expressions.
 
         :param ast: the abstract syntax tree
         :param field_mapping: a dict mapping from the filter name to the Django
                               field lookup.
         :param mapping_choices: a dict mapping field lookups to choices.
+        :param bboverlaps: whether ``BBOX`` shall only test the overlap of
+                           the bounding boxes with the ``&&`` operator
         :type ast: :class:`Node`
         :returns: a Django query object
         :rtype: :class:`django.db.models.Q`
     """
-    return FilterEvaluator(field_mapping).to_filter(ast)
+    return FilterEvaluator(field_mapping, bboverlaps).to_filter(ast)
+
+
+def to_template(ast, field_mapping=None, bboverlaps=False):
+    """ Helper function to translate ECQL AST to a template of an SQLAlchemy
+        filter expression, with bound parameters in place of the literal
+        values.
+
+        :param ast: the abstract syntax tree
+        :param field_mapping: a dict mapping from the filter name to the
+                              SQLAlchemy column.
+        :param bboverlaps: whether ``BBOX`` shall only test the overlap of
+                           the bounding boxes with the ``&&`` operator
+        :type ast: :class:`Node`
+        :returns: the template and the parameter values of the AST
+        :rtype: tuple[~pycql.template.FilterTemplate, dict]
+    """
+    return compile_template(
+        ast, FilterEvaluator(field_mapping, bboverlaps).to_filter,
+        filters.bind
+    )
+
+
+class TemplateCache(_TemplateCache):
+    """ A cache of SQLAlchemy filter templates keyed by the shape of the CQL
+        text, see :class:`pycql.template.TemplateCache`.
+
+        :param field_mapping: a dict mapping from the filter name to the
+                              SQLAlchemy column.
+        :param maxsize: the maximum number of templates to keep
+        :param bboverlaps: whether ``BBOX`` shall only test the overlap of
+                           the bounding boxes with the ``&&`` operator
+        :param time_factory: the factory for time literals
+    """
+
+    def __init__(self, field_mapping=None, maxsize=1024, bboverlaps=False,
+                 time_factory=parse_datetime):
+        super().__init__(
+            FilterEvaluator(field_mapping, bboverlaps).to_filter,
+            filters.bind, maxsize,
+            geometry_factory=parse_geometry,
+            bbox_factory=parse_bbox,
+            time_factory=time_factory,
+            duration_factory=parse_duration,
+        )
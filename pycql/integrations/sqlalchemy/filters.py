@@ -1,7 +1,9 @@
+import re
 from datetime import timedelta
-from functools import reduce
 from inspect import signature
-from sqlalchemy import and_, func, not_, or_
+from sqlalchemy import and_, bindparam, func, not_, or_
+from sqlalchemy.sql.expression import ClauseElement
+from sqlalchemy.sql.operators import ColumnOperators
 from .parser import parse_bbox
 
 
@@ -63,6 +65,51 @@ class Operator:
         self.arity = len(signature(self.function).parameters)
 
 
+# the operators are immutable, so they are created once and shared
+OPERATORS = {name: Operator(name) for name in Operator.OPERATORS}
+
+
+def get_operator(operator: str = None):
+    """ Get the shared :class:`Operator` for the given operator name.
+
+        :param operator: the name of the operator, ``"=="`` by default
+        :return: the operator
+        :rtype: :class:`Operator`
+    """
+    try:
+        return OPERATORS[operator or "=="]
+    except KeyError:
+        raise Exception("Operator `{}` not valid.".format(operator))
+
+
+ARITHMETIC_OPERATORS = frozenset(["+", "-", "*", "/"])
+
+
+def is_expression(value):
+    """ Check whether the value is an SQL expression, e.g. a column, an ORM
+        attribute or a bound parameter, rather than a plain python value.
+    """
+    return (
+        isinstance(value, (ClauseElement, ColumnOperators))
+        or hasattr(value, "__clause_element__")
+    )
+
+
+def bound(value):
+    """ Get a bound parameter for a plain value on the left hand side of an
+        operation. Otherwise the operation would be evaluated in Python and
+        its result rendered as a constant, so that the SQL, and thus the
+        compiled statement cache key, would depend on the value. SQL
+        expressions are returned unchanged.
+
+        :param value: the plain value or SQL expression
+        :return: the SQL expression
+    """
+    if is_expression(value):
+        return value
+    return bindparam(None, value)
+
+
 def combine(sub_filters, combinator: str = "AND"):
     """ Combine filters using a logical combinator
 
@@ -72,11 +119,7 @@ def combine(sub_filters, combinator: str = "AND"):
     """
     assert combinator in ("AND", "OR")
     _op = and_ if combinator == "AND" else or_
-
-    def test(acc, q):
-        return _op(acc, q)
-
-    return reduce(test, sub_filters)
+    return _op(*sub_filters)
 
 
 def negate(sub_filter):
@@ -96,7 +139,13 @@ def runop(lhs, rhs=None, op: str = "=", negate: bool = False):
         :param op: a string denoting the operation.
         :return: a comparison expression object
     """
-    _op = Operator(op)
+    _op = get_operator(op)
+    if not is_expression(lhs):
+        if op in ARITHMETIC_OPERATORS and not is_expression(rhs):
+            # constant arithmetic is folded in python, as e.g. the division
+            # of integers differs in SQL
+            return _op.function(lhs, rhs)
+        lhs = bound(lhs)
 
     if negate:
         return not_(_op.function(lhs, rhs))
@@ -114,8 +163,9 @@ def between(lhs, low, high, negate=False):
                      exclusive
         :return: a comparison expression object
     """
-    l_op = Operator("<=")
-    g_op = Operator(">=")
+    l_op = OPERATORS["<="]
+    g_op = OPERATORS[">="]
+    lhs = bound(lhs)
     if negate:
         return not_(and_(g_op.function(lhs, low), l_op.function(lhs, high)))
     return and_(g_op.function(lhs, low), l_op.function(lhs, high))
@@ -134,9 +184,10 @@ def like(lhs, rhs, case=False, negate=False):
         :return: a comparison expression object
     """
     if case:
-        _op = Operator("like")
+        _op = OPERATORS["like"]
     else:
-        _op = Operator("ilike")
+        _op = OPERATORS["ilike"]
+    lhs = bound(lhs)
 
     if negate:
         return not_(_op.function(lhs, rhs))
@@ -183,6 +234,10 @@ def temporal(lhs, time_or_period, op):
 
 UNITS_LOOKUP = {"kilometers": "km", "meters": "m"}
 
+RE_CRS_SRID = re.compile(
+    r"EPSG(?::[\d.]*:|:|/\d+/|\.xml#)(\d+)$", re.IGNORECASE
+)
+
 
 def spatial(lhs, rhs, op, pattern=None, distance=None, units=None):
     """ Create a spatial filter for the given spatial attribute.
@@ -200,7 +255,7 @@ def spatial(lhs, rhs, op, pattern=None, distance=None, units=None):
         :return: a comparison expression object
     """
 
-    _op = Operator(op)
+    _op = get_operator(op)
     if op == "RELATE":
         return _op.function(lhs, rhs, pattern)
     elif op in ("DWITHIN", "BEYOND"):
@@ -213,7 +268,33 @@ def spatial(lhs, rhs, op, pattern=None, distance=None, units=None):
         return _op.function(lhs, rhs)
 
 
-def bbox(lhs, minx, miny, maxx, maxy, crs=4326):
+def get_srid(crs=None, default: int = 4326):
+    """ Get the numeric SRID of a CRS identifier, e.g. ``"EPSG:3857"``,
+        ``"urn:ogc:def:crs:EPSG::3857"``,
+        ``"http://www.opengis.net/def/crs/EPSG/0/3857"`` or
+        ``"http://www.opengis.net/gml/srs/epsg.xml#3857"``. ``"CRS:84"`` and
+        the other CRS84 identifiers are resolved to 4326.
+        Raises a ``ValueError`` for unsupported identifiers.
+
+        :param crs: the CRS identifier or SRID
+        :param default: the SRID to use when no CRS is given
+        :return: the SRID
+        :rtype: int
+    """
+    if crs is None:
+        return default
+    elif isinstance(crs, int):
+        return crs
+    elif str(crs).upper().replace(":", "").endswith("CRS84"):
+        return 4326
+
+    match = RE_CRS_SRID.search(str(crs))
+    if not match:
+        raise ValueError("Unsupported CRS `{}`.".format(crs))
+    return int(match.group(1))
+
+
+def bbox(lhs, minx, miny, maxx, maxy, crs=None, bboverlaps=False):
     """ Create a bounding box filter for the given spatial attribute.
 
         :param lhs: the field to compare
@@ -221,11 +302,35 @@ def bbox(lhs, minx, miny, maxx, maxy, crs=4326):
         :param miny: the lower y part of the bbox
         :param maxx: the upper x part of the bbox
         :param maxy: the upper y part of the bbox
-        :param crs: the CRS the bbox is expressed in
+        :param crs: the CRS the bbox is expressed in, ``EPSG:4326`` by
+                    default. The box is transformed to the SRID of the
+                    field, if the field declares one and it differs. Boxes
+                    in a CRS unknown to :func:`get_srid` are used as
+                    ``EPSG:4326`` without transformation.
+        :param bboverlaps: whether to only test the overlap of the bounding
+                           boxes with the ``&&`` operator, which is answered
+                           by the spatial index alone
         :return: a comparison expression object
     """
+    try:
+        srid = get_srid(crs)
+        field_srid = getattr(getattr(lhs, "type", None), "srid", None)
+    except ValueError:
+        srid = 4326
+        field_srid = None
+
+    if bboverlaps:
+        box = func.ST_MakeEnvelope(minx, miny, maxx, maxy, srid)
+    else:
+        box = parse_bbox([minx, miny, maxx, maxy], srid)
+    # only transform to an SRID the field actually declares, geoalchemy2
+    # uses -1 for geometries without one
+    if field_srid is not None and field_srid > 0 and srid != field_srid:
+        box = func.ST_Transform(box, field_srid)
 
-    return lhs.ST_Intersects(parse_bbox([minx, miny, maxx, maxy]))
+    if bboverlaps:
+        return lhs.op("&&", is_comparison=True)(box)
+    return lhs.ST_Intersects(box)
 
 
 def attribute(name, field_mapping=None):
@@ -241,3 +346,22 @@ def attribute(name, field_mapping=None):
 
 def literal(value):
     return value
+
+
+def parameter(name):
+    """ Create a named bound parameter, for the value to be bound later.
+
+        :param name: the name of the parameter
+        :return: the bound parameter
+    """
+    return bindparam(name)
+
+
+def bind(expression, values):
+    """ Bind the parameters of a filter expression to values.
+
+        :param expression: the filter with parameters
+        :param values: a dict mapping the parameter names to their values
+        :return: the filter with the bound values
+    """
+    return expression.params(values)
@@ -3,40 +3,64 @@ import logging
 import re
 
 from ...parser import parse as _plain_parse
-from ...util import parse_duration
-from dateparser import parse as parse_datetime
-from sqlalchemy import func
+from ...util import bbox_to_wkb, parse_datetime, parse_duration, wkt_to_wkb
+from sqlalchemy import LargeBinary, func, literal
 
 LOGGER = logging.getLogger(__name__)
 
+RE_SRID = re.compile(r"\s*SRID=(\d+);", re.IGNORECASE)
 
-def parse_geometry(geom):
-    LOGGER.debug(f"PARSE GEOM: {geom}")
-    search = re.search(r"SRID=(\d+);", geom)
 
-    sridtxt = "" if search else "SRID=4326;"
-    LOGGER.debug(f"{sridtxt}{geom}")
+def parse_geometry(geom, srid: int=4326):
+    """ Create a geometry expression from a (E)WKT string. The geometry is
+        sent to the database as a WKB bind parameter, so the database does
+        not have to parse WKT and the statement text does not depend on the
+        coordinates. An ``SRID=...;`` prefix overrides the ``srid``.
+    """
+    LOGGER.debug(f"PARSE GEOM: {geom}")
+    match = RE_SRID.match(geom)
+    if match:
+        srid = int(match.group(1))
+        geom = geom[match.end():]
 
-    return func.ST_GeomFromEWKT(f"{sridtxt}{geom}")
+    return func.ST_GeomFromWKB(literal(wkt_to_wkb(geom), LargeBinary), srid)
 
 
 def parse_bbox(box, srid: int=4326):
-    LOGGER.debug("PARSE BBOX: {type(box)}, {box}")
-    minx, miny, maxx, maxy = box
-    return func.ST_GeomFromEWKT(
-        f"SRID={srid};POLYGON(("
-        f"{minx} {miny}, {minx} {maxy}, "
-        f"{maxx} {maxy}, {maxx} {miny}, "
-        f"{minx} {miny}))"
+    """ Create a polygon expression from a ``(minx, miny, maxx, maxy)`` box,
+        bound as a WKB parameter like in :func:`parse_geometry`.
+    """
+    LOGGER.debug(f"PARSE BBOX: {type(box)}, {box}")
+    return func.ST_GeomFromWKB(
+        literal(bbox_to_wkb(*box), LargeBinary), srid
     )
 
 
-def parse(cql):
+def parse_datetime_fallback(value):
+    """ Parse a timestamp with :func:`pycql.util.parse_datetime`, falling
+        back to ``dateparser`` for any other format.
+    """
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        # dateparser is slow to import, so only do it when it is needed
+        from dateparser import parse as _dateparser_parse
+        return _dateparser_parse(value)
+
+
+def parse(cql, cache=None, lazy=False, time_factory=parse_datetime):
     """ Shorthand for the :func:`pycql.parser.parse` function with
         the required factories set up.
 
         :param cql: the CQL expression string to parse
         :type cql: str
+        :param cache: an optional cache of already parsed expressions
+        :type cache: ~pycql.cache.ParseCache
+        :param lazy: whether literals shall only be created on first access
+        :type lazy: bool
+        :param time_factory: the factory for time literals, e.g.
+                             :func:`parse_datetime_fallback` to use
+                             ``dateparser``
         :return: the parsed CQL expression as an AST
         :rtype: ~pycql.ast.Node
     """
@@ -44,6 +68,8 @@ def parse(cql):
         cql,
         geometry_factory=parse_geometry,
         bbox_factory=parse_bbox,
-        time_factory=parse_datetime,
+        time_factory=time_factory,
         duration_factory=parse_duration,
+        cache=cache,
+        lazy=lazy,
     )
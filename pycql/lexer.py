@@ -26,10 +26,12 @@
 # ------------------------------------------------------------------------------
 
 import logging
+import re
 
 from ply import lex
 from ply.lex import TOKEN
 
+from .util import match_geometry
 from . import values
 
 LOGGER = logging.getLogger(__name__)
@@ -37,25 +39,37 @@ LOGGER = logging.getLogger(__name__)
 
 class CQLLexer:
     def __init__(self, geometry_factory=values.Geometry, bbox_factory=values.BBox,
-                 time_factory=values.Time, duration_factory=values.Duration, **kwargs):
+                 time_factory=values.Time, duration_factory=values.Duration,
+                 lazy=False, **kwargs):
 
         self.lexer = lex.lex(object=self, **kwargs)
         self.geometry_factory = geometry_factory
         self.bbox_factory = bbox_factory
         self.time_factory = time_factory
         self.duration_factory = duration_factory
+        self.lazy = lazy
 
     def build(self, **kwargs):
         pass
         # self.lexer.build()
 
     def input(self, *args):
+        # the lexer is reused for several inputs, so reset the line counter
+        self.lexer.lineno = 1
         self.lexer.input(*args)
 
     def token(self):
         self.last_token = self.lexer.token()
         return self.last_token
 
+    def literal(self, factory, raw):
+        """ Create the value of a literal token using the factory, or defer
+            it to the first access when the lexer is ``lazy``.
+        """
+        if self.lazy:
+            return values.Lazy(factory, raw)
+        return factory(raw)
+
     keywords = (
         "NOT", "AND", "OR",
         "BETWEEN", "LIKE", "ILIKE", "IN", "IS", "NULL",
@@ -142,6 +156,13 @@ class CQLLexer:
         ) +
         r'(MULTIPOLYGON\s*\(%s\))' % nested_coordinate_groups_pattern
     )
+    # the lexer rule only matches the start of a geometry, the rest is
+    # scanned by :func:`pycql.util.match_geometry`, as the nested
+    # ``geometry_pattern`` scales badly with the number of coordinates
+    geometry_start_pattern = (
+        r'(MULTIPOLYGON|MULTILINESTRING|MULTIPOINT|POLYGON|POINT|LINESTRING)'
+        r'\s*\('
+    )
     envelope_pattern = r'ENVELOPE\s*\((\s*%s\s*){4}\)' % number_pattern
 
     t_PLUS = r'\+'
@@ -164,10 +185,31 @@ class CQLLexer:
     t_RBRACKET = r'\]'
     t_COMMA = r','
 
-    @TOKEN(geometry_pattern)
+    re_duration = re.compile(duration_pattern, re.VERBOSE)
+    re_identifier = re.compile(identifier_pattern, re.VERBOSE)
+
+    @TOKEN(geometry_start_pattern)
     def t_GEOMETRY(self, t):
-        t.value = self.geometry_factory(t.value)
-        return t
+        data = t.lexer.lexdata
+        end = match_geometry(data, t.lexpos)
+        if end >= 0:
+            t.lexer.lexpos = end
+            t.value = self.literal(self.geometry_factory, data[t.lexpos:end])
+            return t
+
+        # not a valid geometry: produce the token of the rule that would
+        # have matched otherwise
+        if data[t.lexpos] == 'P':
+            match = self.re_duration.match(data, t.lexpos)
+            t.type = 'DURATION'
+            rule = self.t_DURATION
+        else:
+            match = self.re_identifier.match(data, t.lexpos)
+            rule = self.t_ATTRIBUTE
+
+        t.lexer.lexpos = match.end()
+        t.value = match.group()
+        return rule(t)
 
     @TOKEN(envelope_pattern)
     def t_ENVELOPE(self, t):
@@ -175,7 +217,7 @@ class CQLLexer:
             float(number) for number in
             t.value.partition('(')[2].partition(')')[0].split()
         ]
-        t.value = self.bbox_factory(bbox)
+        t.value = self.literal(self.bbox_factory, bbox)
         return t
 
     @TOKEN(r'(feet)|(meters)|(statute miles)|(nautical miles)|(kilometers)')
@@ -184,12 +226,12 @@ class CQLLexer:
 
     @TOKEN(time_pattern)
     def t_TIME(self, t):
-        t.value = self.time_factory(t.value)
+        t.value = self.literal(self.time_factory, t.value)
         return t
 
     @TOKEN(duration_pattern)
     def t_DURATION(self, t):
-        t.value = self.duration_factory(t.value)
+        t.value = self.literal(self.duration_factory, t.value)
         return t
 
     @TOKEN(float_pattern)
@@ -0,0 +1,572 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" Optimization passes rewriting an AST into an equivalent one that is
+    cheaper to evaluate.
+"""
+
+from collections import namedtuple
+from numbers import Number
+from operator import add, sub, mul, truediv
+
+from .ast import (
+    NotConditionNode, CombinationConditionNode, ComparisonPredicateNode,
+    BetweenPredicateNode, LikePredicateNode, InPredicateNode,
+    NullPredicateNode, TemporalPredicateNode, SpatialPredicateNode,
+    BBoxPredicateNode, AttributeExpression, LiteralExpression,
+    ArithmeticExpressionNode, copy_node,
+)
+
+
+OP_TO_FUNC = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": truediv,
+}
+
+
+AttributeStatistics = namedtuple(
+    'AttributeStatistics', ['distinct', 'null_fraction', 'minimum', 'maximum']
+)
+# set the defaults this way, as ``namedtuple(defaults=...)`` requires python
+# 3.7
+AttributeStatistics.__new__.__defaults__ = (None, 0.0, None, None)
+AttributeStatistics.__doc__ = """ Optional statistics of an attribute to
+    improve the selectivity estimates: the number of ``distinct`` values,
+    the fraction of missing values and the ``minimum`` and ``maximum`` of
+    numeric attributes.
+"""
+
+
+class CostModel:
+    """ Estimates the evaluation cost and the selectivity, the fraction of
+        matching records, of predicates.
+
+        Costs are relative to a simple comparison. Without statistics the
+        selectivities are fixed guesses per predicate type; with
+        :class:`AttributeStatistics` for an attribute, predicates on it
+        with literal values are estimated from the number of distinct
+        values and the value range.
+
+        :param statistics: a dict mapping attribute names to their
+                           :class:`AttributeStatistics`
+    """
+
+    COSTS = {
+        ComparisonPredicateNode: 1.0,
+        BetweenPredicateNode: 1.5,
+        LikePredicateNode: 5.0,
+        InPredicateNode: 1.5,
+        NullPredicateNode: 0.5,
+        TemporalPredicateNode: 2.0,
+        BBoxPredicateNode: 5.0,
+        SpatialPredicateNode: 50.0,
+    }
+
+    SELECTIVITIES = {
+        "=": 0.1,
+        "<>": 0.9,
+        "<": 0.3,
+        "<=": 0.3,
+        ">": 0.3,
+        ">=": 0.3,
+    }
+
+    def __init__(self, statistics=None):
+        self.statistics = statistics or {}
+
+    def cost(self, node):
+        """ Estimate the cost to evaluate a node. The cost of a combination
+            is the expected cost when its operands are evaluated in order
+            and evaluation stops as soon as the result is known.
+        """
+        if isinstance(node, NotConditionNode):
+            return self.cost(node.sub_node)
+
+        elif isinstance(node, CombinationConditionNode):
+            cost, reach = 0.0, 1.0
+            for operand in flatten(node):
+                cost += reach * self.cost(operand)
+                selectivity = self.selectivity(operand)
+                reach *= selectivity if node.op == "AND" else 1 - selectivity
+            return cost
+
+        cost = self.COSTS.get(type(node), 1.0)
+        if isinstance(node, InPredicateNode):
+            cost += 0.1 * len(node.sub_nodes)
+        elif isinstance(node, SpatialPredicateNode) and node.op == "RELATE":
+            cost *= 2
+        return cost + self.expression_cost(getattr(node, 'lhs', None))
+
+    def expression_cost(self, node):
+        if isinstance(node, ArithmeticExpressionNode):
+            return (
+                1.0 + self.expression_cost(node.lhs) +
+                self.expression_cost(node.rhs)
+            )
+        return 0.0
+
+    def selectivity(self, node):
+        """ Estimate the fraction of records matching a node. """
+        if isinstance(node, NotConditionNode):
+            return 1.0 - self.selectivity(node.sub_node)
+
+        elif isinstance(node, CombinationConditionNode):
+            result = 1.0
+            for operand in flatten(node):
+                selectivity = self.selectivity(operand)
+                result *= selectivity if node.op == "AND" else 1 - selectivity
+            return result if node.op == "AND" else 1.0 - result
+
+        statistics = None
+        if isinstance(getattr(node, 'lhs', None), AttributeExpression):
+            statistics = self.statistics.get(node.lhs.name)
+
+        if isinstance(node, NullPredicateNode):
+            null_fraction = statistics.null_fraction if statistics else 0.1
+            return 1.0 - null_fraction if node.not_ else null_fraction
+
+        selectivity = None
+        if statistics:
+            selectivity = self._estimate(node, statistics)
+            if selectivity is not None:
+                selectivity *= 1.0 - statistics.null_fraction
+
+        if selectivity is None:
+            selectivity = self._guess(node)
+        return min(max(selectivity, 0.0), 1.0)
+
+    def _guess(self, node):
+        if isinstance(node, ComparisonPredicateNode):
+            return self.SELECTIVITIES[node.op]
+        elif isinstance(node, BetweenPredicateNode):
+            return 0.75 if node.not_ else 0.25
+        elif isinstance(node, LikePredicateNode):
+            return 0.75 if node.not_ else 0.25
+        elif isinstance(node, InPredicateNode):
+            selectivity = min(0.1 * len(node.sub_nodes), 0.5)
+            return 1.0 - selectivity if node.not_ else selectivity
+        elif isinstance(node, SpatialPredicateNode):
+            return 0.9 if node.op in ("DISJOINT", "BEYOND") else 0.1
+        elif isinstance(node, BBoxPredicateNode):
+            return 0.1
+        return 0.3
+
+    def _estimate(self, node, statistics):
+        """ Estimate the selectivity of a predicate from the statistics of
+            its attribute, or return ``None`` if not possible.
+        """
+        distinct = statistics.distinct
+        if isinstance(node, ComparisonPredicateNode):
+            if node.op in ("=", "<>") and distinct:
+                selectivity = 1.0 / distinct
+                return selectivity if node.op == "=" else 1.0 - selectivity
+            fraction = self._fraction(node.rhs, statistics)
+            if fraction is None:
+                return None
+            return fraction if node.op in ("<", "<=") else 1.0 - fraction
+
+        elif isinstance(node, BetweenPredicateNode):
+            low = self._fraction(node.low, statistics)
+            high = self._fraction(node.high, statistics)
+            if low is None or high is None:
+                return None
+            selectivity = max(high - low, 0.0)
+            return 1.0 - selectivity if node.not_ else selectivity
+
+        elif isinstance(node, InPredicateNode) and distinct:
+            selectivity = min(len(set(node.sub_nodes)) / distinct, 1.0)
+            return 1.0 - selectivity if node.not_ else selectivity
+        return None
+
+    def _fraction(self, node, statistics):
+        """ Estimate the fraction of the values below a literal, assuming
+            a uniform distribution between the minimum and the maximum.
+        """
+        minimum, maximum = statistics.minimum, statistics.maximum
+        if not isinstance(node, LiteralExpression) or \
+                minimum is None or maximum is None:
+            return None
+        try:
+            if maximum == minimum:
+                return 0.0 if node.value < minimum else 1.0
+            fraction = (node.value - minimum) / (maximum - minimum)
+        except TypeError:
+            return None
+        return min(max(fraction, 0.0), 1.0)
+
+
+def flatten(node):
+    """ Get the operands of a combination, including the ones of nested
+        combinations with the same operator, e.g. ``[a, b, c]`` for
+        ``(a AND b) AND c``.
+    """
+    operands = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, CombinationConditionNode) and \
+                current.op == node.op:
+            stack.extend(reversed(current.sub_nodes))
+        else:
+            operands.append(current)
+    return operands
+
+
+def combine(operands, op):
+    """ Combine the operands to a single combination node, or return the
+        only operand.
+    """
+    if len(operands) == 1:
+        return operands[0]
+    return CombinationConditionNode(operands, op)
+
+
+def reorder(ast, statistics=None, cost_model=None):
+    """ Reorder the operands of all ``AND`` and ``OR`` chains so that
+        evaluators which stop as soon as the result is known (short
+        circuit) evaluate as little as possible: operands that are cheap to
+        evaluate and likely to decide the result come first.
+
+        The operands of an ``AND`` are ordered by ``cost / (1 -
+        selectivity)``, the ones of an ``OR`` by ``cost / selectivity``,
+        which minimizes the expected evaluation cost for independent
+        predicates. Operands of equal rank keep their order. Nested chains
+        of the same operator are merged.
+
+        :param ast: the AST to optimize
+        :type ast: :class:`pycql.ast.Node`
+        :param statistics: a dict mapping attribute names to their
+                           :class:`AttributeStatistics`
+        :param cost_model: the cost model to use instead of a
+                           :class:`CostModel` of the ``statistics``
+        :return: the reordered AST
+        :rtype: :class:`pycql.ast.Node`
+    """
+    if cost_model is None:
+        cost_model = CostModel(statistics)
+
+    def rank(operand, op):
+        selectivity = cost_model.selectivity(operand)
+        decisive = 1.0 - selectivity if op == "AND" else selectivity
+        if decisive <= 0.0:
+            return float('inf')
+        return cost_model.cost(operand) / decisive
+
+    def visit(node):
+        if isinstance(node, NotConditionNode):
+            return copy_node(node, sub_node=visit(node.sub_node))
+
+        elif isinstance(node, CombinationConditionNode):
+            operands = [visit(operand) for operand in flatten(node)]
+            operands.sort(key=lambda operand: rank(operand, node.op))
+            return combine(operands, node.op)
+
+        return node
+
+    if ast is None:
+        return None
+    return visit(ast)
+
+
+def _is_number(node):
+    return (
+        isinstance(node, LiteralExpression) and
+        isinstance(node.value, Number) and not isinstance(node.value, bool)
+    )
+
+
+def fold_expression(node):
+    """ Replace arithmetic on literal numbers with the resulting literal,
+        e.g. ``LITERAL 2 * LITERAL 3`` with ``LITERAL 6``.
+    """
+    if not isinstance(node, ArithmeticExpressionNode):
+        return node
+
+    lhs, rhs = fold_expression(node.lhs), fold_expression(node.rhs)
+    if _is_number(lhs) and _is_number(rhs):
+        try:
+            return LiteralExpression(OP_TO_FUNC[node.op](lhs.value, rhs.value))
+        except ZeroDivisionError:
+            pass
+    if lhs is node.lhs and rhs is node.rhs:
+        return node
+    return copy_node(node, lhs=lhs, rhs=rhs)
+
+
+def _range_bounds(node):
+    """ Get the attribute and the lower and upper ``(value, strict)`` bound
+        of a range predicate on an attribute with literal numbers, or
+        ``None``.
+    """
+    if not isinstance(node.lhs, AttributeExpression):
+        return None
+    if isinstance(node, ComparisonPredicateNode) and \
+            node.op in ("<", "<=", ">", ">=") and _is_number(node.rhs):
+        bound = (node.rhs.value, node.op in ("<", ">"))
+        if node.op in (">", ">="):
+            return node.lhs, bound, None
+        return node.lhs, None, bound
+    elif isinstance(node, BetweenPredicateNode) and not node.not_ and \
+            _is_number(node.low) and _is_number(node.high):
+        return node.lhs, (node.low.value, False), (node.high.value, False)
+    return None
+
+
+def _range_predicates(lhs, lower, upper):
+    if lower and upper and not lower[1] and not upper[1]:
+        if lower[0] == upper[0]:
+            return [
+                ComparisonPredicateNode(lhs, LiteralExpression(lower[0]), "=")
+            ]
+        return [BetweenPredicateNode(
+            lhs, LiteralExpression(lower[0]), LiteralExpression(upper[0]),
+            False
+        )]
+
+    predicates = []
+    if lower:
+        predicates.append(ComparisonPredicateNode(
+            lhs, LiteralExpression(lower[0]), ">" if lower[1] else ">="
+        ))
+    if upper:
+        predicates.append(ComparisonPredicateNode(
+            lhs, LiteralExpression(upper[0]), "<" if upper[1] else "<="
+        ))
+    return predicates
+
+
+def merge_ranges(operands):
+    """ Merge the range predicates on the same attribute of the operands of
+        an ``AND``: only the tightest lower and upper bound are kept and
+        inclusive bounds are combined to a ``BETWEEN``, e.g.
+        ``a >= 1 AND a <= 5 AND a <= 3`` becomes ``a BETWEEN 1 AND 3``.
+    """
+    groups = {}
+    for i, operand in enumerate(operands):
+        bounds = _range_bounds(operand)
+        if bounds:
+            groups.setdefault(bounds[0], []).append((i, bounds[1:]))
+
+    replaced = {}
+    for lhs, group in groups.items():
+        if len(group) < 2:
+            continue
+        lowers = [lower for _, (lower, _) in group if lower]
+        uppers = [upper for _, (_, upper) in group if upper]
+        # of equal bounds the strict one is tighter
+        lower = max(lowers, default=None)
+        upper = min(uppers, key=lambda bound: (bound[0], not bound[1]),
+                    default=None)
+        first = group[0][0]
+        replaced[first] = _range_predicates(lhs, lower, upper)
+        for i, _ in group[1:]:
+            replaced[i] = []
+
+    if not replaced:
+        return operands
+
+    result = []
+    for i, operand in enumerate(operands):
+        result.extend(replaced.get(i, [operand]))
+    return result
+
+
+def _membership(node, op):
+    """ Get the attribute and the literal values of an equality (for
+        ``OR``) or inequality (for ``AND``) predicate or of an equivalent
+        ``IN`` predicate, or ``None``.
+    """
+    if not isinstance(getattr(node, 'lhs', None), AttributeExpression):
+        return None
+    if isinstance(node, ComparisonPredicateNode) and \
+            node.op == ("=" if op == "OR" else "<>") and \
+            isinstance(node.rhs, LiteralExpression):
+        return node.lhs, (node.rhs,)
+    elif isinstance(node, InPredicateNode) and \
+            node.not_ == (op == "AND") and \
+            all(isinstance(sub, LiteralExpression) for sub in node.sub_nodes):
+        return node.lhs, node.sub_nodes
+    return None
+
+
+def equalities_to_in(node):
+    """ Collapse the equalities on the same attribute within an ``OR`` into
+        a single ``IN`` predicate, e.g. ``a = 1 OR a = 2`` into
+        ``a IN (1, 2)``, and the inequalities on the same attribute within
+        an ``AND`` into a ``NOT IN`` predicate. ``IN`` predicates on the
+        attribute are merged as well.
+
+        Only the operands of the given combination are rewritten; other
+        nodes are returned unchanged.
+
+        :param node: the node to rewrite
+        :type node: :class:`pycql.ast.Node`
+        :return: the rewritten node
+        :rtype: :class:`pycql.ast.Node`
+    """
+    if not isinstance(node, CombinationConditionNode):
+        return node
+
+    groups = {}
+    for i, operand in enumerate(node.sub_nodes):
+        membership = _membership(operand, node.op)
+        if membership:
+            groups.setdefault(membership[0], []).append((i, membership[1]))
+
+    replaced = {}
+    for lhs, group in groups.items():
+        if len(group) < 2:
+            continue
+        values = dict.fromkeys(
+            sub_node for _, sub_nodes in group for sub_node in sub_nodes
+        )
+        replaced[group[0][0]] = InPredicateNode(
+            lhs, tuple(values), node.op == "AND"
+        )
+        for i, _ in group[1:]:
+            replaced[i] = None
+
+    if not replaced:
+        return node
+
+    operands = [
+        replaced.get(i, operand) for i, operand in enumerate(node.sub_nodes)
+    ]
+    return combine(
+        [operand for operand in operands if operand is not None], node.op
+    )
+
+
+def simplify(ast):
+    """ Rewrite the AST to an equivalent, simpler one:
+
+        * arithmetic on literal numbers is folded to a literal
+        * double negations (``NOT NOT a``) are removed
+        * duplicate operands of ``AND`` and ``OR`` chains are removed
+        * equalities on the same attribute within an ``OR`` are collapsed
+          to ``IN`` and inequalities within an ``AND`` to ``NOT IN``
+          (see :func:`equalities_to_in`)
+        * range comparisons on the same attribute within an ``AND`` are
+          merged, inclusive ones to ``BETWEEN``
+          (see :func:`merge_ranges`)
+        * ``BETWEEN`` with equal bounds becomes ``=``
+        * duplicate ``IN`` values are removed and ``IN`` of a single value
+          becomes ``=``
+
+        This results in smaller SQL and cheaper in-memory evaluation.
+
+        :param ast: the AST to simplify
+        :type ast: :class:`pycql.ast.Node`
+        :return: the simplified AST
+        :rtype: :class:`pycql.ast.Node`
+    """
+    def visit(node):
+        if isinstance(node, NotConditionNode):
+            sub_node = visit(node.sub_node)
+            if isinstance(sub_node, NotConditionNode):
+                return sub_node.sub_node
+            elif sub_node is node.sub_node:
+                return node
+            return copy_node(node, sub_node=sub_node)
+
+        elif isinstance(node, CombinationConditionNode):
+            operands = []
+            seen = set()
+            for operand in flatten(node):
+                operand = visit(operand)
+                if isinstance(operand, CombinationConditionNode) and \
+                        operand.op == node.op:
+                    candidates = flatten(operand)
+                else:
+                    candidates = [operand]
+                for candidate in candidates:
+                    if candidate not in seen:
+                        seen.add(candidate)
+                        operands.append(candidate)
+
+            if node.op == "AND":
+                operands = merge_ranges(operands)
+            return equalities_to_in(combine(operands, node.op))
+
+        elif isinstance(node, BetweenPredicateNode):
+            lhs = fold_expression(node.lhs)
+            low = fold_expression(node.low)
+            high = fold_expression(node.high)
+            if _is_number(low) and _is_number(high) and \
+                    low.value == high.value:
+                return ComparisonPredicateNode(
+                    lhs, low, "<>" if node.not_ else "="
+                )
+            return copy_node(node, lhs=lhs, low=low, high=high)
+
+        elif isinstance(node, InPredicateNode):
+            lhs = fold_expression(node.lhs)
+            sub_nodes = list(dict.fromkeys(
+                map(fold_expression, node.sub_nodes)
+            ))
+            if len(sub_nodes) == 1:
+                return ComparisonPredicateNode(
+                    lhs, sub_nodes[0], "<>" if node.not_ else "="
+                )
+            return copy_node(node, lhs=lhs, sub_nodes=tuple(sub_nodes))
+
+        elif isinstance(node, ComparisonPredicateNode):
+            lhs, rhs = fold_expression(node.lhs), fold_expression(node.rhs)
+            if lhs is node.lhs and rhs is node.rhs:
+                return node
+            return copy_node(node, lhs=lhs, rhs=rhs)
+
+        elif isinstance(node, (
+                LikePredicateNode, NullPredicateNode, TemporalPredicateNode,
+                SpatialPredicateNode, BBoxPredicateNode)):
+            lhs = fold_expression(node.lhs)
+            if lhs is node.lhs:
+                return node
+            return copy_node(node, lhs=lhs)
+
+        return node
+
+    if ast is None:
+        return None
+    return visit(ast)
+
+
+def optimize(ast, statistics=None, cost_model=None):
+    """ Apply all optimization passes: :func:`simplify` the AST and then
+        :func:`reorder` the operands of ``AND`` and ``OR`` chains.
+
+        :param ast: the AST to optimize
+        :type ast: :class:`pycql.ast.Node`
+        :param statistics: a dict mapping attribute names to their
+                           :class:`AttributeStatistics`
+        :param cost_model: the cost model to use for reordering
+        :return: the optimized AST
+        :rtype: :class:`pycql.ast.Node`
+    """
+    return reorder(simplify(ast), statistics, cost_model)
@@ -26,6 +26,7 @@
 # ------------------------------------------------------------------------------
 
 import logging
+import threading
 
 from ply import yacc
 
@@ -38,14 +39,16 @@ LOGGER = logging.getLogger(__name__)
 
 class CQLParser:
     def __init__(self, geometry_factory=values.Geometry, bbox_factory=values.BBox,
-                 time_factory=values.Time, duration_factory=values.Duration):
-        self.lexer = CQLLexer(
+                 time_factory=values.Time, duration_factory=values.Duration,
+                 lexer_class=CQLLexer, lazy=False):
+        self.lexer = lexer_class(
             # lextab='ecql.lextab',
             # outputdir="ecql"
             geometry_factory,
             bbox_factory,
             time_factory,
             duration_factory,
+            lazy=lazy,
             optimize=True,
         )
 
@@ -63,8 +66,18 @@ class CQLParser:
             errorlog=yacc.NullLogger(),
         )
 
-    def parse(self, text):
+    def parse(self, text, tokens=None):
+        """ Parse the given text. When the tokens of the text were already
+            produced by the lexer, they can be passed as ``tokens`` and are
+            used instead of lexing the text again.
+        """
         self.__query = text
+        if tokens is not None:
+            tokens = iter(tokens)
+            return self.parser.parse(
+                lexer=self.lexer,
+                tokenfunc=lambda: next(tokens, None)
+            )
         return self.parser.parse(
             input=text,
             lexer=self.lexer
@@ -90,7 +103,8 @@ class CQLParser:
         """ condition_or_empty : condition
                                | empty
         """
-        p[0] = p[1]
+        # the grammar nests AND/OR pairwise, merge them into n-ary nodes
+        p[0] = ast.flatten_combinations(p[1]) if p[1] is not None else None
 
     def p_condition(self, p):
         """ condition : predicate
@@ -278,9 +292,46 @@ class CQLParser:
             LOGGER.debug("Syntax error at EOF")
 
 
+_local = threading.local()
+_MISSING = object()
+
+
+def get_parser(geometry_factory=values.Geometry, bbox_factory=values.BBox,
+               time_factory=values.Time, duration_factory=values.Duration,
+               lexer_class=CQLLexer, lazy=False):
+    """ Get the shared :class:`CQLParser` for the given factories. Building a
+        parser compiles the lexer rules and loads the LALR tables, so the
+        instance is created only once per factory combination and reused
+        afterwards.
+
+        As a parser keeps the state of the query currently parsed, parsers
+        are kept per thread: each thread gets its own instance, so no locking
+        is required and concurrent parses cannot corrupt each other.
+
+        :return: the parser for the factories owned by the current thread
+        :rtype: CQLParser
+    """
+    try:
+        parsers = _local.parsers
+    except AttributeError:
+        parsers = _local.parsers = {}
+
+    key = (
+        geometry_factory, bbox_factory, time_factory, duration_factory,
+        lexer_class, lazy
+    )
+    parser = parsers.get(key)
+    if parser is None:
+        parser = parsers[key] = CQLParser(*key)
+    return parser
+
+
 def parse(cql, geometry_factory=values.Geometry, bbox_factory=values.BBox,
-          time_factory=values.Time, duration_factory=values.Duration):
-    """ Parses the passed CQL to its AST interpretation. 
+          time_factory=values.Time, duration_factory=values.Duration,
+          cache=None, lexer_class=CQLLexer, lazy=False):
+    """ Parses the passed CQL to its AST interpretation. The underlying
+        parser is shared between calls of the same thread using the same
+        factories, see :func:`get_parser`.
 
         :param cql: the CQL expression string to parse
         :type cql: str
@@ -294,13 +345,38 @@ def parse(cql, geometry_factory=values.Geometry, bbox_factory=values.BBox,
         :param duration_factory: the duration parsing function: it shall parse
                                  the given ISO8601 furation string tuple the relevant
                                  type.
+        :param lexer_class: the lexer implementation to use. Either
+                            :class:`pycql.lexer.CQLLexer` (the default) or
+                            :class:`pycql.scanner.CQLScanner`
+        :param lazy: whether geometry, envelope, time and duration literals
+                     shall only be created by their factories when they are
+                     first accessed
+        :param cache: an optional cache of already parsed expressions. The
+                      ASTs returned from the cache are shared.
+        :type cache: ~pycql.cache.ParseCache
         :return: the parsed CQL expression as an AST
         :rtype: ~pycql.ast.Node
     """
-    parser = CQLParser(
+    if cache is not None:
+        key = (
+            cql, geometry_factory, bbox_factory, time_factory,
+            duration_factory, lexer_class, lazy
+        )
+        node = cache.get(key, _MISSING)
+        if node is _MISSING:
+            node = parse(
+                cql, geometry_factory, bbox_factory, time_factory,
+                duration_factory, lexer_class=lexer_class, lazy=lazy
+            )
+            node = cache.put(key, node)
+        return node
+
+    parser = get_parser(
         geometry_factory,
         bbox_factory,
         time_factory,
-        duration_factory
+        duration_factory,
+        lexer_class,
+        lazy
     )
     return parser.parse(cql)
@@ -0,0 +1,223 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+import logging
+import re
+
+from ply.lex import LexError, LexToken
+
+from .lexer import CQLLexer
+from .util import match_geometry
+from . import values
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _compile(pattern):
+    # PLY compiles the rules in verbose mode, so do the same to recognize
+    # exactly the same tokens
+    return re.compile(pattern, re.VERBOSE)
+
+
+class CQLScanner:
+    """ A hand-written alternative to :class:`pycql.lexer.CQLLexer`. Instead
+        of matching a master regular expression for every token, the scanner
+        dispatches on the current character and only tries the rules that
+        can possibly match, recognizing geometries with
+        :func:`pycql.util.match_geometry`. The whole input is scanned in a
+        single linear pass.
+
+        It produces the same token stream as :class:`pycql.lexer.CQLLexer`
+        and can be used in its place by passing it as the ``lexer_class`` to
+        :class:`pycql.parser.CQLParser`.
+    """
+
+    tokens = CQLLexer.tokens
+    keyword_map = CQLLexer.keyword_map
+
+    re_envelope = _compile(CQLLexer.envelope_pattern)
+    re_units = _compile(CQLLexer.t_UNITS.regex)
+    re_time = _compile(CQLLexer.time_pattern)
+    re_duration = _compile(CQLLexer.duration_pattern)
+    re_float = _compile(CQLLexer.float_pattern)
+    re_int = _compile(CQLLexer.int_pattern)
+    re_quoted = _compile(CQLLexer.quoted_string_pattern)
+    re_identifier = _compile(CQLLexer.identifier_pattern)
+
+    operators = {
+        '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE',
+        '<': 'LT', '>': 'GT', '=': 'EQ',
+        '(': 'LPAREN', ')': 'RPAREN', '[': 'LBRACKET', ']': 'RBRACKET',
+        ',': 'COMMA',
+    }
+    double_operators = {'<=': 'LE', '>=': 'GE', '<>': 'NE'}
+
+    identifier_start = frozenset(
+        'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$'
+    )
+    digits = frozenset('0123456789')
+
+    def __init__(self, geometry_factory=values.Geometry,
+                 bbox_factory=values.BBox, time_factory=values.Time,
+                 duration_factory=values.Duration, lazy=False, **kwargs):
+        self.geometry_factory = geometry_factory
+        self.bbox_factory = bbox_factory
+        self.time_factory = time_factory
+        self.duration_factory = duration_factory
+        self.lazy = lazy
+        self.data = ''
+        self.pos = 0
+        self.lineno = 1
+
+    def build(self, **kwargs):
+        pass
+
+    def input(self, data):
+        self.data = data
+        self.pos = 0
+        self.lineno = 1
+
+    def token(self):
+        self.last_token = self._next_token()
+        return self.last_token
+
+    literal = CQLLexer.literal
+
+    def _make_token(self, type_, value, pos, end):
+        tok = LexToken()
+        tok.type = type_
+        tok.value = value
+        tok.lineno = self.lineno
+        tok.lexpos = pos
+        tok.lexer = self
+        self.pos = end
+        return tok
+
+    def _next_token(self):
+        data = self.data
+        length = len(data)
+        pos = self.pos
+
+        while pos < length:
+            char = data[pos]
+            if char in ' \t':
+                pos += 1
+                continue
+            elif char == '\n':
+                self.lineno += 1
+                pos += 1
+                continue
+
+            if char in self.identifier_start:
+                tok = self._scan_word(data, pos)
+            elif char in self.digits or char == '.':
+                tok = self._scan_number(data, pos)
+            elif char == '-':
+                match = self.re_int.match(data, pos)
+                if match:
+                    tok = self._make_token(
+                        'INTEGER', int(match.group()), pos, match.end()
+                    )
+                else:
+                    tok = self._make_token('MINUS', char, pos, pos + 1)
+            elif char in '"\'':
+                match = self.re_quoted.match(data, pos)
+                tok = match and self._make_token(
+                    'QUOTED', match.group()[1:-1], pos, match.end()
+                )
+            elif data[pos:pos + 2] in self.double_operators:
+                tok = self._make_token(
+                    self.double_operators[data[pos:pos + 2]],
+                    data[pos:pos + 2], pos, pos + 2
+                )
+            elif char in self.operators:
+                tok = self._make_token(
+                    self.operators[char], char, pos, pos + 1
+                )
+            else:
+                tok = None
+
+            if tok is None:
+                self.pos = pos
+                LOGGER.debug("Illegal character '%s' at %d" % (char, pos))
+                raise LexError(
+                    "Scanning error. Illegal character '%s'" % char,
+                    data[pos:]
+                )
+            return tok
+
+        self.pos = pos
+        return None
+
+    def _scan_word(self, data, pos):
+        char = data[pos]
+        if char in 'PLM':
+            end = match_geometry(data, pos)
+            if end >= 0:
+                value = self.literal(self.geometry_factory, data[pos:end])
+                return self._make_token('GEOMETRY', value, pos, end)
+        if char == 'E':
+            match = self.re_envelope.match(data, pos)
+            if match:
+                bbox = [
+                    float(number) for number in
+                    match.group().partition('(')[2].partition(')')[0].split()
+                ]
+                return self._make_token(
+                    'ENVELOPE', self.literal(self.bbox_factory, bbox),
+                    pos, match.end()
+                )
+        if char in 'fmsnk':
+            match = self.re_units.match(data, pos)
+            if match:
+                return self._make_token(
+                    'UNITS', match.group(), pos, match.end()
+                )
+        if char == 'P':
+            match = self.re_duration.match(data, pos)
+            value = self.literal(self.duration_factory, match.group())
+            return self._make_token('DURATION', value, pos, match.end())
+
+        match = self.re_identifier.match(data, pos)
+        value = match.group()
+        return self._make_token(
+            self.keyword_map.get(value, 'ATTRIBUTE'), value, pos, match.end()
+        )
+
+    def _scan_number(self, data, pos):
+        match = self.re_time.match(data, pos)
+        if match:
+            return self._make_token(
+                'TIME', self.literal(self.time_factory, match.group()),
+                pos, match.end()
+            )
+        match = self.re_float.match(data, pos)
+        if match:
+            return self._make_token(
+                'FLOAT', float(match.group()), pos, match.end()
+            )
+        return None
@@ -0,0 +1,384 @@
+# ------------------------------------------------------------------------------
+#
+# Project: pycql <https://github.com/geopython/pycql>
+# Authors: Fabian Schindler <fabian.schindler@eox.at>
+#
+# ------------------------------------------------------------------------------
+# Copyright (C) 2019 EOX IT Services GmbH
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies of this Software or works derived from this Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+# ------------------------------------------------------------------------------
+
+""" Filter templates: filters translated once with named parameters in place
+    of their literal values, which are then bound to the values of each
+    request.
+"""
+
+from datetime import datetime
+
+from .ast import (
+    Node, NotConditionNode, CombinationConditionNode, ComparisonPredicateNode,
+    BetweenPredicateNode, LikePredicateNode, InPredicateNode,
+    NullPredicateNode, TemporalPredicateNode, SpatialPredicateNode,
+    BBoxPredicateNode, AttributeExpression, LiteralExpression,
+    ArithmeticExpressionNode, ParameterExpression, Visitor, handle,
+    copy_node, get_fields,
+)
+from .cache import ParseCache
+from .lexer import CQLLexer
+from .parser import get_parser
+from . import values
+
+
+# the types of literal values the backends pass on to the database unchanged
+PARAMETER_TYPES = (int, float, str, datetime)
+
+# the tokens carrying literal values
+LITERAL_TOKENS = frozenset([
+    'GEOMETRY', 'ENVELOPE', 'TIME', 'DURATION', 'FLOAT', 'INTEGER', 'QUOTED'
+])
+
+
+class Parameterizer(Visitor):
+    """ Replaces the literal values of an AST by parameters named ``p0``,
+        ``p1`` and so on.
+
+        Only literal values the backends use unchanged become parameters:
+        the operands of comparisons, ``BETWEEN``, ``IN`` and arithmetic
+        expressions, and the time instants of temporal predicates. Patterns,
+        geometries, envelopes, distances and durations influence the
+        structure of the translated filter and are kept.
+
+        All literal values are collected in the order of their appearance
+        in the CQL text in :attr:`literals`, as pairs of the value and the
+        parameter name, which is ``None`` for the kept values.
+
+        :param exclude: the names of attributes whose predicates keep their
+                        literal values
+    """
+
+    def __init__(self, exclude=()):
+        self.exclude = frozenset(exclude)
+        self.literals = []
+        self.count = 0
+        self.fixed = False
+
+    def parameter(self, value, fixed=False):
+        """ Record the literal value and get the parameter to replace it, or
+            ``None`` if it is kept.
+        """
+        if fixed or self.fixed or not isinstance(value, PARAMETER_TYPES):
+            self.literals.append((value, None))
+            return None
+        name = 'p%d' % self.count
+        self.count += 1
+        self.literals.append((value, name))
+        return ParameterExpression(name)
+
+    def keep(self, node, visit=None):
+        """ Visit the node, keeping all its literal values. """
+        fixed = self.fixed
+        self.fixed = True
+        try:
+            return (visit or self.visit)(node)
+        finally:
+            self.fixed = fixed
+
+    def rebuild(self, node):
+        """ Visit all sub-nodes of the node in the order of their fields and
+            get the node with the visited sub-nodes.
+        """
+        fields = {}
+        for name in get_fields(type(node)):
+            value = getattr(node, name)
+            if isinstance(value, Node):
+                fields[name] = self.visit(value)
+            elif isinstance(value, (list, tuple)) and value and \
+                    all(isinstance(item, Node) for item in value):
+                fields[name] = tuple(self.visit(item) for item in value)
+        return copy_node(node, **fields)
+
+    @handle(NotConditionNode, CombinationConditionNode,
+            ArithmeticExpressionNode)
+    def condition(self, node):
+        return self.rebuild(node)
+
+    @handle(ComparisonPredicateNode, BetweenPredicateNode, InPredicateNode,
+            NullPredicateNode)
+    def predicate(self, node):
+        if isinstance(node.lhs, AttributeExpression) and \
+                node.lhs.name in self.exclude:
+            return self.keep(node, self.rebuild)
+        return self.rebuild(node)
+
+    @handle(LikePredicateNode)
+    def like(self, node):
+        return copy_node(
+            node, lhs=self.visit(node.lhs), rhs=self.keep(node.rhs)
+        )
+
+    @handle(TemporalPredicateNode)
+    def temporal(self, node):
+        lhs = self.visit(node.lhs)
+        # the backends translate temporal predicates to comparisons of the
+        # time instants, which is done here so that they can be bound
+        if node.op in ("BEFORE", "AFTER"):
+            rhs = self.parameter(node.rhs)
+            if rhs is None:
+                return copy_node(node, lhs=lhs)
+            return ComparisonPredicateNode(
+                lhs, rhs, "<=" if node.op == "BEFORE" else ">="
+            )
+
+        fixed = not all(isinstance(value, datetime) for value in node.rhs)
+        low, high = (self.parameter(value, fixed) for value in node.rhs)
+        if low is None:
+            return copy_node(node, lhs=lhs)
+        return BetweenPredicateNode(lhs, low, high, False)
+
+    @handle(SpatialPredicateNode)
+    def spatial(self, node):
+        lhs = self.visit(node.lhs)
+        rhs = self.keep(node.rhs)
+        if node.pattern is not None:
+            self.parameter(node.pattern, fixed=True)
+        if node.distance is not None:
+            self.keep(node.distance)
+        return copy_node(node, lhs=lhs, rhs=rhs)
+
+    @handle(BBoxPredicateNode)
+    def bbox(self, node):
+        node = copy_node(node, lhs=self.visit(node.lhs))
+        for bound in (node.minx, node.miny, node.maxx, node.maxy):
+            self.keep(bound)
+        if node.crs is not None:
+            self.parameter(node.crs, fixed=True)
+        return node
+
+    @handle(LiteralExpression)
+    def literal(self, node):
+        parameter = self.parameter(node.value)
+        return node if parameter is None else parameter
+
+    def default(self, node):
+        return node
+
+
+def parameterize(ast, exclude=()):
+    """ Replace the literal values of an AST by parameters, see
+        :class:`Parameterizer`.
+
+        :param ast: the AST to parameterize
+        :type ast: :class:`pycql.ast.Node`
+        :param exclude: the names of attributes whose predicates keep their
+                        literal values
+        :return: the AST with parameters and a dict mapping the parameter
+                 names to the replaced values
+        :rtype: tuple
+    """
+    parameterizer = Parameterizer(exclude)
+    template = parameterizer.visit(ast)
+    return template, {
+        name: value for value, name in parameterizer.literals if name
+    }
+
+
+class FilterTemplate:
+    """ A filter translated from an AST with parameters, which is bound to
+        the values of each request.
+
+        :ivar filter: the translated filter with parameters
+        :ivar names: the names of the parameters
+        :type names: tuple[str]
+    """
+
+    def __init__(self, filter, names, bind):
+        self.filter = filter
+        self.names = names
+        self._bind = bind
+
+    def bind(self, values):
+        """ Get the filter with the parameters bound to the given values.
+
+            :param values: a dict mapping the parameter names to values
+            :type values: dict
+            :return: the bound filter
+        """
+        return self._bind(self.filter, values)
+
+
+def compile_template(ast, translate, bind, exclude=()):
+    """ Compile the AST to a filter template.
+
+        :param ast: the AST to compile
+        :type ast: :class:`pycql.ast.Node`
+        :param translate: the function translating an AST with parameters to
+                          a filter of the backend
+        :param bind: the function taking a filter of the backend and a dict
+                     of parameter values and returning the bound filter
+        :param exclude: the names of attributes whose predicates keep their
+                        literal values
+        :return: the template and the parameter values of the AST
+        :rtype: tuple[FilterTemplate, dict]
+    """
+    template, parameters = parameterize(ast, exclude)
+    return FilterTemplate(
+        translate(template), tuple(parameters), bind
+    ), parameters
+
+
+class TemplateCache:
+    """ A size bounded, least recently used cache of filter templates, keyed
+        by the shape of the CQL text: its tokens without the values of the
+        literals that became parameters. A CQL text of a known shape is only
+        tokenized to get the parameter values; parsing and translation are
+        skipped.
+
+        :param translate: the function translating an AST with parameters to
+                          a filter of the backend
+        :param bind: the function taking a filter of the backend and a dict
+                     of parameter values and returning the bound filter
+        :param maxsize: the maximum number of templates to keep
+        :param exclude: the names of attributes whose predicates keep their
+                        literal values
+
+        The factories and the lexer class are the ones of
+        :func:`pycql.parser.parse`.
+    """
+
+    def __init__(self, translate, bind, maxsize=1024, exclude=(),
+                 geometry_factory=values.Geometry, bbox_factory=values.BBox,
+                 time_factory=values.Time, duration_factory=values.Duration,
+                 lexer_class=CQLLexer):
+        self.translate = translate
+        self.bind = bind
+        self.exclude = exclude
+        self.parser_args = (
+            geometry_factory, bbox_factory, time_factory, duration_factory,
+            lexer_class
+        )
+        # the positions of the parameters and of the kept literal values
+        # within the literal tokens per shape
+        self._positions = ParseCache(maxsize)
+        self._templates = ParseCache(maxsize)
+
+    def get(self, cql):
+        """ Get the template for the given CQL text and its parameter
+            values.
+
+            :param cql: the CQL expression string
+            :type cql: str
+            :return: the template and the parameter values
+            :rtype: tuple[FilterTemplate, dict]
+        """
+        parser = get_parser(*self.parser_args)
+        lexer = parser.lexer
+        lexer.input(cql)
+        tokens = []
+        token = lexer.token()
+        while token is not None:
+            tokens.append(token)
+            token = lexer.token()
+
+        shape = tuple(
+            (token.type, None if token.type in LITERAL_TOKENS else token.value)
+            for token in tokens
+        )
+        literals = [
+            i for i, token in enumerate(tokens) if token.type in LITERAL_TOKENS
+        ]
+
+        key = None
+        positions = self._positions.get(shape)
+        if positions is not None:
+            key = (shape, self._kept(cql, tokens, literals, positions[1]))
+        template = self._templates.get(key)
+        if template is not None:
+            return template, {
+                name: tokens[literals[i]].value
+                for name, i in zip(template.names, positions[0])
+            }
+
+        ast = parser.parse(cql, tokens)
+        parameterizer = Parameterizer(self.exclude)
+        template_ast = parameterizer.visit(ast)
+        template = FilterTemplate(
+            self.translate(template_ast),
+            tuple(name for _, name in parameterizer.literals if name),
+            self.bind
+        )
+        parameters = {
+            name: value for value, name in parameterizer.literals if name
+        }
+
+        # only cache the template when the values of the AST are known to
+        # be the ones of the literal tokens
+        if len(parameterizer.literals) == len(literals) and all(
+                value is tokens[i].value
+                for (value, _), i in zip(parameterizer.literals, literals)):
+            positions = (
+                tuple(
+                    i for i, (_, name) in enumerate(parameterizer.literals)
+                    if name
+                ),
+                tuple(
+                    i for i, (_, name) in enumerate(parameterizer.literals)
+                    if not name
+                ),
+            )
+            self._positions.put(shape, positions)
+            key = (shape, self._kept(cql, tokens, literals, positions[1]))
+            self._templates.put(key, template)
+        return template, parameters
+
+    def _kept(self, cql, tokens, literals, positions):
+        """ Get the texts of the kept literal tokens. """
+        texts = []
+        for i in positions:
+            index = literals[i]
+            end = tokens[index + 1].lexpos if index + 1 < len(tokens) \
+                else len(cql)
+            texts.append(cql[tokens[index].lexpos:end].strip())
+        return tuple(texts)
+
+    def to_filter(self, cql):
+        """ Get the filter for the given CQL text.
+
+            :param cql: the CQL expression string
+            :type cql: str
+            :return: the bound filter
+        """
+        template, parameters = self.get(cql)
+        return template.bind(parameters)
+
+    def clear(self):
+        """ Remove all templates and reset the statistics.
+        """
+        self._positions.clear()
+        self._templates.clear()
+
+    def info(self):
+        """ Get the statistics of the template lookups.
+
+            :rtype: ~pycql.cache.CacheInfo
+        """
+        return self._templates.info()
+
+    def __len__(self):
+        return len(self._templates)
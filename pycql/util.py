@@ -25,8 +25,11 @@
 # THE SOFTWARE.
 # ------------------------------------------------------------------------------
 
+from functools import lru_cache
+from itertools import chain
 import re
-from datetime import timedelta
+import struct
+from datetime import datetime, timedelta, timezone
 
 RE_ISO_8601 = re.compile(
     r"^(?P<sign>[+-])?P"
@@ -65,3 +68,253 @@ def parse_duration(value):
     fsec += float(match['hours'] or 0) * 3600
 
     return sign * timedelta(days, fsec)
+
+
+RE_DATETIME = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})Z$'
+)
+
+
+@lru_cache(maxsize=4096)
+def parse_datetime(value):
+    """ Parses an ISO 8601 timestamp of the form ``YYYY-MM-DDTHH:MM:SSZ``, as
+        recognized by the lexer, into a timezone aware python datetime.
+        Raises a ``ValueError`` if a conversion was not possible.
+
+        The results are memoized, as filters tend to repeat the same
+        instants.
+
+        :param value: the ISO8601 timestamp string to parse
+        :type value: str
+        :return: the parsed timestamp in UTC
+        :rtype: datetime.datetime
+    """
+    match = RE_DATETIME.match(value)
+    if not match:
+        raise ValueError('Invalid timestamp %r' % value)
+    return datetime(*map(int, match.groups()), tzinfo=timezone.utc)
+
+
+# WKT geometry recognition. The patterns only ever match a single coordinate
+# (or a bounded run of them), so scanning a geometry is linear in its length.
+
+_WKT_NUMBER = r'-?(?:[0-9]+(?:\.[0-9]+)?|\.[0-9]+)'
+_WKT_COORDINATE = r'%s(?:\s+%s){1,3}\s*' % (_WKT_NUMBER, _WKT_NUMBER)
+
+RE_WKT_TYPE = re.compile(
+    r"(MULTIPOLYGON|MULTILINESTRING|MULTIPOINT|POLYGON|POINT|LINESTRING)"
+    r"\s*\("
+)
+RE_WKT_COORDINATE = re.compile(_WKT_COORDINATE)
+RE_WKT_COORDINATES = re.compile(r'(?:\s*,\s*%s){1,256}' % _WKT_COORDINATE)
+RE_WKT_SEPARATOR = re.compile(r'\s*,\s*')
+RE_WKT_OPEN = re.compile(r'\(\s*')
+RE_WKT_CLOSE = re.compile(r'\s*\)')
+
+
+def _match_coordinates(text, pos):
+    match = RE_WKT_COORDINATE.match(text, pos)
+    if not match:
+        return -1
+    pos = match.end()
+    while True:
+        match = RE_WKT_COORDINATES.match(text, pos)
+        if not match:
+            return pos
+        pos = match.end()
+
+
+def _match_group(text, pos, match_items):
+    match = RE_WKT_OPEN.match(text, pos)
+    if not match:
+        return -1
+    pos = match_items(text, match.end())
+    if pos < 0:
+        return -1
+    match = RE_WKT_CLOSE.match(text, pos)
+    return match.end() if match else -1
+
+
+def _match_list(text, pos, match_item):
+    pos = match_item(text, pos)
+    if pos < 0:
+        return -1
+    while True:
+        match = RE_WKT_SEPARATOR.match(text, pos)
+        if not match:
+            return pos
+        end = match_item(text, match.end())
+        if end < 0:
+            return pos
+        pos = end
+
+
+def _match_coordinate_group(text, pos):
+    return _match_group(text, pos, _match_coordinates)
+
+
+def _match_coordinate_groups(text, pos):
+    return _match_list(text, pos, _match_coordinate_group)
+
+
+def _match_nested_coordinate_group(text, pos):
+    return _match_group(text, pos, _match_coordinate_groups)
+
+
+def _match_nested_coordinate_groups(text, pos):
+    return _match_list(text, pos, _match_nested_coordinate_group)
+
+
+def _match_coordinate(text, pos):
+    match = RE_WKT_COORDINATE.match(text, pos)
+    return match.end() if match else -1
+
+
+WKT_BODY_MATCHERS = {
+    'POINT': (_match_coordinate,),
+    'LINESTRING': (_match_coordinates,),
+    'MULTIPOINT': (_match_coordinates, _match_coordinate_groups),
+    'MULTILINESTRING': (_match_coordinate_groups,),
+    'POLYGON': (_match_coordinate_groups,),
+    'MULTIPOLYGON': (_match_nested_coordinate_groups,),
+}
+
+
+def match_geometry(text, pos=0):
+    """ Match a WKT geometry in ``text`` starting at ``pos``. This recognizes
+        the same geometries as :attr:`pycql.lexer.CQLLexer.geometry_pattern`,
+        but in linear time and with constant memory regardless of the number
+        of coordinates.
+
+        :param text: the text to match the geometry in
+        :type text: str
+        :param pos: the position the geometry has to start at
+        :type pos: int
+        :return: the end position of the geometry or ``-1`` if there is no
+                 geometry at ``pos``
+        :rtype: int
+    """
+    match = RE_WKT_TYPE.match(text, pos)
+    if not match:
+        return -1
+
+    for match_body in WKT_BODY_MATCHERS[match.group(1)]:
+        end = match_body(text, match.end())
+        if end >= 0 and text.startswith(')', end):
+            return end + 1
+    return -1
+
+
+# WKT to WKB conversion
+
+WKB_GEOMETRY_TYPES = {
+    'POINT': 1,
+    'LINESTRING': 2,
+    'POLYGON': 3,
+    'MULTIPOINT': 4,
+    'MULTILINESTRING': 5,
+    'MULTIPOLYGON': 6,
+}
+
+# the ISO WKB type code offsets for the number of ordinates
+WKB_DIMENSION_OFFSETS = {2: 0, 3: 1000, 4: 3000}
+
+RE_WKT_TOKEN = re.compile(r'[(),]|[^\s(),]+')
+
+
+def _parse_wkt_group(tokens, pos):
+    """ Parse a parenthesized group of coordinates or nested groups. """
+    if tokens[pos] != '(':
+        raise ValueError('Expected "(" in WKT')
+    items = []
+    pos += 1
+    while True:
+        if tokens[pos] == '(':
+            item, pos = _parse_wkt_group(tokens, pos)
+        else:
+            start = pos
+            while tokens[pos] not in ('(', ')', ','):
+                pos += 1
+            item = tuple(float(value) for value in tokens[start:pos])
+        items.append(item)
+        if tokens[pos] == ')':
+            return items, pos + 1
+        elif tokens[pos] != ',':
+            raise ValueError('Expected "," or ")" in WKT')
+        pos += 1
+
+
+def _wkb_coordinates(coordinates, dims):
+    if any(len(coordinate) != dims for coordinate in coordinates):
+        raise ValueError('Mixed coordinate dimensions in WKT')
+    return struct.pack(
+        '<I%dd' % (len(coordinates) * dims), len(coordinates),
+        *chain.from_iterable(coordinates)
+    )
+
+
+def _wkb_geometry(geometry_type, body, dims):
+    header = struct.pack(
+        '<BI', 1,
+        WKB_GEOMETRY_TYPES[geometry_type] + WKB_DIMENSION_OFFSETS[dims]
+    )
+    if geometry_type == 'POINT':
+        if len(body) != 1 or len(body[0]) != dims:
+            raise ValueError('Invalid WKT point')
+        return header + struct.pack('<%dd' % dims, *body[0])
+    elif geometry_type == 'LINESTRING':
+        return header + _wkb_coordinates(body, dims)
+    elif geometry_type == 'POLYGON':
+        return header + struct.pack('<I', len(body)) + b''.join(
+            _wkb_coordinates(ring, dims) for ring in body
+        )
+
+    sub_type = geometry_type[5:]
+    if sub_type == 'POINT':
+        # points of a multipoint may or may not be parenthesized
+        body = [[item] if isinstance(item, tuple) else item for item in body]
+    return header + struct.pack('<I', len(body)) + b''.join(
+        _wkb_geometry(sub_type, item, dims) for item in body
+    )
+
+
+def wkt_to_wkb(wkt):
+    """ Convert a WKT geometry, as recognized by :func:`match_geometry`, to
+        little endian ISO WKB. Coordinates with three or four ordinates are
+        encoded as Z or ZM geometries.
+
+        Raises a ``ValueError`` if a conversion was not possible.
+
+        :param wkt: the WKT geometry
+        :type wkt: str
+        :return: the WKB geometry
+        :rtype: bytes
+    """
+    tokens = RE_WKT_TOKEN.findall(wkt)
+    try:
+        geometry_type = tokens[0].upper()
+        if geometry_type not in WKB_GEOMETRY_TYPES:
+            raise ValueError('Unsupported WKT geometry type %r' % tokens[0])
+        body, pos = _parse_wkt_group(tokens, 1)
+    except IndexError:
+        raise ValueError('Incomplete WKT %r' % wkt)
+    if pos != len(tokens):
+        raise ValueError('Trailing characters in WKT %r' % wkt)
+
+    first = body
+    while not isinstance(first, tuple):
+        first = first[0]
+    if len(first) not in WKB_DIMENSION_OFFSETS:
+        raise ValueError('Invalid coordinate dimension in WKT')
+    return _wkb_geometry(geometry_type, body, len(first))
+
+
+def bbox_to_wkb(minx, miny, maxx, maxy):
+    """ Get the little endian WKB polygon of the given bounding box.
+
+        :return: the WKB polygon
+        :rtype: bytes
+    """
+    return _wkb_geometry('POLYGON', [[
+        (minx, miny), (minx, maxy), (maxx, maxy), (maxx, miny), (minx, miny)
+    ]], 2)
@@ -26,6 +26,8 @@
 # ------------------------------------------------------------------------------
 
 class _Value:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
     
@@ -35,18 +37,81 @@ class _Value:
 
         return self.value == other.value
 
+    def __hash__(self):
+        value = self.value
+        if isinstance(value, list):
+            value = tuple(value)
+        return hash((type(self), value))
+
 class Geometry(_Value):
+    __slots__ = ()
+
     def __repr__(self):
         return "GEOMETRY '%s'" % self.value
 
 class Time(_Value):
+    __slots__ = ()
+
     def __repr__(self):
         return "TIME '%s'" % self.value
 
 class Duration(_Value):
+    __slots__ = ()
+
     def __repr__(self):
         return "DURATION '%s'" % self.value
 
 class BBox(_Value):
+    __slots__ = ()
+
     def __repr__(self):
         return "BBOX '%s'" % self.value
+
+
+class Lazy:
+    """ A literal value whose creation is deferred until it is first
+        accessed. Holds the raw lexed value and the factory to create the
+        actual value from it. The created value is memoized.
+
+        :ivar factory: the factory to create the value with
+        :ivar raw: the raw value as passed to the factory
+    """
+
+    __slots__ = ('factory', 'raw', '_value')
+
+    _unset = object()
+
+    def __init__(self, factory, raw):
+        self.factory = factory
+        self.raw = raw
+        self._value = self._unset
+
+    def materialize(self):
+        """ Get the value, creating it with the factory on first access.
+        """
+        if self._value is self._unset:
+            self._value = self.factory(self.raw)
+        return self._value
+
+    def __eq__(self, other):
+        if type(self) != type(other):
+            return False
+
+        return self.factory == other.factory and self.raw == other.raw
+
+    def __hash__(self):
+        raw = self.raw
+        if isinstance(raw, list):
+            raw = tuple(raw)
+        return hash((type(self), self.factory, raw))
+
+    def __repr__(self):
+        return "LAZY %r" % (self.raw,)
+
+
+def materialize(value):
+    """ Get the actual value of a possibly :class:`Lazy` value.
+    """
+    if isinstance(value, Lazy):
+        return value.materialize()
+    return value
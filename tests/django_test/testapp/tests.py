@@ -32,7 +32,7 @@ from django.utils.dateparse import parse_datetime
 
 from pycql import parse
 from pycql.util import parse_duration
-from pycql.integrations.django.evaluate import to_filter
+from pycql.integrations.django.evaluate import to_filter, TemplateCache
 
 from . import models
 
@@ -306,6 +306,22 @@ class CQLTestCase(TransactionTestCase):
             ('A',)
         )
 
+    # combinations
+
+    def test_long_or_chain(self):
+        ids = ['"%s"' % i for i in ['A'] + [str(i) for i in range(3000)]]
+        self.evaluate(
+            ' OR '.join('identifier = %s' % i for i in ids),
+            ('A',)
+        )
+
+    def test_long_and_chain(self):
+        ids = ['"%s"' % i for i in ['B'] + [str(i) for i in range(3000)]]
+        self.evaluate(
+            ' AND '.join('identifier <> %s' % i for i in ids),
+            ('A',)
+        )
+
     # (NOT) NULL
 
     def test_string_null(self):
@@ -469,3 +485,34 @@ class CQLTestCase(TransactionTestCase):
             'intMetaAttribute = 5 + intAttribute * 1.5',
             ('A',)
         )
+
+    # templates
+
+    def evaluate_template(self, cache, cql_expr, expected_ids):
+        qs = models.Record.objects.filter(cache.to_filter(cql_expr))
+        self.assertEqual(
+            expected_ids,
+            type(expected_ids)(qs.values_list("identifier", flat=True))
+        )
+
+    def test_template_cache(self):
+        cache = TemplateCache(models.FIELD_MAPPING, models.MAPPING_CHOICES)
+        self.evaluate_template(
+            cache,
+            'floatAttribute < 30 AND datetimeAttribute DURING '
+            '2000-01-01T00:00:00Z / 2000-01-01T00:00:01Z',
+            ('A',)
+        )
+        self.evaluate_template(
+            cache,
+            'floatAttribute < 40 AND datetimeAttribute DURING '
+            '2000-01-01T00:00:05Z / 2000-01-01T00:00:15Z',
+            ('B',)
+        )
+        self.evaluate_template(
+            cache, 'intMetaAttribute = intAttribute * 1.5 + 5', ('A',)
+        )
+        self.evaluate_template(
+            cache, 'intMetaAttribute = intAttribute * 1.5 + 6', ()
+        )
+        self.assertEqual(cache.info().hits, 2)
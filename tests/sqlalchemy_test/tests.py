@@ -1,7 +1,14 @@
 import unittest
 
-from pycql.integrations.sqlalchemy.parser import parse
-from pycql.integrations.sqlalchemy.evaluate import to_filter
+from pycql.integrations.sqlalchemy.parser import parse, parse_geometry
+from pycql.integrations.sqlalchemy.evaluate import to_filter, TemplateCache
+from pycql.integrations.sqlalchemy.filters import (
+    bound,
+    get_operator,
+    get_srid,
+    runop,
+)
+from pycql.util import wkt_to_wkb
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -71,6 +78,71 @@ FIELD_MAPPING = {
 }
 
 
+class OperatorTestCase(unittest.TestCase):
+    def test_shared_operators(self):
+        self.assertIs(get_operator("<="), get_operator("<="))
+        self.assertIs(get_operator(), get_operator("=="))
+        self.assertEqual(get_operator("RELATE").arity, 3)
+
+    def test_invalid_operator(self):
+        with self.assertRaises(Exception):
+            get_operator("~")
+
+    def test_bound(self):
+        self.assertIs(bound(Record.float_attribute), Record.float_attribute)
+        self.assertIs(bound(FIELD_MAPPING["identifier"]), Record.identifier)
+        self.assertEqual(bound(5).value, 5)
+
+    def test_constant_arithmetic(self):
+        self.assertEqual(runop(5, 2, "/"), 2.5)
+
+
+class GeometryTestCase(unittest.TestCase):
+    def test_geometry_parameter(self):
+        params = parse_geometry("SRID=3857;POINT(1 2)").compile().params
+        self.assertCountEqual(
+            params.values(), [wkt_to_wkb("POINT(1 2)"), 3857]
+        )
+
+    def test_srid(self):
+        self.assertEqual(get_srid(None), 4326)
+        self.assertEqual(get_srid("EPSG:3857"), 3857)
+        self.assertEqual(get_srid("urn:ogc:def:crs:EPSG::3857"), 3857)
+        self.assertEqual(
+            get_srid("http://www.opengis.net/def/crs/EPSG/0/3857"), 3857
+        )
+        self.assertEqual(
+            get_srid("http://www.opengis.net/gml/srs/epsg.xml#3857"), 3857
+        )
+        self.assertEqual(get_srid("CRS:84"), 4326)
+        self.assertEqual(get_srid("OGC:CRS84"), 4326)
+        with self.assertRaises(ValueError):
+            get_srid("unknown")
+
+    def test_bbox_overlaps(self):
+        ast = parse('BBOX(geometry, 0, 0, 1, 1, "EPSG:3857")')
+        sql = str(to_filter(ast, FIELD_MAPPING, bboverlaps=True))
+        self.assertIn("&& ST_Transform(ST_MakeEnvelope(", sql)
+        self.assertNotIn("ST_Intersects", sql)
+
+    def test_bbox_crs(self):
+        for crs in ("CRS:84", "http://www.opengis.net/gml/srs/epsg.xml#4326"):
+            ast = parse('BBOX(geometry, 0, 0, 1, 1, "%s")' % crs)
+            sql = str(to_filter(ast, FIELD_MAPPING, bboverlaps=True))
+            self.assertNotIn("ST_Transform", sql)
+
+        # unknown CRS are used untransformed
+        ast = parse('BBOX(geometry, 0, 0, 1, 1, "unknown")')
+        sql = str(to_filter(ast, FIELD_MAPPING, bboverlaps=True))
+        self.assertNotIn("ST_Transform", sql)
+
+        # no transformation to undeclared SRIDs
+        ast = parse('BBOX(geometry, 0, 0, 1, 1, "EPSG:3857")')
+        column = Column("geometry", Geometry(geometry_type="POLYGON"))
+        sql = str(to_filter(ast, {"geometry": column}, bboverlaps=True))
+        self.assertNotIn("ST_Transform", sql)
+
+
 class CQLTestCase(unittest.TestCase):
     @classmethod
     def setUpClass(self):
@@ -225,6 +297,20 @@ class CQLTestCase(unittest.TestCase):
     def test_string_not_in(self):
         self.evaluate("identifier NOT IN (\"B\", 'C')", ("A",))
 
+    # combinations
+
+    def test_long_or_chain(self):
+        ids = ['"%s"' % i for i in ["A"] + [str(i) for i in range(3000)]]
+        self.evaluate(
+            " OR ".join("identifier = %s" % i for i in ids), ("A",)
+        )
+
+    def test_long_and_chain(self):
+        ids = ['"%s"' % i for i in ["B"] + [str(i) for i in range(3000)]]
+        self.evaluate(
+            " AND ".join("identifier <> %s" % i for i in ids), ("A",)
+        )
+
     # (NOT) NULL
 
     def test_string_null(self):
@@ -319,6 +405,9 @@ class CQLTestCase(unittest.TestCase):
     def test_arith_simple_plus(self):
         self.evaluate("intMetaAttribute = 10 + 10", ("A",))
 
+    def test_arith_constant_division(self):
+        self.evaluate("floatMetaAttribute = 5 / 2 * 4", ("A",))
+
     def test_arith_field_plus_1(self):
         self.evaluate("intMetaAttribute = floatMetaAttribute + 10", ("A", "B"))
 
@@ -335,3 +424,53 @@ class CQLTestCase(unittest.TestCase):
 
     def test_arith_field_plus_mul_2(self):
         self.evaluate("intMetaAttribute = 5 + intAttribute * 1.5", ("A",))
+
+    # statement cache
+
+    def test_statement_cache(self):
+        expressions = [
+            'floatAttribute < 10 AND strAttribute LIKE "A%" AND 1 < 2',
+            'floatAttribute < 40 AND strAttribute LIKE "B%" AND 2 < 1',
+            'floatAttribute < 50 AND strAttribute LIKE "C%" AND 3 < 4',
+        ]
+        cache_hits = []
+        for cql_expr in expressions:
+            filters = to_filter(parse(cql_expr), FIELD_MAPPING)
+            result = self.conn.execute(
+                select([Record.identifier]).where(filters)
+            )
+            result.fetchall()
+            cache_hits.append(
+                result.context.cache_hit is self.conn.dialect.CACHE_HIT
+            )
+        self.assertEqual(cache_hits[1:], [True, True])
+
+    # templates
+
+    def evaluate_template(self, cache, cql_expr, expected_ids):
+        filters = cache.to_filter(cql_expr)
+        q = self.session.query(Record).join(RecordMeta).filter(filters)
+        results = [row.identifier for row in q]
+        self.assertEqual(expected_ids, type(expected_ids)(results))
+
+    def test_template_cache(self):
+        cache = TemplateCache(FIELD_MAPPING)
+        self.evaluate_template(
+            cache,
+            "floatAttribute < 30 AND datetimeAttribute DURING "
+            "2000-01-01T00:00:00Z / 2000-01-01T00:00:01Z",
+            ("A",),
+        )
+        self.evaluate_template(
+            cache,
+            "floatAttribute < 40 AND datetimeAttribute DURING "
+            "2000-01-01T00:00:05Z / 2000-01-01T00:00:15Z",
+            ("B",),
+        )
+        self.evaluate_template(
+            cache, "intMetaAttribute = intAttribute * 1.5 + 5", ("A",)
+        )
+        self.evaluate_template(
+            cache, "intMetaAttribute = intAttribute * 1.5 + 6", ()
+        )
+        self.assertEqual(cache.info().hits, 2)
@@ -0,0 +1,124 @@
+from pycql import parse
+from pycql.ast import *
+
+
+def test_nodes_use_slots():
+    ast = parse('attr BETWEEN 2 AND 5 OR attr = "A"')
+    assert not hasattr(ast, '__dict__')
+    assert not hasattr(ast.lhs, '__dict__')
+    assert not hasattr(ast.lhs.lhs, '__dict__')
+
+def test_fieldwise_equality():
+    node = ComparisonPredicateNode(
+        AttributeExpression('attr'), LiteralExpression(5), '<'
+    )
+    assert node == ComparisonPredicateNode(
+        AttributeExpression('attr'), LiteralExpression(5), '<'
+    )
+    assert node != ComparisonPredicateNode(
+        AttributeExpression('attr'), LiteralExpression(5), '>'
+    )
+    assert node != ArithmeticExpressionNode(
+        AttributeExpression('attr'), LiteralExpression(5), '<'
+    )
+    assert get_fields(ComparisonPredicateNode) == ('lhs', 'rhs', 'op')
+
+def test_subclass_equality():
+    class CustomNode(AttributeExpression):
+        pass
+
+    a = CustomNode('attr')
+    b = CustomNode('attr')
+    assert a == b
+    b.extra = 1
+    assert a != b
+
+def test_nodes_are_immutable():
+    import pytest
+
+    ast = parse('attr = 5')
+    with pytest.raises(AttributeError):
+        ast.op = '<'
+    with pytest.raises(AttributeError):
+        del ast.lhs
+    assert copy_node(ast, op='<') == parse('attr < 5')
+    assert ast.op == '='
+
+def test_structural_hash():
+    a = parse('attr IN (1, 2) AND BBOX(geometry, 1, 2, 3, 4)')
+    b = parse('attr IN (1, 2) AND BBOX(geometry, 1, 2, 3, 4)')
+    assert a is not b
+    assert hash(a) == hash(b)
+    assert len({a, b, parse('attr IN (1, 3)')}) == 2
+    assert {a: 'value'}[b] == 'value'
+
+def test_interner_shares_subtrees():
+    interner = Interner()
+    a = interner.intern(parse('cloud_cover < 10 AND platform = "S2A"'))
+    b = interner.intern(parse('cloud_cover < 10 OR platform = "S2B"'))
+    assert a.lhs is b.lhs
+    assert a.lhs.lhs is b.lhs.lhs
+    assert interner.intern(parse('cloud_cover < 10')) is a.lhs
+    assert a == parse('cloud_cover < 10 AND platform = "S2A"')
+
+def test_cache_with_interner():
+    from pycql import ParseCache
+
+    cache = ParseCache(interner=Interner())
+    a = parse('attr = 1 AND other = 2', cache=cache)
+    b = parse('other = 2 OR attr = 3', cache=cache)
+    assert a.rhs is b.lhs
+
+
+def test_get_repr_deep_tree():
+    ast = parse('a = 1')
+    for i in range(1500):
+        ast = NotConditionNode(ast)
+    assert get_repr(ast, indent_incr=0).count('NOT') == 1500
+
+def test_visitor_dispatch():
+    import pytest
+
+    class Names(Visitor):
+        @handle(CombinationConditionNode)
+        def combination(self, node):
+            return [name for sub in node.sub_nodes for name in self.visit(sub)]
+
+        @handle(PredicateNode)
+        def predicate(self, node):
+            return self.visit(node.lhs)
+
+        @handle(AttributeExpression)
+        def attribute(self, node):
+            return [node.name]
+
+    ast = parse('a = 1 AND b BETWEEN 1 AND 2 AND c IS NULL')
+    assert Names().visit(ast) == ['a', 'b', 'c']
+    with pytest.raises(ValueError):
+        Names().visit(parse('NOT a = 1'))
+
+    class UpperNames(Names):
+        def attribute(self, node):
+            return [node.name.upper()]
+
+    assert UpperNames().visit(ast) == ['A', 'B', 'C']
+
+def test_visitor_register():
+    class CustomNode(AttributeExpression):
+        pass
+
+    class Names(Visitor):
+        @handle(AttributeExpression)
+        def attribute(self, node):
+            return node.name
+
+    class SubNames(Names):
+        pass
+
+    node = CustomNode('attr')
+    assert SubNames().visit(node) == 'attr'
+
+    Names.register(CustomNode, lambda visitor, node: 'custom')
+    assert Names().visit(node) == 'custom'
+    assert SubNames().visit(node) == 'custom'
+    assert SubNames().visit(AttributeExpression('attr')) == 'attr'
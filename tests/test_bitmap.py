@@ -0,0 +1,82 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from pycql.ast import NullPredicateNode
+from pycql.evaluate import parse
+from pycql.evaluate.bitmap import Bitmap, InvertedIndex
+from pycql.evaluate.vectorized import BitmapEvaluator, to_bitmap, to_mask
+
+
+def test_bitmap_operations():
+    a = Bitmap.from_ids([0, 3, 9], 11)
+    b = Bitmap.from_mask(np.array([i % 3 == 0 for i in range(11)]))
+    assert list(a.ids()) == [0, 3, 9]
+    assert list((a & b).ids()) == [0, 3, 9]
+    assert list((a | b).ids()) == [0, 3, 6, 9]
+    assert list((~a).ids()) == [1, 2, 4, 5, 6, 7, 8, 10]
+    assert (~a).count() == 8
+    assert ~~a == a
+    assert Bitmap.full(11).count() == 11
+    assert Bitmap.empty(11).count() == 0
+
+
+def test_inverted_index():
+    index = InvertedIndex(np.array(['S2A', 'L8', None, 'S2A'], dtype=object))
+    assert list(index.equals('S2A').ids()) == [0, 3]
+    assert list(index.equals('S2B').ids()) == []
+    assert list(index.not_equals('S2A').ids()) == [1]
+    assert list(index.isin(['S2A', 'L8']).ids()) == [0, 1, 3]
+    assert list(index.isin(['L8'], not_=True).ids()) == [0, 3]
+    assert list(index.isnull()) == [False, False, True, False]
+
+    index = InvertedIndex(np.array([1.0, np.nan, 2.0, 1.0]))
+    assert list(index.equals(1).ids()) == [0, 3]
+    assert list(index.not_equals(1).ids()) == [2]
+
+
+COLUMNS = {
+    'platform': np.array(['S2A', 'S2B', 'L8', None, 'S2A'], dtype=object),
+    'collection': np.array([1, 2, 3, 1, 5]),
+    'cloud_cover': np.array([10.0, 50.0, np.nan, 5.0, 80.0]),
+}
+INDEXED = {
+    'platform': InvertedIndex(COLUMNS['platform']),
+    'collection': InvertedIndex(COLUMNS['collection']),
+    'cloud_cover': COLUMNS['cloud_cover'],
+}
+
+
+@pytest.mark.parametrize('cql', [
+    'platform = "S2A"',
+    'platform <> "S2A"',
+    'platform IN ("S2A", "L8")',
+    'platform NOT IN ("S2A", "L8")',
+    'collection = 1 OR collection = 5',
+    'collection IN (1, 3) AND platform = "S2A"',
+    'NOT platform = "S2A"',
+    'platform = "S2B" OR cloud_cover < 8',
+    'collection > 2 AND platform IS NOT NULL',
+    '',
+])
+def test_same_as_unindexed(cql):
+    ast = parse(cql)
+    expected = list(to_mask(ast, COLUMNS))
+    assert list(to_mask(ast, INDEXED)) == expected
+    assert list(to_bitmap(ast, INDEXED).to_mask()) == expected
+    assert list(to_bitmap(ast, COLUMNS).to_mask()) == expected
+
+
+def test_bitmap_evaluator_register():
+    class Evaluator(BitmapEvaluator):
+        pass
+
+    @Evaluator.register(NullPredicateNode)
+    def null(evaluator, node):
+        return Bitmap.from_ids([1], evaluator.size)
+
+    evaluator = Evaluator(INDEXED)
+    bitmap = evaluator.to_bitmap(
+        parse('platform = "S2A" OR platform IS NULL')
+    )
+    assert list(bitmap.ids()) == [0, 1, 4]
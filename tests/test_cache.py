@@ -0,0 +1,40 @@
+from pycql import parse, ParseCache
+
+
+def test_cache_hit_returns_shared_ast():
+    cache = ParseCache()
+    first = parse('attr = 1', cache=cache)
+    second = parse('attr = 1', cache=cache)
+    assert first is second
+    assert cache.info() == (1, 1, 0, 1024, 1)
+
+def test_cache_empty_expression():
+    cache = ParseCache()
+    assert parse('', cache=cache) is None
+    assert parse('', cache=cache) is None
+    assert cache.info().hits == 1
+
+def test_cache_key_includes_factories():
+    cache = ParseCache()
+    parse('attr = 1', cache=cache)
+    parse('attr = 1', time_factory=str, cache=cache)
+    assert cache.info().misses == 2
+    assert len(cache) == 2
+
+def test_cache_evicts_least_recently_used():
+    cache = ParseCache(maxsize=2)
+    a = parse('a = 1', cache=cache)
+    parse('b = 1', cache=cache)
+    assert parse('a = 1', cache=cache) is a
+    parse('c = 1', cache=cache)
+    info = cache.info()
+    assert info.evictions == 1
+    assert info.currsize == 2
+    assert parse('a = 1', cache=cache) is a
+    assert cache.info().hits == 2
+
+def test_cache_clear():
+    cache = ParseCache()
+    parse('a = 1', cache=cache)
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 1024, 0)
@@ -0,0 +1,122 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pycql.evaluate import parse, to_predicate
+from pycql.evaluate.compiler import UNITS_TO_METERS
+from pycql.lexer import CQLLexer
+
+
+class Geometry:
+    """ Minimal geometry stand-in: an axis aligned box. """
+    def __init__(self, minx, miny, maxx, maxy):
+        self.bounds = (minx, miny, maxx, maxy)
+
+    def intersects(self, other):
+        a, b = self.bounds, other.bounds
+        return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+    def distance(self, other):
+        a, b = self.bounds, other.bounds
+        dx = max(b[0] - a[2], a[0] - b[2], 0)
+        dy = max(b[1] - a[3], a[1] - b[3], 0)
+        return (dx ** 2 + dy ** 2) ** 0.5
+
+
+def dt(day):
+    return datetime(2000, 1, day, tzinfo=timezone.utc)
+
+
+RECORDS = [
+    {'id': 0, 'intAttr': 1, 'strAttr': 'AAA', 'datetime': dt(1),
+     'geom': Geometry(0, 0, 1, 1)},
+    {'id': 1, 'intAttr': 5, 'strAttr': 'abc', 'datetime': dt(5),
+     'geom': Geometry(5, 5, 6, 6)},
+    {'id': 2, 'intAttr': 10, 'strAttr': 'xyz', 'datetime': dt(10),
+     'geom': None, 'optional': 1},
+    {'id': 3, 'intAttr': None, 'strAttr': None},
+]
+
+
+def evaluate(cql, records=RECORDS, field_mapping=None):
+    predicate = to_predicate(parse(cql), field_mapping)
+    return [record['id'] for record in records if predicate(record)]
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('intAttr = 5', [1]),
+    ('intAttr <> 5', [0, 2]),
+    ('intAttr < 5', [0]),
+    ('intAttr >= 5', [1, 2]),
+    ('intAttr = 2 + 3', [1]),
+    ('intAttr * 2 = 10', [1]),
+    ('intAttr BETWEEN 2 AND 10', [1, 2]),
+    ('intAttr NOT BETWEEN 2 AND 10', [0]),
+    ('strAttr LIKE "a%"', [1]),
+    ('strAttr ILIKE "a%"', [0, 1]),
+    ('strAttr NOT LIKE "a%"', [0, 2]),
+    ('strAttr LIKE "x_z"', [2]),
+    ('intAttr IN (1, 10)', [0, 2]),
+    ('intAttr NOT IN (1, 10)', [1]),
+    ('strAttr IN ("abc", "xyz")', [1, 2]),
+    ('optional IS NULL', [0, 1, 3]),
+    ('optional IS NOT NULL', [2]),
+    ('intAttr = 1 OR intAttr = 10', [0, 2]),
+    ('intAttr > 1 AND strAttr LIKE "%z"', [2]),
+    ('NOT intAttr = 1', [1, 2, 3]),
+    ('', [0, 1, 2, 3]),
+])
+def test_predicates(cql, expected):
+    assert evaluate(cql) == expected
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('datetime BEFORE 2000-01-05T00:00:00Z', [0, 1]),
+    ('datetime AFTER 2000-01-05T00:00:00Z', [1, 2]),
+    ('datetime DURING 2000-01-02T00:00:00Z / 2000-01-06T00:00:00Z', [1]),
+    ('datetime DURING 2000-01-02T00:00:00Z / P4D', [1]),
+    ('datetime DURING P4D / 2000-01-06T00:00:00Z', [1]),
+    ('datetime BEFORE OR DURING '
+     '2000-01-02T00:00:00Z / 2000-01-06T00:00:00Z', [0, 1]),
+    ('datetime DURING OR AFTER '
+     '2000-01-02T00:00:00Z / 2000-01-06T00:00:00Z', [1, 2]),
+])
+def test_temporal(cql, expected):
+    assert evaluate(cql) == expected
+
+
+def test_bbox():
+    assert evaluate('BBOX(geom, 0.5, 0.5, 2, 2)') == [0]
+
+
+def test_spatial():
+    field_mapping = {'other': lambda record: Geometry(4, 4, 4.5, 4.5)}
+    assert evaluate(
+        'INTERSECTS(geom, other)', field_mapping=field_mapping
+    ) == []
+    assert evaluate(
+        'DWITHIN(geom, other, 1, meters)', field_mapping=field_mapping
+    ) == [1]
+    assert evaluate(
+        'BEYOND(geom, other, 1, meters)', field_mapping=field_mapping
+    ) == [0]
+
+
+def test_units():
+    # the units are looked up by the values of the UNITS tokens
+    assert set(UNITS_TO_METERS) <= set(CQLLexer.keywords)
+
+
+def test_objects_and_field_mapping():
+    class Record:
+        def __init__(self, value):
+            self.value = value
+
+    predicate = to_predicate(parse('attr > 1'), {'attr': 'value'})
+    assert [predicate(Record(value)) for value in (1, 2)] == [False, True]
+
+
+def test_long_combination():
+    ids = ' OR '.join('intAttr = %d' % i for i in range(2000, 5000))
+    assert evaluate('intAttr = 5 OR ' + ids) == [1]
+    assert evaluate('intAttr > 0 AND ' + ids.replace(' OR ', ' AND ')) == []
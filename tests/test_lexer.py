@@ -0,0 +1,75 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pycql.lexer import CQLLexer
+from pycql.util import (
+    bbox_to_wkb, match_geometry, parse_datetime, wkt_to_wkb
+)
+
+
+def tokenize(text):
+    lexer = CQLLexer(optimize=True)
+    lexer.input(text)
+    tokens = []
+    while True:
+        tok = lexer.token()
+        if tok is None:
+            return tokens
+        tokens.append((tok.type, tok.value))
+
+
+def test_large_polygon():
+    coordinates = ', '.join('%d.5 %d' % (i, i % 90) for i in range(100000))
+    geometry = 'POLYGON((%s, 0.5 0))' % coordinates
+    tokens = tokenize('INTERSECTS(geometry, %s)' % geometry)
+    assert [type_ for type_, _ in tokens] == [
+        'INTERSECTS', 'LPAREN', 'ATTRIBUTE', 'COMMA', 'GEOMETRY', 'RPAREN'
+    ]
+    assert tokens[4][1].value == geometry
+
+
+def test_invalid_geometry_fallback():
+    assert [type_ for type_, _ in tokenize('POINT( 1 2)')] == [
+        'DURATION', 'ATTRIBUTE', 'LPAREN', 'FLOAT', 'FLOAT', 'RPAREN'
+    ]
+    assert [type_ for type_, _ in tokenize('LINESTRING(0 0, 1)')] == [
+        'ATTRIBUTE', 'LPAREN', 'FLOAT', 'FLOAT', 'COMMA', 'FLOAT', 'RPAREN'
+    ]
+
+
+def test_match_geometry():
+    assert match_geometry('POINT(1 2) AND') == 10
+    assert match_geometry('x POINT(1 2)', 2) == 12
+    assert match_geometry('POLYGON((0 0, 1 1 ) , (2 2, 3 3))') == 33
+    assert match_geometry('MULTIPOINT((1 2), (3 4))') == 24
+    assert match_geometry('MULTIPOLYGON(((0 0, 1 1)), ((2 2, 3 3)))') == 40
+    assert match_geometry('POLYGON((0 0, 1 1) )') == -1
+    assert match_geometry('POINT(1 2 3 4 5)') == -1
+    assert match_geometry('LINESTRING(0 0, 1 1,)') == -1
+
+
+def test_wkt_to_wkb():
+    assert wkt_to_wkb('POINT(1 2)') == bytes.fromhex(
+        '0101000000000000000000f03f0000000000000040'
+    )
+    assert wkt_to_wkb('POINT(1 2 3)')[1:5] == bytes.fromhex('e9030000')
+    assert wkt_to_wkb('MULTIPOINT(1 2, 3 4)') == \
+        wkt_to_wkb('MULTIPOINT((1 2), (3 4))')
+    assert wkt_to_wkb('POLYGON((0 0, 0 1, 1 1, 1 0, 0 0))') == \
+        bbox_to_wkb(0, 0, 1, 1)
+    invalid = ['POINT(1)', 'POINT(1 2', 'LINESTRING(0 0, 1 1 1)', 'CIRCLE(1)']
+    for wkt in invalid:
+        with pytest.raises(ValueError):
+            wkt_to_wkb(wkt)
+
+
+def test_parse_datetime():
+    assert parse_datetime('2020-02-29T12:30:45Z') == datetime(
+        2020, 2, 29, 12, 30, 45, tzinfo=timezone.utc
+    )
+    assert parse_datetime('2020-02-29T12:30:45Z') is \
+        parse_datetime('2020-02-29T12:30:45Z')
+    for value in ['2020-02-30T00:00:00Z', '2020-01-01T00:00:00', '2020']:
+        with pytest.raises(ValueError):
+            parse_datetime(value)
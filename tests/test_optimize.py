@@ -0,0 +1,198 @@
+import pytest
+
+import itertools
+
+from pycql import parse, get_repr
+from pycql.ast import CombinationConditionNode
+from pycql.evaluate import to_predicate
+from pycql.optimize import (
+    AttributeStatistics, CostModel, flatten, reorder, simplify, optimize,
+    equalities_to_in,
+)
+
+
+def operands(node):
+    return [attribute_name(operand) for operand in flatten(node)]
+
+
+def attribute_name(node):
+    return node.lhs.name if hasattr(node, 'lhs') else node
+
+
+def test_flatten():
+    ast = parse('a = 1 AND (b = 1 AND c = 1) AND (d = 1 OR e = 1)')
+    result = flatten(ast)
+    assert [attribute_name(node) for node in result[:3]] == ['a', 'b', 'c']
+    assert isinstance(result[3], CombinationConditionNode)
+    assert [attribute_name(node) for node in flatten(result[3])] == ['d', 'e']
+
+
+def test_cheap_and_selective_first():
+    ast = reorder(parse(
+        'INTERSECTS(geom, POINT(0 0)) AND name LIKE "a%" AND platform = "S2A"'
+    ))
+    assert operands(ast) == ['platform', 'name', 'geom']
+
+
+def test_or_likely_first():
+    ast = reorder(parse('platform = "S2A" OR cloud_cover <> 5'))
+    assert operands(ast) == ['cloud_cover', 'platform']
+
+
+def test_stable_for_equal_rank():
+    ast = reorder(parse('a = 1 AND b = 1 AND c = 1'))
+    assert operands(ast) == ['a', 'b', 'c']
+
+
+def test_nested_and_not():
+    ast = reorder(parse('NOT (BBOX(geom, 0, 0, 1, 1) AND a = 1)'))
+    assert operands(ast.sub_node) == ['a', 'geom']
+
+
+def test_statistics():
+    ast = parse('cloud_cover < 90 AND platform = "S2A"')
+    assert operands(reorder(ast)) == ['platform', 'cloud_cover']
+
+    statistics = {
+        'cloud_cover': AttributeStatistics(minimum=0, maximum=100),
+        'platform': AttributeStatistics(distinct=2),
+    }
+    assert operands(reorder(ast, statistics)) == ['platform', 'cloud_cover']
+
+    statistics['cloud_cover'] = AttributeStatistics(minimum=80, maximum=100)
+    assert operands(reorder(ast, statistics)) == ['cloud_cover', 'platform']
+
+
+@pytest.mark.parametrize('cql, statistics, expected', [
+    ('a = 1', None, 0.1),
+    ('a = 1', {'a': AttributeStatistics(distinct=4)}, 0.25),
+    ('a <> 1', {'a': AttributeStatistics(distinct=4)}, 0.75),
+    ('a IN (1, 2)', {'a': AttributeStatistics(distinct=4)}, 0.5),
+    ('a < 25', {'a': AttributeStatistics(minimum=0, maximum=100)}, 0.25),
+    ('a >= 25', {'a': AttributeStatistics(minimum=0, maximum=100)}, 0.75),
+    ('a BETWEEN 10 AND 30',
+     {'a': AttributeStatistics(minimum=0, maximum=100)}, 0.2),
+    ('a IS NULL', {'a': AttributeStatistics(null_fraction=0.4)}, 0.4),
+    ('a = 1', {'a': AttributeStatistics(4, 0.2)}, 0.2),
+    ('a = 1 AND b = 1', None, 0.01),
+    ('NOT a = 1', None, 0.9),
+])
+def test_selectivity(cql, statistics, expected):
+    model = CostModel(statistics)
+    assert model.selectivity(parse(cql)) == pytest.approx(expected)
+
+
+def test_expected_cost():
+    model = CostModel()
+    # the second operand is only evaluated for 10% of the records
+    assert model.cost(parse('a = 1 AND b = 1')) == pytest.approx(1.1)
+    assert model.cost(parse('a + 1 = 1')) == pytest.approx(2.0)
+
+
+def test_reorder_none():
+    assert reorder(None) is None
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('a = 2 * 3 + 1', 'a = 7'),
+    ('a = b * (2 - 1)', 'a = b * 1'),
+    ('a = 1 / 0', 'a = 1 / 0'),
+    ('NOT NOT a = 1', 'a = 1'),
+    ('NOT NOT NOT a = 1', 'NOT a = 1'),
+    ('a = 1 AND b = 1 AND a = 1', 'a = 1 AND b = 1'),
+    ('(a = 1 OR b = 1) OR (b = 1 OR c = 1)', 'a = 1 OR b = 1 OR c = 1'),
+    ('a >= 1 AND a <= 5', 'a BETWEEN 1 AND 5'),
+    ('a >= 1 AND b = 1 AND a <= 5 AND a <= 3', 'a BETWEEN 1 AND 3 AND b = 1'),
+    ('a > 1 AND a >= 1 AND a < 4', 'a > 1 AND a < 4'),
+    ('a BETWEEN 0 AND 10 AND a > 5', 'a > 5 AND a <= 10'),
+    ('a >= 3 AND a <= 3', 'a = 3'),
+    ('a >= 1 OR a <= 5', 'a >= 1 OR a <= 5'),
+    ('a BETWEEN 3 AND 3', 'a = 3'),
+    ('a NOT BETWEEN 3 AND 3', 'a <> 3'),
+    ('a IN (1, 2, 1)', 'a IN (1, 2)'),
+    ('a IN (1, 1)', 'a = 1'),
+    ('a NOT IN (1)', 'a <> 1'),
+    ('a = 1 OR a = 2 OR a = 1', 'a IN (1, 2)'),
+])
+def test_simplify(cql, expected):
+    assert get_repr(simplify(parse(cql))) == get_repr(parse(expected))
+
+
+def test_simplify_preserves_semantics():
+    queries = [
+        'a >= 1 AND a <= 3 AND a > 1',
+        'NOT NOT (a IN (1, 2, 2) OR b BETWEEN 2 AND 2)',
+        'a > 1 AND a >= 2 AND a < 3 + 1 AND b = 1 AND b = 1',
+    ]
+    records = [
+        {'a': a, 'b': b}
+        for a, b in itertools.product([0, 1, 2, 3, 4, None], [1, 2, None])
+    ]
+    for cql in queries:
+        ast = parse(cql)
+        for rewritten in (simplify(ast), optimize(ast)):
+            expected = to_predicate(ast)
+            predicate = to_predicate(rewritten)
+            assert [predicate(r) for r in records] == [
+                expected(r) for r in records
+            ]
+
+
+def test_simplify_keeps_unchanged_nodes():
+    ast = parse('a = 1 AND b LIKE "x%"')
+    simplified = simplify(ast)
+    assert simplified == ast
+    assert simplified.lhs is ast.lhs
+    assert simplify(None) is None
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('a = 1 OR a = 2', 'a IN (1, 2)'),
+    ('a = 1 OR b = 2 OR a = 2 OR a IN (3, 1)', 'a IN (1, 2, 3) OR b = 2'),
+    ('a <> 1 AND b = 1 AND a <> 2', 'a NOT IN (1, 2) AND b = 1'),
+    ('a <> 1 AND a NOT IN (2, 3)', 'a NOT IN (1, 2, 3)'),
+    ('a = 1 OR b = 1', 'a = 1 OR b = 1'),
+    ('a = 1 AND a = 2', 'a = 1 AND a = 2'),
+    ('a <> 1 OR a <> 2', 'a <> 1 OR a <> 2'),
+    ('a = 1 OR a > 2', 'a = 1 OR a > 2'),
+    ('a = 1', 'a = 1'),
+])
+def test_equalities_to_in(cql, expected):
+    assert equalities_to_in(parse(cql)) == parse(expected)
+
+
+def test_equalities_to_in_preserves_semantics():
+    queries = [
+        'a = 1 OR a = 2 OR b = 1',
+        'a <> 1 AND a <> 2 AND b <> 1',
+        'a IN (1, 3) OR a = 2',
+    ]
+    records = [
+        {'a': a, 'b': b}
+        for a, b in itertools.product([1, 2, 3, None], [1, 2, None])
+    ]
+    for cql in queries:
+        ast = parse(cql)
+        expected = to_predicate(ast)
+        predicate = to_predicate(equalities_to_in(ast))
+        assert [predicate(r) for r in records] == [
+            expected(r) for r in records
+        ]
+
+
+def test_equalities_to_in_long_chain():
+    ast = parse(' OR '.join('id = %d' % i for i in range(3000)))
+    result = equalities_to_in(ast)
+    assert len(result.sub_nodes) == 3000
+    assert not result.not_
+
+
+def test_equalities_to_in_sqlalchemy():
+    # the ORM integrations depend on this module, so they must be importable
+    # on all supported python versions
+    sqlalchemy = pytest.importorskip('sqlalchemy')
+    from pycql.integrations.sqlalchemy import to_filter
+
+    column = sqlalchemy.column('a')
+    sql = str(to_filter(parse('a = 1 OR a = 2 OR a = 3'), {'a': column}))
+    assert sql.startswith('a IN (')
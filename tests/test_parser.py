@@ -324,3 +324,97 @@ def test_attribute_arithmetic_div_sub_bracketted():
         ),
         '=',
     )
+
+
+# Parser reuse
+
+def test_parser_is_shared():
+    from pycql.parser import get_parser
+    assert get_parser() is get_parser()
+    assert parse('attr = 1') == parse('attr = 1')
+
+def test_parser_reuse_resets_lineno():
+    parse('attr = 1\nAND\nother = 2')
+    ast = parse('attr = 1')
+    assert ast == ComparisonPredicateNode(
+        AttributeExpression('attr'),
+        LiteralExpression(1),
+        '=',
+    )
+
+def test_parser_per_thread():
+    from concurrent.futures import ThreadPoolExecutor
+    from pycql.parser import get_parser
+
+    queries = ['attr%d = %d' % (i, i) for i in range(200)]
+
+    def run(query):
+        return get_parser(), parse(query)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(run, queries))
+
+    for query, (parser, ast) in zip(queries, results):
+        assert ast == parse(query)
+    assert get_parser() not in [parser for parser, _ in results]
+
+
+# Lazy literals
+
+def test_lazy_literals():
+    calls = []
+
+    def geometry_factory(value):
+        calls.append(value)
+        return value.lower()
+
+    ast = parse(
+        'INTERSECTS(geometry, POINT(1 2))',
+        geometry_factory=geometry_factory, lazy=True
+    )
+    assert calls == []
+    assert ast.rhs.value == 'point(1 2)'
+    assert ast.rhs.value == 'point(1 2)'
+    assert calls == ['POINT(1 2)']
+
+def test_lazy_temporal_literals():
+    ast = parse(
+        'attr DURING 2000-01-01T00:00:00Z / PT4S',
+        time_factory=str, duration_factory=len, lazy=True
+    )
+    assert ast.rhs == ('2000-01-01T00:00:00Z', 4)
+    assert ast == parse(
+        'attr DURING 2000-01-01T00:00:00Z / PT4S',
+        time_factory=str, duration_factory=len, lazy=True
+    )
+
+
+# Combinations
+
+def test_combinations_are_flattened():
+    ast = parse('a = 1 OR b = 1 OR (c = 1 OR d = 1) OR e = 1 AND f = 1')
+    assert ast.op == 'OR'
+    assert [node.lhs.name for node in ast.sub_nodes[:4]] == [
+        'a', 'b', 'c', 'd'
+    ]
+    assert ast.sub_nodes[4] == CombinationConditionNode(
+        (parse('e = 1'), parse('f = 1')), 'AND'
+    )
+
+
+def test_binary_combination():
+    lhs, rhs = parse('a = 1'), parse('b = 1')
+    node = CombinationConditionNode(lhs, rhs, 'AND')
+    assert node == CombinationConditionNode([lhs, rhs], 'AND')
+    assert node.lhs is lhs
+    assert node.rhs is rhs
+    assert parse('a = 1 AND b = 1') == node
+
+
+def test_long_combination():
+    query = ' OR '.join('id = %d' % i for i in range(3000))
+    ast = parse(query)
+    assert len(ast.sub_nodes) == 3000
+    assert ast == parse(query)
+    assert hash(ast) == hash(parse(query))
+    assert get_repr(ast).count(') OR (') == 2999
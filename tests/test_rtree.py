@@ -0,0 +1,53 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from pycql.evaluate.rtree import STRTree
+
+
+def make_boxes(count, seed=0):
+    random = np.random.default_rng(seed)
+    mins = random.uniform(0, 100, (count, 2))
+    maxs = mins + random.uniform(0, 5, (count, 2))
+    return mins[:, 0], mins[:, 1], maxs[:, 0], maxs[:, 1]
+
+
+def brute_force(boxes, minx, miny, maxx, maxy):
+    bminx, bminy, bmaxx, bmaxy = boxes
+    return np.flatnonzero(
+        (bminx <= maxx) & (bmaxx >= minx) & (bminy <= maxy) & (bmaxy >= miny)
+    )
+
+
+@pytest.mark.parametrize('count, node_capacity', [
+    (1, 16), (16, 16), (17, 16), (1000, 4), (5000, 16), (5000, 2),
+])
+def test_query_same_as_scan(count, node_capacity):
+    boxes = make_boxes(count)
+    tree = STRTree(*boxes, node_capacity=node_capacity)
+    assert len(tree) == count
+
+    random = np.random.default_rng(1)
+    for _ in range(50):
+        x, y = random.uniform(-10, 110, 2)
+        w, h = random.uniform(0, 30, 2)
+        query = (x, y, x + w, y + h)
+        assert list(tree.query(*query)) == list(brute_force(boxes, *query))
+
+
+def test_missing_boxes():
+    tree = STRTree(
+        [0, np.nan, 2], [0, np.nan, 2], [1, np.nan, 3], [1, np.nan, 3]
+    )
+    assert len(tree) == 2
+    assert list(tree.query(-10, -10, 10, 10)) == [0, 2]
+
+
+def test_empty():
+    tree = STRTree([], [], [], [])
+    assert list(tree.query(0, 0, 1, 1)) == []
+
+
+def test_invalid_capacity():
+    with pytest.raises(ValueError):
+        STRTree([0], [0], [1], [1], node_capacity=1)
@@ -0,0 +1,72 @@
+import pytest
+from ply.lex import LexError
+
+from pycql import parse
+from pycql.lexer import CQLLexer
+from pycql.scanner import CQLScanner
+
+
+def tokenize(lexer, text):
+    lexer.input(text)
+    tokens = []
+    while True:
+        tok = lexer.token()
+        if tok is None:
+            return tokens
+        tokens.append((tok.type, tok.value, tok.lineno, tok.lexpos))
+
+
+INPUTS = [
+    'attr = "A"',
+    "attr <> 'B' AND other <= 5 OR x >= 3.5e2",
+    'attr < 5 AND attr > -5',
+    '3-2 + 1.5 * .5 / 4',
+    'attr NOT BETWEEN 2 AND 5',
+    'attr NOT ILIKE "some%"',
+    'attr IN (1, 2, 3) AND [attr IS NOT NULL]',
+    'attr BEFORE 2000-01-01T00:00:01Z',
+    'attr DURING 2000-01-01T00:00:00Z / PT4S',
+    'attr DURING OR AFTER P1Y2M3DT4H5M6S / 2000-01-01T00:00:03Z',
+    'INTERSECTS(geometry, POINT(1 2))',
+    'INTERSECTS(geometry, POINT( 1 2))',
+    'WITHIN(geometry, LINESTRING(0 0 ,1 1 , 2 2))',
+    'CONTAINS(geometry, '
+    'POLYGON((0 0, 1 0, 1 1, 0 0), (0.1 0.1, 0.2 0.2, 0.1 0.1)))',
+    'CONTAINS(geometry, POLYGON( (0 0, 1 0, 1 1, 0 0)))',
+    'EQUALS(geometry, MULTIPOINT(1 2, 3 4))',
+    'EQUALS(geometry, MULTIPOINT((1 2), (3 4)))',
+    'TOUCHES(geometry, MULTILINESTRING((0 0, 1 1),(2 2 3, 3 3 4)))',
+    'OVERLAPS(geometry, '
+    'MULTIPOLYGON(((0 0, 1 1, 1 0, 0 0)), ((1 1 1 1, 2 2 2 2, 1 1 1 1))))',
+    'INTERSECTS(geometry, ENVELOPE(0 1 2 3))',
+    'DWITHIN(geometry, POINT(1 2), 10, meters)',
+    'BEYOND(geometry, POINT(1 2), 10, statute miles)',
+    'DWITHIN(geometry, POINT(1 2), 10, feetx)',
+    'RELATE(geometry, POINT(1 2), "T*****FF*")',
+    'BBOX(geometry, 1, 2, 3, 4, "EPSG:3875")',
+    'Pname = POINT AND $a_b = _c',
+    'attr = 1\nAND\n\nother = 2',
+    'attr\t=\t1',
+    '',
+]
+
+
+@pytest.mark.parametrize('text', INPUTS)
+def test_same_tokens_as_lexer(text):
+    expected = tokenize(CQLLexer(optimize=True), text)
+    assert tokenize(CQLScanner(), text) == expected
+
+
+@pytest.mark.parametrize(
+    'text', ['attr = "unterminated', 'attr = 1.', 'attr ? 1']
+)
+def test_illegal_character(text):
+    with pytest.raises(LexError):
+        tokenize(CQLLexer(optimize=True), text)
+    with pytest.raises(LexError):
+        tokenize(CQLScanner(), text)
+
+
+def test_parse_with_scanner():
+    text = 'attr = 5 AND INTERSECTS(geometry, POLYGON((0 0, 1 0, 1 1, 0 0)))'
+    assert parse(text, lexer_class=CQLScanner) == parse(text)
@@ -0,0 +1,103 @@
+from datetime import datetime, timezone
+
+from pycql import parse
+from pycql.ast import *
+from pycql.template import TemplateCache, compile_template, parameterize
+from pycql.util import parse_datetime, parse_duration
+
+
+def parse_times(cql):
+    return parse(
+        cql, time_factory=parse_datetime, duration_factory=parse_duration
+    )
+
+def test_parameterize():
+    template, values = parameterize(
+        parse('a < 10 AND b BETWEEN 1 AND 2 AND c IN ("x", "y")')
+    )
+    assert template == CombinationConditionNode((
+        ComparisonPredicateNode(
+            AttributeExpression('a'), ParameterExpression('p0'), '<'
+        ),
+        BetweenPredicateNode(
+            AttributeExpression('b'), ParameterExpression('p1'),
+            ParameterExpression('p2'), False
+        ),
+        InPredicateNode(
+            AttributeExpression('c'),
+            (ParameterExpression('p3'), ParameterExpression('p4')), False
+        ),
+    ), 'AND')
+    assert values == {'p0': 10, 'p1': 1, 'p2': 2, 'p3': 'x', 'p4': 'y'}
+
+def test_parameterize_keeps_structural_values():
+    ast = parse(
+        'a LIKE "x%" AND BBOX(geom, 1, 2, 3, 4) AND '
+        'DWITHIN(geom, POINT(1 1), 10, meters)'
+    )
+    template, values = parameterize(ast)
+    assert template == ast
+    assert values == {}
+
+def test_parameterize_temporal():
+    template, values = parameterize(parse_times(
+        't BEFORE 2020-01-01T00:00:00Z OR '
+        't DURING 2020-01-01T00:00:00Z / 2020-02-01T00:00:00Z OR '
+        't DURING 2020-01-01T00:00:00Z / P1D'
+    ))
+    before, during, during_duration = template.sub_nodes
+    assert before == ComparisonPredicateNode(
+        AttributeExpression('t'), ParameterExpression('p0'), '<='
+    )
+    assert during == BetweenPredicateNode(
+        AttributeExpression('t'), ParameterExpression('p1'),
+        ParameterExpression('p2'), False
+    )
+    assert isinstance(during_duration, TemporalPredicateNode)
+    assert values['p2'] == datetime(2020, 2, 1, tzinfo=timezone.utc)
+    assert len(values) == 3
+
+def test_parameterize_exclude():
+    template, values = parameterize(
+        parse('a = "x" AND b = "y"'), exclude=['a']
+    )
+    assert template.sub_nodes[0] == parse('a = "x"')
+    assert values == {'p0': 'y'}
+
+def test_compile_template():
+    template, values = compile_template(
+        parse('a < 10 OR a > 20'), get_repr,
+        lambda text, values: (text, values)
+    )
+    assert template.names == ('p0', 'p1')
+    assert 'PARAMETER p1' in template.filter
+    assert template.bind(values)[1] == {'p0': 10, 'p1': 20}
+
+def test_template_cache():
+    translated = []
+
+    def translate(ast):
+        translated.append(ast)
+        return ast
+
+    cache = TemplateCache(
+        translate, lambda ast, values: values,
+        time_factory=parse_datetime, duration_factory=parse_duration
+    )
+    assert cache.to_filter(
+        'a < 10 AND t AFTER 2020-01-01T00:00:00Z AND b LIKE "x%"'
+    ) == {'p0': 10, 'p1': datetime(2020, 1, 1, tzinfo=timezone.utc)}
+    assert cache.to_filter(
+        'a < 12 AND t AFTER 2021-01-01T00:00:00Z AND b LIKE "x%"'
+    ) == {'p0': 12, 'p1': datetime(2021, 1, 1, tzinfo=timezone.utc)}
+    assert len(translated) == 1
+    assert cache.info().hits == 1
+
+    # kept values are part of the key
+    cache.to_filter('a < 12 AND t AFTER 2021-01-01T00:00:00Z AND b LIKE "y%"')
+    assert len(translated) == 2
+    assert translated[1].sub_nodes[2] == parse('b LIKE "y%"')
+    assert len(cache) == 2
+
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from pycql.evaluate import parse
+from pycql.evaluate.temporal import TimeColumn
+from pycql.evaluate.vectorized import to_mask
+
+
+def dt(day):
+    return datetime(2000, 1, day, tzinfo=timezone.utc)
+
+
+INSTANTS = [dt(5), dt(1), None, dt(10), dt(5)]
+BEGINS = [dt(1), dt(3), dt(8), None, dt(2)]
+ENDS = [dt(4), dt(9), dt(12), dt(3), dt(2)]
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('t BEFORE 2000-01-05T00:00:00Z', [0, 1, 4]),
+    ('t AFTER 2000-01-05T00:00:00Z', [0, 3, 4]),
+    ('t DURING 2000-01-02T00:00:00Z / 2000-01-09T00:00:00Z', [0, 4]),
+    ('t DURING 2000-01-02T00:00:00Z / P3D', [0, 4]),
+    ('t BEFORE OR DURING 2000-01-02T00:00:00Z / P3D', [0, 1, 4]),
+    ('t DURING OR AFTER 2000-01-02T00:00:00Z / P3D', [0, 3, 4]),
+    ('t IS NULL', [2]),
+])
+def test_instants(cql, expected):
+    columns = {'t': TimeColumn(INSTANTS)}
+    assert list(np.flatnonzero(to_mask(parse(cql), columns))) == expected
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('t BEFORE 2000-01-04T00:00:00Z', [0, 4]),
+    ('t AFTER 2000-01-02T00:00:00Z', [1, 2, 4]),
+    ('t DURING 2000-01-01T00:00:00Z / 2000-01-09T00:00:00Z', [0, 1, 4]),
+    ('t DURING OR AFTER 2000-01-03T00:00:00Z / P1D', [1, 2]),
+    ('t IS NOT NULL', [0, 1, 2, 4]),
+])
+def test_intervals(cql, expected):
+    columns = {'t': TimeColumn(BEGINS, ENDS)}
+    assert list(np.flatnonzero(to_mask(parse(cql), columns))) == expected
+
+
+def test_same_as_unindexed():
+    random = np.random.default_rng(0)
+    values = (
+        np.datetime64('2000-01-01T00:00:00', 'us') +
+        random.integers(0, 1000, 500).astype('timedelta64[h]')
+    )
+    indexed = {'t': TimeColumn(values)}
+    plain = {'t': values}
+    for cql in ('t BEFORE 2000-01-10T00:00:00Z',
+                't AFTER 2000-01-20T12:00:00Z',
+                't DURING 2000-01-05T00:00:00Z / P10D'):
+        ast = parse(cql)
+        assert list(to_mask(ast, indexed)) == list(to_mask(ast, plain))
+
+
+def test_query_ids():
+    column = TimeColumn(INSTANTS)
+    assert list(column.query()) == [0, 1, 3, 4]
+    assert list(column.query(dt(5), dt(5))) == [0, 4]
+    assert list(column.query(dt(5) + timedelta(seconds=1))) == [3]
+
+
+def test_length_mismatch():
+    with pytest.raises(ValueError):
+        TimeColumn([dt(1)], [dt(2), dt(3)])
@@ -0,0 +1,175 @@
+from datetime import datetime
+import re
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import pycql
+from pycql.evaluate import parse, to_predicate
+from pycql.evaluate.spatial import GeometryColumn
+from pycql.evaluate.vectorized import to_mask
+
+
+COLUMNS = {
+    'intAttr': np.array([1, 5, 10, 7]),
+    'floatAttr': np.array([0.5, np.nan, 2.5, 3.5]),
+    'strAttr': np.array(['AAA', 'abc', 'xyz', None], dtype=object),
+    'datetime': np.array([
+        datetime(2000, 1, 1), datetime(2000, 1, 5),
+        datetime(2000, 1, 10), None,
+    ], dtype='datetime64[us]'),
+}
+
+
+def evaluate(cql, field_mapping=None):
+    return list(np.flatnonzero(to_mask(parse(cql), COLUMNS, field_mapping)))
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('intAttr = 5', [1]),
+    ('intAttr <> 5', [0, 2, 3]),
+    ('floatAttr < 3', [0, 2]),
+    ('floatAttr <> 2.5', [0, 3]),
+    ('intAttr * 2 >= 14', [2, 3]),
+    ('intAttr + floatAttr > 3', [2, 3]),
+    ('intAttr BETWEEN 2 AND 7', [1, 3]),
+    ('intAttr NOT BETWEEN 2 AND 7', [0, 2]),
+    ('floatAttr NOT BETWEEN 1 AND 3', [0, 3]),
+    ('strAttr LIKE "a%"', [1]),
+    ('strAttr ILIKE "A%"', [0, 1]),
+    ('strAttr NOT LIKE "a%"', [0, 2]),
+    ('strAttr = "xyz"', [2]),
+    ('intAttr IN (1, 10)', [0, 2]),
+    ('intAttr NOT IN (1, 10)', [1, 3]),
+    ('strAttr IN ("abc", "xyz")', [1, 2]),
+    ('strAttr IS NULL', [3]),
+    ('floatAttr IS NOT NULL', [0, 2, 3]),
+    ('intAttr > 1 AND strAttr LIKE "%z"', [2]),
+    ('intAttr = 1 OR floatAttr > 3', [0, 3]),
+    ('NOT intAttr = 1', [1, 2, 3]),
+    ('datetime BEFORE 2000-01-05T00:00:00Z', [0, 1]),
+    ('datetime AFTER 2000-01-05T00:00:00Z', [1, 2]),
+    ('datetime DURING 2000-01-02T00:00:00Z / P4D', [1]),
+    ('', [0, 1, 2, 3]),
+])
+def test_masks(cql, expected):
+    assert evaluate(cql) == expected
+
+
+def test_field_mapping():
+    assert evaluate('attr = 5', {'attr': 'intAttr'}) == [1]
+
+
+def test_same_as_compiled_predicates():
+    records = [
+        {'intAttr': int(i), 'strAttr': s}
+        for i, s in zip(COLUMNS['intAttr'], COLUMNS['strAttr'])
+    ]
+    for cql in ('intAttr > 3 AND strAttr LIKE "%c"', 'intAttr IN (1, 7)'):
+        predicate = to_predicate(parse(cql))
+        assert evaluate(cql) == [
+            i for i, record in enumerate(records) if predicate(record)
+        ]
+
+
+class Geometry:
+    """ Minimal geometry stand-in: an axis aligned box. """
+    tests = 0
+
+    def __init__(self, minx, miny, maxx, maxy):
+        self.bounds = (minx, miny, maxx, maxy)
+
+    @classmethod
+    def from_wkt(cls, wkt):
+        coords = [float(v) for v in re.findall(r'-?[\d.]+', wkt)]
+        xs, ys = coords[0::2], coords[1::2]
+        return cls(min(xs), min(ys), max(xs), max(ys))
+
+    def intersects(self, other):
+        Geometry.tests += 1
+        a, b = self.bounds, other.bounds
+        return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+    def disjoint(self, other):
+        return not self.intersects(other)
+
+    def within(self, other):
+        Geometry.tests += 1
+        a, b = self.bounds, other.bounds
+        return a[0] >= b[0] and a[1] >= b[1] and a[2] <= b[2] and a[3] <= b[3]
+
+    def contains(self, other):
+        return other.within(self)
+
+    def distance(self, other):
+        Geometry.tests += 1
+        a, b = self.bounds, other.bounds
+        dx = max(b[0] - a[2], a[0] - b[2], 0)
+        dy = max(b[1] - a[3], a[1] - b[3], 0)
+        return (dx ** 2 + dy ** 2) ** 0.5
+
+
+FEATURES = [
+    Geometry(0, 0, 1, 1),
+    Geometry(5, 5, 6, 6),
+    None,
+    Geometry(0, 0, 10, 10),
+]
+GEOMETRIES = GeometryColumn(FEATURES)
+INDEXED_GEOMETRIES = GeometryColumn(FEATURES, index=True, node_capacity=2)
+
+
+def evaluate_spatial(cql, geometries=GEOMETRIES):
+    ast = pycql.parse(cql, geometry_factory=Geometry.from_wkt)
+    return list(np.flatnonzero(to_mask(ast, {'geom': geometries})))
+
+
+@pytest.mark.parametrize('cql, expected', [
+    ('BBOX(geom, 0.5, 0.5, 2, 2)', [0, 3]),
+    ('BBOX(geom, 20, 20, 30, 30)', []),
+    ('INTERSECTS(geom, POLYGON((4 4, 5.5 4, 5.5 5.5, 4 4)))', [1, 3]),
+    ('DISJOINT(geom, POLYGON((4 4, 5.5 4, 5.5 5.5, 4 4)))', [0]),
+    ('WITHIN(geom, POLYGON((-1 -1, 7 -1, 7 7, -1 -1)))', [0, 1]),
+    ('CONTAINS(geom, POINT(5.5 5.5))', [1, 3]),
+    ('DWITHIN(geom, POINT(2 2), 1.5, meters)', [0, 3]),
+    ('BEYOND(geom, POINT(2 2), 1.5, meters)', [1]),
+    ('geom IS NULL', [2]),
+    ('geom IS NOT NULL AND NOT INTERSECTS(geom, POINT(0.5 0.5))', [1]),
+])
+def test_spatial_masks(cql, expected):
+    assert evaluate_spatial(cql) == expected
+    assert evaluate_spatial(cql, INDEXED_GEOMETRIES) == expected
+
+
+def test_geometry_column_envelopes():
+    assert GEOMETRIES.minx.dtype == np.float64
+    assert GEOMETRIES.minx.flags['C_CONTIGUOUS']
+    assert list(GEOMETRIES.isnull()) == [False, False, True, False]
+
+    column = GeometryColumn(
+        [None, None], bounds=[(0, 0, 1, 1), (2, 2, 3, 3)]
+    )
+    assert list(column.intersects_bbox(0.5, 0.5, 1, 1)) == [True, False]
+
+
+def test_exact_tests_only_on_candidates():
+    Geometry.tests = 0
+    assert evaluate_spatial('INTERSECTS(geom, POINT(5.5 5.5))') == [1, 3]
+    assert Geometry.tests == 2
+
+    Geometry.tests = 0
+    assert evaluate_spatial(
+        'INTERSECTS(geom, POINT(5.5 5.5))', INDEXED_GEOMETRIES
+    ) == [1, 3]
+    assert Geometry.tests == 2
+
+
+def test_spatial_requires_geometry_column():
+    with pytest.raises(ValueError):
+        to_mask(parse('BBOX(intAttr, 0, 0, 1, 1)'), COLUMNS)
+
+
+def test_long_combination():
+    ids = ' OR '.join('intAttr = %d' % i for i in range(2000, 5000))
+    assert evaluate('intAttr = 5 OR ' + ids) == [1]